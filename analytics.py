@@ -0,0 +1,164 @@
+"""
+Weekly flow and lead-time analytics with a per-week cache.
+
+A week's counts and lead times only change while the week is running, so WeeklyAnalytics
+keeps every finished week and asks crud only for the weeks it has not seen yet: after the
+first report that is just the current week, served from range scans of the timestamp
+indexes. Commits that rewrite past timestamps (imports, purges, restores and tasks
+leaving Done) bump crud's history revision, which drops the finished weeks.
+"""
+import threading
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+
+import crud
+
+DEFAULT_WEEKS = 12
+
+
+@dataclass
+class WeekBucket:
+    """Flow counts, running totals and lead-time percentiles of one week."""
+
+    week: date
+    created: int = 0
+    done: int = 0
+    dropped: int = 0
+    # Running totals (created, done, dropped) up to the end of the week.
+    totals: Tuple[int, int, int] = (0, 0, 0)
+    # Lead-time percentiles of all tasks done in the week, and of each tag's.
+    lead_time: Optional[dict] = None
+    lead_time_by_tag: Dict[str, dict] = field(default_factory=dict)
+
+    def to_dict(self) -> dict:
+        total_created, total_done, total_dropped = self.totals
+        return {
+            "week": self.week.isoformat(),
+            "created": self.created,
+            "done": self.done,
+            "dropped": self.dropped,
+            "cumulative": {
+                "created": total_created,
+                "done": total_done,
+                "dropped": total_dropped,
+                "open": total_created - total_done - total_dropped,
+            },
+            "lead_time": self.lead_time or _empty_lead_time(),
+            "lead_time_by_tag": self.lead_time_by_tag,
+        }
+
+
+def _empty_lead_time() -> dict:
+    return {"count": 0, **{f"p{percentile}": None for percentile in crud.LEAD_TIME_PERCENTILES}}
+
+
+def _hours(value: Optional[float]) -> Optional[float]:
+    return None if value is None else round(value, 2)
+
+
+def load_weeks(db, since: Optional[date], until: date, totals: Tuple[int, int, int]) -> List[WeekBucket]:
+    """
+    Builds a bucket for every week from `since` (or the first week with any task) through
+    `until`, continuing the running totals from `totals`.
+    """
+    buckets: Dict[date, WeekBucket] = {}
+    for row in crud.get_weekly_flow(db, since=since):
+        week = date.fromisoformat(row.week)
+        buckets[week] = WeekBucket(
+            week=week,
+            created=row.created,
+            done=row.done,
+            dropped=row.dropped,
+            totals=(
+                totals[0] + row.total_created,
+                totals[1] + row.total_done,
+                totals[2] + row.total_dropped,
+            ),
+        )
+    for row in crud.get_weekly_lead_times(db, since=since):
+        week = date.fromisoformat(row.week)
+        bucket = buckets[week]  # its done event is in the flow rows too
+        entry = {"count": row.count}
+        for percentile in crud.LEAD_TIME_PERCENTILES:
+            entry[f"p{percentile}"] = _hours(getattr(row, f"p{percentile}"))
+        if row.tag is None:
+            bucket.lead_time = entry
+        else:
+            bucket.lead_time_by_tag[row.tag] = entry
+
+    first = since if since is not None else min(buckets, default=until)
+    weeks = []
+    week = first
+    while week <= until:
+        bucket = buckets.get(week)
+        if bucket is None:
+            # Quiet week: nothing happened, so the totals carry over.
+            bucket = WeekBucket(week=week, totals=totals)
+        totals = bucket.totals
+        weeks.append(bucket)
+        week += timedelta(weeks=1)
+    return weeks
+
+
+class WeeklyAnalytics:
+    """Per-week cache of finished weeks in front of crud's weekly analytics queries."""
+
+    def __init__(self, revision: Callable[[], int], clock: Callable[[], datetime] = datetime.utcnow):
+        self._revision = revision
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._loaded_revision: Optional[int] = None
+        # Number of week buckets built from queries, for tests and benchmarks.
+        self.weeks_loaded = 0
+        self._reset()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._reset()
+
+    def _reset(self) -> None:
+        self._weeks: Dict[date, WeekBucket] = {}
+        # Every week before this one is in _weeks; None while nothing is cached.
+        self._finished_until: Optional[date] = None
+        # Running totals at the end of the week before _finished_until.
+        self._totals: Tuple[int, int, int] = (0, 0, 0)
+
+    def report(self, db, weeks: int = DEFAULT_WEEKS) -> dict:
+        """
+        Returns the last `weeks` weeks, oldest first and ending with the current week, of
+        flow counts, cumulative flow and lead-time percentiles (hours).
+        """
+        current = crud.week_start(self._clock())
+        revision = self._revision()
+        with self._lock:
+            if revision != self._loaded_revision:
+                self._reset()
+            since, totals = self._finished_until, self._totals
+
+        fresh = load_weeks(db, since, current, totals)
+        finished = [bucket for bucket in fresh if bucket.week < current]
+        with self._lock:
+            # Skip storing if a history rewrite or another report got in first.
+            if self._revision() == revision and self._finished_until == since:
+                self._weeks.update((bucket.week, bucket) for bucket in finished)
+                if finished:
+                    self._totals = finished[-1].totals
+                self._finished_until = current
+                self._loaded_revision = revision
+            self.weeks_loaded += len(fresh)
+            cached = dict(self._weeks)
+
+        by_week = {bucket.week: bucket for bucket in fresh}
+        first = current - timedelta(weeks=weeks - 1)
+        series = []
+        previous_totals = None
+        for offset in range(weeks):
+            week = first + timedelta(weeks=offset)
+            bucket = by_week.get(week) or cached.get(week)
+            if bucket is None:
+                # Before the first task, or a week no longer cached after a concurrent rewrite.
+                bucket = WeekBucket(week=week, totals=previous_totals or (0, 0, 0))
+            previous_totals = bucket.totals
+            series.append(bucket.to_dict())
+        return {"weeks": series}
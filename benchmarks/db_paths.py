@@ -0,0 +1,155 @@
+"""
+Compares the sync and async database paths of the API under concurrent load.
+
+For each mode the app is started with uvicorn against a freshly seeded temporary
+database, then driven by N concurrent clients issuing a mix of board reads
+(GET /tasks/) and edits (PUT /tasks/{id}). Requests per second and p50/p99 latency
+are reported per mode and concurrency level.
+
+    python benchmarks/db_paths.py --tasks 500 --duration 10 --concurrency 1 16 64
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+MODES = ("sync", "async")
+
+
+def find_free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(mode: str, database_path: Path, port: int) -> subprocess.Popen:
+    env = dict(os.environ)
+    env["POHELPER_DATABASE_URL"] = f"sqlite:///{database_path}"
+    env["POHELPER_ASYNC_DB"] = "1" if mode == "async" else "0"
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=ROOT_DIR,
+        env=env,
+    )
+
+
+def wait_until_ready(base_url: str, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"{base_url}/tags/").status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        time.sleep(0.1)
+    raise RuntimeError(f"Server at {base_url} did not start")
+
+
+def seed_tasks(base_url: str, count: int) -> list[int]:
+    statuses = ("ToDo", "Ongoing", "Done")
+    task_ids = []
+    with httpx.Client(base_url=base_url, timeout=60) as client:
+        for start in range(0, count, 500):
+            operations = [
+                {
+                    "op": "create",
+                    "task": {
+                        "title": f"Benchmark task {index}",
+                        "description": "Seeded for the database path benchmark",
+                        "tags": random.choice(["alpha", "beta", "gamma"]),
+                        "status": statuses[index % len(statuses)],
+                    },
+                }
+                for index in range(start, min(start + 500, count))
+            ]
+            response = client.post("/tasks/batch", json={"operations": operations})
+            response.raise_for_status()
+            task_ids.extend(result["task"]["id"] for result in response.json()["results"])
+    return task_ids
+
+
+async def run_client(
+    client: httpx.AsyncClient, task_ids: list[int], write_ratio: float, deadline: float, latencies: list
+) -> None:
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        if random.random() < write_ratio:
+            task_id = random.choice(task_ids)
+            response = await client.put(f"/tasks/{task_id}", json={"title": f"Edited {started}"})
+        else:
+            response = await client.get("/tasks/", params={"tag": random.choice(["alpha", "beta"])})
+        response.raise_for_status()
+        latencies.append(time.perf_counter() - started)
+
+
+async def measure(base_url: str, task_ids: list[int], concurrency: int, duration: float, write_ratio: float) -> dict:
+    latencies: list[float] = []
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        deadline = time.perf_counter() + duration
+        await asyncio.gather(
+            *(run_client(client, task_ids, write_ratio, deadline, latencies) for _ in range(concurrency))
+        )
+    ordered = sorted(latencies)
+    return {
+        "concurrency": concurrency,
+        "requests": len(ordered),
+        "rps": round(len(ordered) / duration, 1),
+        "p50_ms": round(statistics.median(ordered) * 1000, 2),
+        "p99_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))] * 1000, 2),
+    }
+
+
+def benchmark_mode(mode: str, args: argparse.Namespace) -> list[dict]:
+    with tempfile.TemporaryDirectory() as data_dir:
+        port = find_free_port()
+        base_url = f"http://127.0.0.1:{port}"
+        server = start_server(mode, Path(data_dir) / "bench.db", port)
+        try:
+            wait_until_ready(base_url)
+            task_ids = seed_tasks(base_url, args.tasks)
+            return [
+                dict(mode=mode, **asyncio.run(measure(base_url, task_ids, level, args.duration, args.write_ratio)))
+                for level in args.concurrency
+            ]
+        finally:
+            server.terminate()
+            server.wait(timeout=10)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tasks", type=int, default=500, help="tasks to seed before measuring")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per concurrency level")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 16, 64])
+    parser.add_argument("--write-ratio", type=float, default=0.2, help="share of requests that edit a task")
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    parser.add_argument("--json", type=Path, help="also write the results to this file")
+    args = parser.parse_args()
+
+    results = [row for mode in args.modes for row in benchmark_mode(mode, args)]
+    print(f"{'mode':<6} {'clients':>7} {'requests':>9} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8}")
+    for row in results:
+        print(
+            f"{row['mode']:<6} {row['concurrency']:>7} {row['requests']:>9} "
+            f"{row['rps']:>8} {row['p50_ms']:>8} {row['p99_ms']:>8}"
+        )
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
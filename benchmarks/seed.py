@@ -0,0 +1,107 @@
+"""
+Generates synthetic boards for benchmarks.
+
+Tasks follow a rough shape of a long-lived board: most finished work sits in the
+archive, tags follow a Zipf-like distribution, and only part of the tasks have due
+dates. Boards are written through crud.import_tasks, so tags, order indexes and change
+sequences are registered exactly as for a real import.
+
+    python benchmarks/seed.py --tasks 100000 --database /tmp/board.db
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Iterator, Optional
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+TAG_VOCABULARY = [
+    "backend", "frontend", "bug", "feature", "ux", "api", "docs", "infra", "security", "perf",
+    "billing", "search", "mobile", "onboarding", "reporting", "design", "data", "ops", "qa",
+    "release", "support", "legal", "growth", "sales", "auth", "i18n", "a11y", "tech-debt",
+    "research", "spike", "customer", "analytics", "export", "import", "sync", "email",
+    "notifications", "payments", "admin", "settings",
+]
+# Share of tasks per state; archived tasks are Done past the cutoff, deleted ones are soft-deleted.
+STATE_WEIGHTS = {"ToDo": 0.30, "Ongoing": 0.15, "Done": 0.05, "archived": 0.45, "deleted": 0.05}
+HISTORY_DAYS = 365
+
+
+def _tags(rng: random.Random) -> Optional[str]:
+    count = rng.choices([0, 1, 2, 3], weights=[0.2, 0.45, 0.25, 0.1])[0]
+    if not count:
+        return None
+    # Zipf-like: a handful of tags cover most tasks.
+    picked = {TAG_VOCABULARY[min(int(rng.paretovariate(1.2)) - 1, len(TAG_VOCABULARY) - 1)] for _ in range(count)}
+    return ", ".join(sorted(picked))
+
+
+def generate_tasks(count: int, seed: int = 0, now: Optional[datetime] = None) -> Iterator:
+    """
+    Yields `count` schemas.TaskImport records; the same seed gives the same board.
+    """
+    import schemas
+
+    rng = random.Random(seed)
+    now = now or datetime.utcnow()
+    states = list(STATE_WEIGHTS)
+    weights = list(STATE_WEIGHTS.values())
+    for index in range(count):
+        state = rng.choices(states, weights=weights)[0]
+        created_at = now - timedelta(days=rng.uniform(0, HISTORY_DAYS))
+        record = {
+            "title": f"Task {index}: {rng.choice(TAG_VOCABULARY)} follow-up",
+            "description": "Synthetic benchmark task. " * rng.randint(0, 6) or None,
+            "tags": _tags(rng),
+            "status": state if state in ("ToDo", "Ongoing", "Done") else "Done",
+            "created_at": created_at,
+            "urgent": rng.random() < 0.1,
+        }
+        if rng.random() < 0.4:
+            record["due_date"] = (now + timedelta(days=rng.randint(-60, 60))).date()
+        if state == "Done":
+            # Still on the board: finished within the archive window.
+            record["done_at"] = now - timedelta(hours=rng.uniform(0, 7.5))
+        elif state == "archived":
+            done_at = created_at + (now - created_at) * rng.random()
+            record["done_at"] = done_at
+            record["archived_at"] = done_at + timedelta(hours=8)
+        elif state == "deleted":
+            record["status"] = rng.choice(["ToDo", "Ongoing"])
+            record["deleted_at"] = created_at + (now - created_at) * rng.random()
+        yield schemas.TaskImport(**record)
+
+
+def seed_board(crud, session, count: int, seed: int = 0) -> int:
+    """
+    Imports a synthetic board of `count` tasks through crud.import_tasks.
+    """
+    return crud.import_tasks(session, generate_tasks(count, seed=seed))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tasks", type=int, default=10000, help="number of tasks to generate")
+    parser.add_argument("--seed", type=int, default=0, help="random seed")
+    parser.add_argument("--database", type=Path, required=True, help="SQLite file to create or extend")
+    args = parser.parse_args()
+
+    os.environ["POHELPER_DATABASE_URL"] = f"sqlite:///{args.database.resolve()}"
+    import crud, database, main as app  # noqa: F401  (importing main creates the schema)
+
+    session = database.SessionLocal()
+    try:
+        print(f"Imported {seed_board(crud, session, args.tasks, seed=args.seed)} tasks into {args.database}")
+    finally:
+        session.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Measures desktop cold start: how long the launcher takes to show its loading shell,
+import the app, pass the schema check, start the server and serve the board.
+
+Each run starts a fresh interpreter against a seeded SQLite file and reports, from the
+start of the launch:
+
+- shell: desktop imported and the loading shell ready to paint
+- import: `import main`, including the PRAGMA user_version schema check
+- server: uvicorn listening (desktop.start_server returned)
+- first paint: GET / served, i.e. the board page can replace the shell
+
+and, timed inside the same process, the schema check on a current database and a run of
+every migration, as a database from before the numbered migrations goes through once.
+
+    python benchmarks/startup.py --tasks 10000 --runs 5
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+STAGES = ("shell", "import", "server", "first_paint", "schema_check", "schema_setup")
+
+
+def probe() -> dict:
+    """Runs one cold start in this interpreter and returns the stage times in seconds."""
+    started = time.perf_counter()
+    timings = {}
+    import desktop
+
+    # The launcher hands desktop.LOADING_HTML to the window at this point.
+    timings["shell"] = time.perf_counter() - started
+    import main
+
+    timings["import"] = time.perf_counter() - started
+    handle = desktop.start_server(desktop.find_free_port())
+    timings["server"] = time.perf_counter() - started
+    try:
+        with urllib.request.urlopen(handle.url) as response:
+            response.read()
+        timings["first_paint"] = time.perf_counter() - started
+    finally:
+        desktop.stop_server(handle)
+        handle.thread.join(timeout=5)
+
+    started = time.perf_counter()
+    main.prepare_database()
+    timings["schema_check"] = time.perf_counter() - started
+    with main.engine.connect() as conn:
+        conn.exec_driver_sql("PRAGMA user_version = 0")
+        conn.commit()
+    started = time.perf_counter()
+    main.prepare_database()
+    timings["schema_setup"] = time.perf_counter() - started
+    return timings
+
+
+def run_probe(database_path: Path) -> dict:
+    env = dict(os.environ, POHELPER_DATABASE_URL=f"sqlite:///{database_path}")
+    output = subprocess.run(
+        [sys.executable, __file__, "--probe"],
+        cwd=ROOT_DIR,
+        env=env,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def seed_database(database_path: Path, tasks: int, seed: int) -> None:
+    subprocess.run(
+        [sys.executable, str(ROOT_DIR / "benchmarks" / "seed.py"),
+         "--tasks", str(tasks), "--seed", str(seed), "--database", str(database_path)],
+        cwd=ROOT_DIR,
+        check=True,
+        capture_output=True,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure desktop cold start.")
+    parser.add_argument("--tasks", type=int, nargs="+", default=[0, 10000], help="board sizes to measure")
+    parser.add_argument("--runs", type=int, default=5, help="cold starts per board size")
+    parser.add_argument("--seed", type=int, default=0, help="random seed for the boards")
+    parser.add_argument("--json", type=Path, help="write the raw results to this file")
+    parser.add_argument("--probe", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.probe:
+        print(json.dumps(probe()))
+        return
+
+    results = {}
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for tasks in args.tasks:
+            database_path = Path(temp_dir) / f"startup-{tasks}.db"
+            # Seeding also brings the schema up to date, so every run below is a regular launch.
+            seed_database(database_path, tasks, args.seed)
+            runs = [run_probe(database_path) for _ in range(args.runs)]
+            results[tasks] = {stage: [run[stage] for run in runs] for stage in STAGES}
+
+    print(f"{'tasks':>8} " + " ".join(f"{stage:>13}" for stage in STAGES) + "   (median ms)")
+    for tasks, stages in results.items():
+        print(f"{tasks:>8} " + " ".join(
+            f"{statistics.median(stages[stage]) * 1000:>13.1f}" for stage in STAGES
+        ))
+    if args.json:
+        args.json.write_text(json.dumps({"runs": args.runs, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
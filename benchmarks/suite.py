@@ -0,0 +1,447 @@
+"""
+Latency and throughput benchmarks for every crud function and API endpoint.
+
+For each board size a synthetic board (see benchmarks/seed.py) is imported into a
+temporary SQLite file, then every case is timed in-process: crud functions on a
+session, endpoints through the ASGI app with TestClient. Results are printed as a table
+and can be written as JSON, then compared against a run from another commit.
+
+    python benchmarks/suite.py --tasks 1000 100000 --json results.json
+    python benchmarks/suite.py --tasks 1000 100000 --compare results.json
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import importlib
+import inspect
+import itertools
+import json
+import os
+import platform
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Callable, List, Optional, Tuple
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from benchmarks.seed import generate_tasks, seed_board  # noqa: E402
+
+DEFAULT_ITERATIONS = 20
+
+
+@dataclass
+class Case:
+    """One timed operation; `target` names the crud function or route it covers."""
+
+    name: str
+    target: str
+    run: Callable[[], object]
+    before: Optional[Callable[[], None]] = None
+    iterations: Optional[int] = None
+
+
+def load_app(database_url: str) -> dict:
+    """
+    Points the app at database_url and reloads its modules, like the test_env fixture.
+    """
+    os.environ["POHELPER_DATABASE_URL"] = database_url
+    import database, models, crud, migrations, analytics, main
+
+    modules = {}
+    for module in (database, models, crud, migrations, analytics, main):
+        modules[module.__name__] = importlib.reload(module)
+    return modules
+
+
+def public_crud_functions(crud) -> List[str]:
+    return sorted(
+        name
+        for name, member in inspect.getmembers(crud, inspect.isfunction)
+        if member.__module__ == crud.__name__ and not name.startswith("_")
+    )
+
+
+def api_routes(main) -> List[str]:
+    from fastapi.routing import APIRoute
+
+    return sorted(
+        f"{method} {route.path}"
+        for route in main.app.routes
+        if isinstance(route, APIRoute)
+        for method in route.methods
+    )
+
+
+def uncovered_targets(env: dict, cases: List[Case]) -> List[str]:
+    """Lists crud functions and routes that no case covers."""
+    covered = {case.target for case in cases}
+    targets = [f"crud.{name}" for name in public_crud_functions(env["crud"])] + api_routes(env["main"])
+    return [target for target in targets if target not in covered]
+
+
+class Board:
+    """Ids and tokens sampled from the seeded board, handed out round-robin to write cases."""
+
+    def __init__(self, env: dict, session):
+        crud, models = env["crud"], env["models"]
+        self.session = session
+        live = crud.get_tasks(session, limit=2000)
+        self.live_ids = [task.id for task in live]
+        self.todo_ids = [task.id for task in live if task.status == "ToDo"][:100]
+        archived = crud.get_archived_tasks(session, limit=200)
+        self.archived_ids = [task.id for task in archived]
+        self.archive_cursor = crud.encode_archive_cursor(archived[-1]) if archived else None
+        self.tags = crud.get_tags(session)[:5] or ["backend"]
+        max_seq = session.query(models.Task.change_seq).order_by(models.Task.change_seq.desc()).limit(1).scalar()
+        self.recent_token = crud.encode_change_token(max(0, (max_seq or 0) - 1), 0)
+        # Status changes and deletes leave the ToDo cards alone, so moves keep valid neighbours.
+        others = [task_id for task_id in self.live_ids if task_id not in set(self.todo_ids)]
+        self._live = itertools.cycle(others or self.live_ids or [0])
+        self._archived = itertools.cycle(self.archived_ids or [0])
+
+    def next_live_id(self) -> int:
+        return next(self._live)
+
+    def next_archived_id(self) -> int:
+        return next(self._archived)
+
+
+def crud_cases(env: dict, board: Board) -> Tuple[List[Case], List[Case]]:
+    import schemas
+    from schemas import TaskCreate, TaskFilters, TaskStatus, TaskUpdate
+
+    crud, db = env["crud"], board.session
+    tag = board.tags[0]
+    deleted = []
+    purge_cutoff = [datetime.utcnow() - timedelta(days=330)]
+
+    def delete_round_trip():
+        task_id = board.next_live_id()
+        crud.delete_task(db, task_id)
+        deleted.append(task_id)
+
+    def restore_deleted():
+        task_id = deleted.pop() if deleted else board.next_archived_id()
+        crud.restore_task(db, task_id)
+
+    def purge_oldest_day():
+        purge_cutoff[0] += timedelta(days=1)
+        crud.delete_archived_tasks(db, older_than=purge_cutoff[0])
+
+    def reorder_todo():
+        board.todo_ids.reverse()
+        crud.reorder_tasks(db, TaskStatus.to_do, board.todo_ids)
+
+    def move_between_neighbours():
+        task_id, after_id, before_id = board.todo_ids[:3]
+        crud.move_task(db, task_id, after_id=before_id)
+        board.todo_ids[:3] = [after_id, before_id, task_id]
+
+    batch = [
+        schemas.TaskBatchOperation(op="create", task=TaskCreate(title="Batch", status=TaskStatus.to_do)),
+        schemas.TaskBatchOperation(op="update", task_id=board.live_ids[0], changes=TaskUpdate(urgent=True)),
+    ]
+    token = crud.encode_change_token(1, 1)
+    archived_row = SimpleNamespace(deleted_at=None, done_at=datetime(2025, 1, 1), id=1)
+    cursor = crud.encode_archive_cursor(archived_row)
+    this_week = crud.week_start(datetime.utcnow())
+
+    reads = [
+        Case("crud.get_board_revision", "crud.get_board_revision", crud.get_board_revision),
+        Case("crud.get_history_revision", "crud.get_history_revision", crud.get_history_revision),
+        Case("crud.week_start", "crud.week_start", lambda: crud.week_start(archived_row.done_at)),
+        Case("crud.encode_change_token", "crud.encode_change_token", lambda: crud.encode_change_token(10, 20)),
+        Case("crud.decode_change_token", "crud.decode_change_token", lambda: crud.decode_change_token(token)),
+        Case("crud.encode_archive_cursor", "crud.encode_archive_cursor",
+             lambda: crud.encode_archive_cursor(archived_row)),
+        Case("crud.decode_archive_cursor", "crud.decode_archive_cursor", lambda: crud.decode_archive_cursor(cursor)),
+        Case("crud.get_tasks", "crud.get_tasks", lambda: crud.get_tasks(db)),
+        Case("crud.get_tasks[tag]", "crud.get_tasks", lambda: crud.get_tasks(db, filters=TaskFilters(tag=tag))),
+        Case("crud.get_tasks[q]", "crud.get_tasks", lambda: crud.get_tasks(db, filters=TaskFilters(q="follow"))),
+        Case("crud.get_task_rows", "crud.get_task_rows", lambda: crud.get_task_rows(db)),
+        Case("crud.search_tasks", "crud.search_tasks", lambda: crud.search_tasks(db, "backend follow")),
+        Case("crud.get_archived_tasks", "crud.get_archived_tasks", lambda: crud.get_archived_tasks(db, limit=50)),
+        Case("crud.get_archived_tasks[cursor]", "crud.get_archived_tasks",
+             lambda: crud.get_archived_tasks(db, limit=50, cursor=board.archive_cursor)),
+        Case("crud.get_archived_task_rows", "crud.get_archived_task_rows",
+             lambda: crud.get_archived_task_rows(db, limit=50)),
+        Case("crud.count_archived_tasks", "crud.count_archived_tasks", lambda: crud.count_archived_tasks(db)),
+        Case("crud.get_task_stats", "crud.get_task_stats", lambda: crud.get_task_stats(db)),
+        Case("crud.get_task_stats[tag]", "crud.get_task_stats",
+             lambda: crud.get_task_stats(db, filters=TaskFilters(tag=tag))),
+        Case("crud.get_weekly_flow", "crud.get_weekly_flow", lambda: crud.get_weekly_flow(db)),
+        Case("crud.get_weekly_flow[week]", "crud.get_weekly_flow", lambda: crud.get_weekly_flow(db, since=this_week)),
+        Case("crud.get_weekly_lead_times", "crud.get_weekly_lead_times", lambda: crud.get_weekly_lead_times(db)),
+        Case("crud.get_weekly_lead_times[week]", "crud.get_weekly_lead_times",
+             lambda: crud.get_weekly_lead_times(db, since=this_week)),
+        Case("crud.get_change_token", "crud.get_change_token", lambda: crud.get_change_token(db)),
+        Case("crud.get_task_changes", "crud.get_task_changes",
+             lambda: crud.get_task_changes(db, since=board.recent_token)),
+        Case("crud.next_archive_time", "crud.next_archive_time", lambda: crud.next_archive_time(db)),
+        Case("crud.archive_expired_tasks", "crud.archive_expired_tasks", lambda: crud.archive_expired_tasks(db)),
+        Case("crud.get_tags", "crud.get_tags", lambda: crud.get_tags(db)),
+        Case("crud.iter_task_row_batches", "crud.iter_task_row_batches",
+             lambda: sum(len(rows) for rows in crud.iter_task_row_batches(db)), iterations=3),
+    ]
+    writes = [
+        Case("crud.create_task", "crud.create_task",
+             lambda: crud.create_task(db, TaskCreate(title="Created", tags=tag, status=TaskStatus.to_do))),
+        Case("crud.update_task", "crud.update_task",
+             lambda: crud.update_task(db, board.next_live_id(), TaskUpdate(title="Renamed"))),
+        Case("crud.update_task_status", "crud.update_task_status",
+             lambda: crud.update_task_status(db, board.next_live_id(), TaskStatus.in_progress)),
+        Case("crud.reorder_tasks", "crud.reorder_tasks", reorder_todo),
+        Case("crud.move_task", "crud.move_task", move_between_neighbours),
+        Case("crud.rebalance_pending_columns", "crud.rebalance_pending_columns",
+             lambda: crud.rebalance_pending_columns(db),
+             before=lambda: crud._columns_to_rebalance.add(TaskStatus.to_do.value)),
+        Case("crud.delete_task", "crud.delete_task", delete_round_trip),
+        Case("crud.restore_task", "crud.restore_task", restore_deleted),
+        Case("crud.apply_task_batch", "crud.apply_task_batch", lambda: crud.apply_task_batch(db, batch)),
+        Case("crud.import_tasks[1000]", "crud.import_tasks",
+             lambda: crud.import_tasks(db, generate_tasks(1000, seed=7)), iterations=3),
+        Case("crud.delete_archived_tasks[1 day]", "crud.delete_archived_tasks", purge_oldest_day, iterations=5),
+    ]
+    return reads, writes
+
+
+def api_cases(env: dict, board: Board, client) -> Tuple[List[Case], List[Case]]:
+    main = env["main"]
+    tag = board.tags[0]
+    export = {}
+    deleted = []
+    purge_cutoff = [datetime.utcnow() - timedelta(days=300)]
+
+    def get(path, **params):
+        return lambda: client.get(path, params=params).raise_for_status()
+
+    def delete_task():
+        task_id = board.next_live_id()
+        client.delete(f"/tasks/{task_id}").raise_for_status()
+        deleted.append(task_id)
+
+    def restore_task():
+        task_id = deleted.pop() if deleted else board.next_archived_id()
+        client.put(f"/tasks/{task_id}/restore").raise_for_status()
+
+    def purge_oldest_day():
+        purge_cutoff[0] += timedelta(days=1)
+        client.delete("/tasks/archived", params={"older_than": purge_cutoff[0].isoformat()}).raise_for_status()
+
+    def move_task():
+        task_id, after_id, before_id = board.todo_ids[:3]
+        client.put(f"/tasks/{task_id}/move", json={"after_id": before_id}).raise_for_status()
+        board.todo_ids[:3] = [after_id, before_id, task_id]
+
+    def reorder():
+        board.todo_ids.reverse()
+        client.put("/tasks/reorder", json={"status": "ToDo", "ordered_ids": board.todo_ids}).raise_for_status()
+
+    def export_ndjson():
+        export["body"] = client.get("/tasks/export").raise_for_status().content
+
+    def import_export_slice():
+        body = b"\n".join(export.get("body", b"").splitlines()[:1000])
+        client.post("/tasks/import", content=body).raise_for_status()
+
+    def event_delivery():
+        # Time from publishing a change to its message leaving the event stream.
+        class ConnectedRequest:
+            async def is_disconnected(self):
+                return False
+
+        async def deliver():
+            stream = main.stream_task_events(ConnectedRequest())
+            await stream.__anext__()
+            main.events.broker.publish([{"type": "updated", "task_id": 1, "task": None, "revision": 1}])
+            await stream.__anext__()
+            await stream.aclose()
+
+        asyncio.run(deliver())
+
+    task = {"title": "Created", "tags": tag, "status": "ToDo"}
+    batch = {"operations": [{"op": "create", "task": task}, {"op": "update", "task_id": board.live_ids[0],
+                                                              "changes": {"urgent": True}}]}
+    clear_cache = main.read_cache.clear
+
+    def clear_analytics():
+        main.read_cache.clear()
+        main.task_analytics.clear()
+
+    reads = [
+        Case("GET /", "GET /", get("/")),
+        Case("GET /tasks/", "GET /tasks/", get("/tasks/"), before=clear_cache),
+        Case("GET /tasks/[cached]", "GET /tasks/", get("/tasks/")),
+        Case("GET /tasks/[tag]", "GET /tasks/", get("/tasks/", tag=tag), before=clear_cache),
+        Case("GET /tasks/[q]", "GET /tasks/", get("/tasks/", q="follow"), before=clear_cache),
+        Case("GET /tasks/changes", "GET /tasks/changes", get("/tasks/changes", since=board.recent_token)),
+        Case("GET /tasks/search", "GET /tasks/search", get("/tasks/search", q="backend follow")),
+        Case("GET /tasks/archived", "GET /tasks/archived", get("/tasks/archived", limit=50), before=clear_cache),
+        Case("GET /tasks/archived[cached]", "GET /tasks/archived", get("/tasks/archived", limit=50)),
+        Case("GET /tasks/archived/count", "GET /tasks/archived/count", get("/tasks/archived/count")),
+        Case("GET /tasks/stats", "GET /tasks/stats", get("/tasks/stats"), before=clear_cache),
+        Case("GET /tasks/stats[cached]", "GET /tasks/stats", get("/tasks/stats")),
+        Case("GET /tasks/stats[tag]", "GET /tasks/stats", get("/tasks/stats", tag=tag), before=clear_cache),
+        Case("GET /tasks/analytics[cold]", "GET /tasks/analytics", get("/tasks/analytics"), before=clear_analytics),
+        # Finished weeks come from main.task_analytics; only the current week is queried.
+        Case("GET /tasks/analytics", "GET /tasks/analytics", get("/tasks/analytics"), before=clear_cache),
+        Case("GET /tasks/analytics[cached]", "GET /tasks/analytics", get("/tasks/analytics")),
+        Case("GET /tags/", "GET /tags/", get("/tags/"), before=clear_cache),
+        Case("GET /tasks/events[delivery]", "GET /tasks/events", event_delivery),
+        Case("GET /tasks/export", "GET /tasks/export", export_ndjson, iterations=3),
+    ]
+    writes = [
+        Case("POST /tasks/", "POST /tasks/", lambda: client.post("/tasks/", json=task).raise_for_status()),
+        Case("POST /tasks/batch", "POST /tasks/batch", lambda: client.post("/tasks/batch", json=batch).raise_for_status()),
+        Case("POST /tasks/import[1000]", "POST /tasks/import", import_export_slice, iterations=3),
+        Case("PUT /tasks/{task_id}", "PUT /tasks/{task_id}",
+             lambda: client.put(f"/tasks/{board.next_live_id()}", json={"title": "Renamed"}).raise_for_status()),
+        Case("PUT /tasks/{task_id}/move", "PUT /tasks/{task_id}/move", move_task),
+        Case("PUT /tasks/reorder", "PUT /tasks/reorder", reorder),
+        Case("DELETE /tasks/{task_id}", "DELETE /tasks/{task_id}", delete_task),
+        Case("PUT /tasks/{task_id}/restore", "PUT /tasks/{task_id}/restore", restore_task),
+        Case("DELETE /tasks/archived[1 day]", "DELETE /tasks/archived", purge_oldest_day, iterations=5),
+    ]
+    if "GET /metrics" in api_routes(main):
+        reads.append(Case("GET /metrics", "GET /metrics", get("/metrics")))
+    return reads, writes
+
+
+def time_case(case: Case, iterations: int) -> dict:
+    count = case.iterations or iterations
+    if case.iterations is None:
+        case.run()  # warm-up
+    samples = []
+    for _ in range(count):
+        if case.before is not None:
+            case.before()
+        started = time.perf_counter()
+        case.run()
+        samples.append(time.perf_counter() - started)
+    ordered = sorted(samples)
+    total = sum(samples)
+    return {
+        "name": case.name,
+        "target": case.target,
+        "iterations": count,
+        "mean_ms": round(statistics.fmean(samples) * 1000, 3),
+        "p50_ms": round(statistics.median(ordered) * 1000, 3),
+        "p95_ms": round(ordered[min(count - 1, int(count * 0.95))] * 1000, 3),
+        "ops_per_sec": round(count / total, 1) if total else None,
+    }
+
+
+def run_suite(env: dict, iterations: int = DEFAULT_ITERATIONS, only: Optional[str] = None) -> List[dict]:
+    """
+    Times every case against the board already seeded in env's database.
+    """
+    from fastapi.testclient import TestClient
+
+    session = env["database"].SessionLocal()
+    try:
+        board = Board(env, session)
+        client = TestClient(env["main"].app)
+        crud_reads, crud_writes = crud_cases(env, board)
+        api_reads, api_writes = api_cases(env, board, client)
+        # Reads first, so every read case sees the board as seeded.
+        cases = crud_reads + api_reads + crud_writes + api_writes
+        missing = uncovered_targets(env, cases)
+        if missing:
+            print(f"warning: no benchmark for {', '.join(missing)}", file=sys.stderr)
+        return [time_case(case, iterations) for case in cases if not only or only in case.name]
+    finally:
+        session.close()
+
+
+def benchmark_size(tasks: int, args: argparse.Namespace) -> List[dict]:
+    with tempfile.TemporaryDirectory() as data_dir:
+        env = load_app(f"sqlite:///{Path(data_dir) / 'bench.db'}")
+        session = env["database"].SessionLocal()
+        started = time.perf_counter()
+        try:
+            seed_board(env["crud"], session, tasks, seed=args.seed)
+        finally:
+            session.close()
+        print(f"seeded {tasks} tasks in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+        results = [dict(tasks=tasks, **row) for row in run_suite(env, args.iterations, args.only)]
+        env["database"].engine.dispose()
+        return results
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: List[dict], baseline_path: Path, threshold: float) -> int:
+    """Prints p50 changes against a saved run and returns how many cases regressed."""
+    baseline = {(row["tasks"], row["name"]): row for row in json.loads(baseline_path.read_text())["results"]}
+    regressions = 0
+    print(f"\n{'tasks':>8} {'case':<40} {'base p50':>10} {'p50':>10} {'change':>8}")
+    for row in results:
+        previous = baseline.get((row["tasks"], row["name"]))
+        if previous is None or not previous["p50_ms"]:
+            continue
+        ratio = row["p50_ms"] / previous["p50_ms"]
+        flag = " !" if ratio > threshold else ""
+        regressions += ratio > threshold
+        print(
+            f"{row['tasks']:>8} {row['name']:<40} {previous['p50_ms']:>10} {row['p50_ms']:>10} "
+            f"{(ratio - 1) * 100:>+7.1f}%{flag}"
+        )
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tasks", type=int, nargs="+", default=[1000, 10000], help="board sizes to seed")
+    parser.add_argument("--iterations", type=int, default=DEFAULT_ITERATIONS, help="timed runs per case")
+    parser.add_argument("--seed", type=int, default=0, help="random seed for the synthetic board")
+    parser.add_argument("--only", help="run only cases whose name contains this text")
+    parser.add_argument("--metrics", action="store_true", help="run with POHELPER_METRICS=1 to measure its overhead")
+    parser.add_argument("--json", type=Path, help="write the results to this file")
+    parser.add_argument("--compare", type=Path, help="compare p50 latencies with an earlier --json file")
+    parser.add_argument("--threshold", type=float, default=1.2, help="p50 ratio counted as a regression")
+    args = parser.parse_args()
+    if args.metrics:
+        os.environ["POHELPER_METRICS"] = "1"
+
+    results = [row for tasks in args.tasks for row in benchmark_size(tasks, args)]
+    print(f"{'tasks':>8} {'case':<40} {'n':>4} {'p50 ms':>10} {'p95 ms':>10} {'ops/s':>10}")
+    for row in results:
+        print(
+            f"{row['tasks']:>8} {row['name']:<40} {row['iterations']:>4} "
+            f"{row['p50_ms']:>10} {row['p95_ms']:>10} {row['ops_per_sec']:>10}"
+        )
+    if args.json:
+        args.json.write_text(json.dumps({
+            "commit": git_commit(),
+            "created_at": datetime.utcnow().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+            "seed": args.seed,
+            "metrics": args.metrics,
+            "results": results,
+        }, indent=2))
+    if args.compare and compare(results, args.compare, args.threshold):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
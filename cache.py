@@ -0,0 +1,99 @@
+"""
+Read-through cache for serialized board reads.
+
+Board reads repeat with identical results between writes, so main keeps their JSON
+bodies here and serves repeats without touching SQLite or pydantic. An entry is valid
+while the board revision it was loaded under is still current (crud bumps it after every
+committed write) and, optionally, until an expiry time; board reads expire when their
+oldest Done task becomes due for archiving.
+"""
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, Dict, Hashable, Optional
+
+DEFAULT_MAX_ENTRIES = 128
+
+
+@dataclass
+class CachedRead:
+    """A serialized response body plus the headers that belong with it."""
+
+    content: bytes
+    headers: Dict[str, str] = field(default_factory=dict)
+    expires_at: Optional[datetime] = None
+    revision: int = 0
+
+
+class ReadCache:
+    """LRU cache of CachedRead entries keyed by read name and parameters."""
+
+    def __init__(
+        self,
+        revision: Callable[[], int],
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        clock: Callable[[], datetime] = datetime.utcnow,
+    ):
+        self._revision = revision
+        self._max_entries = max_entries
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, CachedRead]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _lookup(self, key: Hashable) -> Optional[CachedRead]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (
+                entry.revision != self._revision()
+                or (entry.expires_at is not None and self._clock() >= entry.expires_at)
+            ):
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def _store(self, key: Hashable, entry: CachedRead, revision: int) -> CachedRead:
+        entry.revision = revision
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], CachedRead]) -> CachedRead:
+        """
+        Returns the cached entry for key, calling loader to build it on a miss.
+
+        The revision is read before loader runs, so a write that commits mid-load leaves
+        an entry that is already stale instead of one that hides the write.
+        """
+        entry = self._lookup(key)
+        if entry is not None:
+            return entry
+        revision = self._revision()
+        return self._store(key, loader(), revision)
+
+    async def get_or_load_async(self, key: Hashable, loader) -> CachedRead:
+        """Like get_or_load, for a coroutine function loader."""
+        entry = self._lookup(key)
+        if entry is not None:
+            return entry
+        revision = self._revision()
+        return self._store(key, await loader(), revision)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """Returns hit/miss counters and the current number of entries."""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries)}
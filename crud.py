@@ -1,11 +1,133 @@
-from datetime import datetime, timedelta
-from typing import List
-from sqlalchemy import func, and_, or_
+import base64
+import json
+import math
+import re
+import threading
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from sqlalchemy import and_, case, column, delete, false, func, insert, inspect, literal, literal_column, null, or_, select, table, true, union_all, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
-import models, schemas
+import events, models, schemas
 from schemas import TaskStatus
 
 ARCHIVE_AFTER_HOURS = 8
+IMPORT_BATCH_SIZE = 1000
+# A move puts the card halfway between its neighbours; once a gap gets this small the
+# column is renumbered in the background before float precision runs out.
+ORDER_REBALANCE_GAP = 1e-6
+
+# Statuses whose order_index gaps ran low; drained by rebalance_pending_columns.
+_columns_to_rebalance = set()
+
+# In-process revision of board data, bumped after every committed write (see _commit).
+_board_revision = 0
+_board_revision_lock = threading.Lock()
+
+# Bumped after commits that can change already finished weeks of the analytics history
+# (see _rewrite_history); new work only ever lands in the current week.
+_history_revision = 0
+
+# Nearest-rank lead time percentiles reported per week by get_weekly_lead_times.
+LEAD_TIME_PERCENTILES = (50, 85, 95)
+
+# The columns of schemas.Task, in field order, for reads that skip the ORM (see serializers).
+TASK_ROW_COLUMNS = [getattr(models.Task, name) for name in schemas.Task.model_fields]
+
+# FTS5 index maintained by triggers on the tasks table (see migrations.create_task_search_index).
+tasks_fts = table("tasks_fts", column("rowid"), column("rank"))
+
+def get_board_revision() -> int:
+    """
+    Returns the current board revision; it changes whenever crud commits a write.
+    """
+    return _board_revision
+
+def get_history_revision() -> int:
+    """
+    Returns the analytics history revision; it changes after a commit that moved, cleared
+    or removed a created_at, done_at or deleted_at timestamp (see _rewrite_history).
+    """
+    return _history_revision
+
+# Session.info key for the task changes waiting to be published by _commit.
+TASK_CHANGES_KEY = "task_changes"
+# Session.info flag set by _rewrite_history.
+HISTORY_CHANGED_KEY = "history_changed"
+
+def _record_change(db: Session, change_type: str, target) -> None:
+    """Queues a change event for a task object, or for a task id that is being purged."""
+    db.info.setdefault(TASK_CHANGES_KEY, []).append((change_type, target))
+
+def _rewrite_history(db: Session) -> None:
+    """Marks the transaction as changing timestamps that past analytics weeks were built from."""
+    db.info[HISTORY_CHANGED_KEY] = True
+
+def _change_payload(change_type: str, target) -> dict:
+    if isinstance(target, int):
+        return {"type": change_type, "task_id": target, "task": None}
+    return {
+        "type": change_type,
+        "task_id": target.id,
+        "task": schemas.Task.model_validate(target).model_dump(mode="json"),
+    }
+
+def _next_change_seq(db: Session) -> int:
+    """Takes the next change sequence number; the UPDATE holds SQLite's write lock until commit."""
+    counter = models.change_counter
+    statement = (
+        sqlite_insert(counter)
+        .values(id=1, value=1)
+        .on_conflict_do_update(index_elements=[counter.c.id], set_={"value": counter.c.value + 1})
+        .returning(counter.c.value)
+    )
+    return db.execute(statement).scalar_one()
+
+def _stamp_changes(db: Session, changes: list) -> None:
+    """Stamps changed tasks with this commit's change sequence and tombstones purged ids."""
+    change_seq = _next_change_seq(db)
+    purged_ids = []
+    for _, target in changes:
+        if isinstance(target, int):
+            purged_ids.append(target)
+            continue
+        state = inspect(target)
+        if not (state.deleted or state.was_deleted):
+            target.change_seq = change_seq
+    if purged_ids:
+        tombstone = sqlite_insert(models.TaskTombstone)
+        db.execute(
+            tombstone.on_conflict_do_update(
+                index_elements=[models.TaskTombstone.task_id],
+                set_={
+                    "change_seq": tombstone.excluded.change_seq,
+                    "deleted_at": tombstone.excluded.deleted_at,
+                },
+            ),
+            [
+                {"task_id": task_id, "change_seq": change_seq, "deleted_at": datetime.utcnow()}
+                for task_id in dict.fromkeys(purged_ids)
+            ],
+        )
+
+def _commit(db: Session) -> None:
+    global _board_revision, _history_revision
+    changes = db.info.pop(TASK_CHANGES_KEY, [])
+    history_changed = db.info.pop(HISTORY_CHANGED_KEY, False)
+    payloads = []
+    if changes:
+        _stamp_changes(db, changes)
+    if changes and events.broker.subscriber_count:
+        # Serialize before committing, while the objects are still loaded.
+        db.flush()
+        payloads = [_change_payload(change_type, target) for change_type, target in changes]
+    db.commit()
+    with _board_revision_lock:
+        _board_revision += 1
+        revision = _board_revision
+        if history_changed:
+            _history_revision += 1
+    events.broker.publish([dict(payload, revision=revision) for payload in payloads])
 
 def _archive_cutoff() -> datetime:
     return datetime.utcnow() - timedelta(hours=ARCHIVE_AFTER_HOURS)
@@ -15,69 +137,532 @@ def _parse_tags(tags_value: str) -> List[str]:
         return []
     return [tag.strip() for tag in tags_value.split(',') if tag.strip()]
 
-def _ensure_tags(db: Session, tags_value: str) -> None:
+def _ensure_tags(db: Session, tags_value: str) -> List[models.Tag]:
     tags = _parse_tags(tags_value)
     if not tags:
-        return
+        return []
     lowered = [tag.lower() for tag in tags]
-    existing_tags = db.query(models.Tag.name).filter(func.lower(models.Tag.name).in_(lowered)).all()
-    existing_lookup = {name.lower() for (name,) in existing_tags}
+    existing_tags = db.query(models.Tag).filter(func.lower(models.Tag.name).in_(lowered)).all()
+    tag_lookup = {tag.name.lower(): tag for tag in existing_tags}
+    for pending in db.new:
+        if isinstance(pending, models.Tag):
+            tag_lookup.setdefault(pending.name.lower(), pending)
+    resolved = []
     for tag in tags:
-        if tag.lower() not in existing_lookup:
-            db.add(models.Tag(name=tag))
-            existing_lookup.add(tag.lower())
+        tag_lower = tag.lower()
+        if tag_lower not in tag_lookup:
+            tag_lookup[tag_lower] = models.Tag(name=tag)
+            db.add(tag_lookup[tag_lower])
+        if tag_lookup[tag_lower] not in resolved:
+            resolved.append(tag_lookup[tag_lower])
+    return resolved
+
+def _tag_filter(tag: str):
+    return models.Task.id.in_(
+        select(models.task_tags.c.task_id)
+        .join(models.Tag, models.Tag.id == models.task_tags.c.tag_id)
+        .where(func.lower(models.Tag.name) == tag.strip().lower())
+    )
 
 def _get_next_order_index(db: Session, status_value: str) -> int:
     max_index = db.query(func.max(models.Task.order_index)).filter(models.Task.status == status_value).scalar()
-    return (max_index or 0) + 1
+    return math.floor(max_index or 0) + 1
+
+def _neighbour_order_index(db: Session, status_value: str, order_index: float, task_id: int, above: bool):
+    """Returns the order_index of the closest card above or below a position in a column."""
+    column_order = models.Task.order_index
+    query = db.query(column_order).filter(
+        models.Task.status == status_value,
+        models.Task.id != task_id,
+        column_order < order_index if above else column_order > order_index,
+    )
+    return query.order_by(column_order.desc() if above else column_order.asc()).limit(1).scalar()
 
-def get_tasks(db: Session, skip: int = 0, limit: int = 100):
+def _order_index_between(lower: Optional[float], upper: Optional[float]) -> Optional[float]:
+    """Returns a key strictly between two neighbours, or None when the gap is exhausted."""
+    if lower is None and upper is None:
+        return None
+    if upper is None:
+        return math.floor(lower) + 1
+    if lower is None:
+        return math.ceil(upper) - 1
+    middle = (lower + upper) / 2
+    return middle if lower < middle < upper else None
+
+def _set_task_status(db: Session, db_task: models.Task, status_value: str) -> None:
+    # Leaving Done, or finishing a deleted task, takes the task out of a past week's
+    # done or dropped count.
+    if db_task.done_at is not None or (
+        db_task.deleted_at is not None and status_value == TaskStatus.done.value
+    ):
+        _rewrite_history(db)
+    db_task.status = status_value
+    db_task.order_index = _get_next_order_index(db, status_value)
+    if status_value == TaskStatus.done.value:
+        db_task.done_at = datetime.utcnow()
+    else:
+        db_task.done_at = None
+    if db_task.deleted_at is None:
+        db_task.archived_at = None
+
+def _search_tokens(search: Optional[str]) -> List[str]:
+    raw_value = (search or "").strip()
+    tokens = [token.strip() for token in raw_value.split(",") if token.strip()]
+    if not tokens and raw_value:
+        tokens = [raw_value]
+    return [token.lower() for token in tokens]
+
+def _due_date_range(token: str) -> Optional[Tuple[date, date]]:
+    """Returns the [start, end) due dates of a year, year-month or full-date search token."""
+    match = re.fullmatch(r"(\d{4})(?:-(\d{1,2})(?:-(\d{1,2}))?)?-?", token)
+    if not match:
+        return None
+    year, month, day = (int(part) if part else None for part in match.groups())
+    try:
+        if day is not None:
+            start = date(year, month, day)
+            return start, start + timedelta(days=1)
+        if month is not None:
+            return date(year, month, 1), date(year + month // 12, month % 12 + 1, 1)
+        return date(year, 1, 1), date(year + 1, 1, 1)
+    except ValueError:
+        return None
+
+def _search_filter(token: str):
     """
-    Retrieves a list of tasks from the database with pagination.
+    Matches one search token through indexes: by prefix on the words of title, description
+    and tags in the FTS5 index and, for a date such as 2025-01, by due date range.
     """
-    cutoff = _archive_cutoff()
-    return (
-        db.query(models.Task)
-        .filter(
-            or_(
-                models.Task.status != TaskStatus.done.value,
-                models.Task.done_at.is_(None),
-                models.Task.done_at > cutoff,
-            )
+    matches = []
+    match_expression = _fts_match_expression(token)
+    if match_expression is not None:
+        matches.append(
+            select(tasks_fts.c.rowid).where(literal_column("tasks_fts").op("MATCH")(match_expression))
         )
-        .filter(models.Task.deleted_at.is_(None))
+    due_range = _due_date_range(token)
+    if due_range is not None:
+        start, end = due_range
+        matches.append(
+            select(models.Task.id).where(models.Task.due_date >= start, models.Task.due_date < end)
+        )
+    if not matches:
+        # Nothing the indexes can look up, such as punctuation only.
+        return false()
+    # A UNION of id lists keeps each branch on its own index, where OR would scan tasks.
+    return models.Task.id.in_(union_all(*matches) if len(matches) > 1 else matches[0])
+
+def _apply_task_filters(query, filters: Optional[schemas.TaskFilters]):
+    if filters is None:
+        return query
+    if filters.status:
+        query = query.filter(models.Task.status.in_([status.value for status in filters.status]))
+    if filters.tag:
+        query = query.filter(_tag_filter(filters.tag))
+    if filters.urgent is not None:
+        query = query.filter(models.Task.urgent.is_(filters.urgent))
+    if filters.due_from is not None:
+        query = query.filter(models.Task.due_date >= filters.due_from)
+    if filters.due_to is not None:
+        query = query.filter(models.Task.due_date <= filters.due_to)
+    for token in _search_tokens(filters.q):
+        query = query.filter(_search_filter(token))
+    return query
+
+def _task_sort_order(sort: schemas.TaskSort) -> list:
+    manual_order = [
+        models.Task.order_index.asc().nulls_last(),
+        models.Task.created_at.asc().nulls_last(),
+        models.Task.id.asc(),
+    ]
+    if sort is schemas.TaskSort.manual:
+        return manual_order
+    key, direction = sort.value.split("-")
+    column = {
+        "due": models.Task.due_date,
+        "entry": models.Task.created_at,
+        "tag": func.nullif(func.lower(func.trim(models.Task.tags)), ""),
+    }[key]
+    ordered = column.asc() if direction == "asc" else column.desc()
+    return [ordered.nulls_last(), *manual_order]
+
+def _board_query(
+    query,
+    skip: int = 0,
+    limit: Optional[int] = None,
+    filters: Optional[schemas.TaskFilters] = None,
+    sort: schemas.TaskSort = schemas.TaskSort.manual,
+):
+    query = query.filter(models.Task.archived_at.is_(None))
+    return (
+        _apply_task_filters(query, filters)
+        .order_by(*_task_sort_order(sort))
         .offset(skip)
         .limit(limit)
-        .all()
     )
 
-def get_archived_tasks(db: Session, skip: int = 0, limit: int = 200):
+def get_tasks(
+    db: Session,
+    skip: int = 0,
+    limit: Optional[int] = None,
+    filters: Optional[schemas.TaskFilters] = None,
+    sort: schemas.TaskSort = schemas.TaskSort.manual,
+):
     """
-    Retrieves tasks archived by the 8-hour rule.
+    Retrieves board tasks matching the optional filters, in the requested order.
     """
-    cutoff = _archive_cutoff()
-    return (
+    return _board_query(db.query(models.Task), skip, limit, filters, sort).all()
+
+def get_task_rows(
+    db: Session,
+    skip: int = 0,
+    limit: Optional[int] = None,
+    filters: Optional[schemas.TaskFilters] = None,
+    sort: schemas.TaskSort = schemas.TaskSort.manual,
+):
+    """
+    Like get_tasks, but returns rows of TASK_ROW_COLUMNS instead of ORM objects.
+    """
+    return _board_query(db.query(*TASK_ROW_COLUMNS), skip, limit, filters, sort).all()
+
+def _fts_match_expression(search: Optional[str]) -> Optional[str]:
+    terms = re.findall(r"\w+", search or "")
+    if not terms:
+        return None
+    return " ".join(f'"{term}"*' for term in terms)
+
+def search_tasks(db: Session, search: str, limit: int = 50, include_archived: bool = False):
+    """
+    Ranks tasks against the full-text index using prefix matching on every search term.
+    """
+    match_expression = _fts_match_expression(search)
+    if match_expression is None:
+        return []
+    query = (
         db.query(models.Task)
-        .filter(
-            or_(
-                models.Task.deleted_at.isnot(None),
-                and_(
-                    models.Task.status == TaskStatus.done.value,
-                    models.Task.done_at.isnot(None),
-                    models.Task.done_at <= cutoff,
-                ),
-            )
+        .join(tasks_fts, tasks_fts.c.rowid == models.Task.id)
+        .filter(literal_column("tasks_fts").op("MATCH")(match_expression))
+    )
+    if not include_archived:
+        query = query.filter(models.Task.archived_at.is_(None))
+    return query.order_by(tasks_fts.c.rank).limit(limit).all()
+
+def _archive_sort_key():
+    return func.coalesce(models.Task.deleted_at, models.Task.done_at)
+
+def encode_archive_cursor(task: models.Task) -> str:
+    """
+    Builds an opaque cursor pointing just past the given archived task.
+    """
+    archived_key = task.deleted_at or task.done_at
+    payload = json.dumps([archived_key.isoformat(), task.id])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+def decode_archive_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    Parses a cursor from encode_archive_cursor, raising ValueError when it is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        archived_key, task_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(archived_key), int(task_id)
+    except (TypeError, ValueError) as exc:
+        raise ValueError("Invalid archive cursor") from exc
+
+def _archived_query(query, limit: int, cursor: Optional[str]):
+    sort_key = _archive_sort_key()
+    query = query.filter(models.Task.archived_at.isnot(None))
+    if cursor:
+        archived_key, task_id = decode_archive_cursor(cursor)
+        # Keyset predicate (sort_key, id) < (archived_key, task_id), written so SQLite
+        # can seek ix_tasks_archived_order instead of skipping earlier pages.
+        query = query.filter(
+            sort_key <= archived_key,
+            or_(sort_key < archived_key, models.Task.id < task_id),
         )
-        .order_by(func.coalesce(models.Task.deleted_at, models.Task.done_at).desc())
-        .offset(skip)
-        .limit(limit)
-        .all()
+    return query.order_by(sort_key.desc(), models.Task.id.desc()).limit(limit)
+
+def get_archived_tasks(db: Session, limit: int = 200, cursor: Optional[str] = None):
+    """
+    Retrieves one page of archived tasks, newest first, continuing after the optional cursor.
+    """
+    return _archived_query(db.query(models.Task), limit, cursor).all()
+
+def get_archived_task_rows(db: Session, limit: int = 200, cursor: Optional[str] = None):
+    """
+    Like get_archived_tasks, but returns rows of TASK_ROW_COLUMNS instead of ORM objects.
+    """
+    return _archived_query(db.query(*TASK_ROW_COLUMNS), limit, cursor).all()
+
+def count_archived_tasks(db: Session) -> int:
+    """
+    Counts archived or soft-deleted tasks.
+    """
+    return db.query(func.count(models.Task.id)).filter(models.Task.archived_at.isnot(None)).scalar()
+
+def get_task_stats(
+    db: Session,
+    filters: Optional[schemas.TaskFilters] = None,
+    today: Optional[date] = None,
+) -> dict:
+    """
+    Counts tasks matching the optional filters in one grouped query: board tasks per
+    status, urgent and overdue board tasks, archived tasks and board tasks per tag.
+    """
+    today = today or date.today()
+    Task = models.Task
+    live = Task.archived_at.is_(None)
+    by_status = _apply_task_filters(
+        select(
+            literal("status").label("kind"),
+            Task.status.label("key"),
+            func.count().filter(live).label("count"),
+            func.count().filter(Task.archived_at.isnot(None)).label("archived"),
+            func.count().filter(live, Task.urgent.is_(True)).label("urgent"),
+            func.count().filter(
+                live, Task.due_date < today, Task.status != TaskStatus.done.value
+            ).label("overdue"),
+        ),
+        filters,
+    ).group_by(Task.status)
+    by_tag = _apply_task_filters(
+        select(literal("tag"), models.Tag.name, func.count(), null(), null(), null())
+        .select_from(models.task_tags)
+        .join(Task, Task.id == models.task_tags.c.task_id)
+        .join(models.Tag, models.Tag.id == models.task_tags.c.tag_id)
+        .where(live),
+        filters,
+    ).group_by(models.task_tags.c.tag_id)
+
+    stats = {
+        "total": 0,
+        "by_status": {status.value: 0 for status in TaskStatus},
+        "urgent": 0,
+        "overdue": 0,
+        "archived": 0,
+        "tags": {},
+    }
+    for kind, key, count, archived, urgent, overdue in db.execute(union_all(by_status, by_tag)):
+        if kind == "tag":
+            if count:
+                stats["tags"][key] = count
+            continue
+        if count:
+            stats["by_status"][key] = stats["by_status"].get(key, 0) + count
+        stats["total"] += count
+        stats["archived"] += archived
+        stats["urgent"] += urgent
+        stats["overdue"] += overdue
+    stats["tags"] = dict(sorted(stats["tags"].items(), key=lambda item: (-item[1], item[0].lower())))
+    return stats
+
+def week_start(moment) -> date:
+    """
+    Returns the Monday of the week containing a date or datetime, like the SQL week buckets.
+    """
+    day = moment.date() if isinstance(moment, datetime) else moment
+    return day - timedelta(days=day.weekday())
+
+def _week_of(timestamp):
+    # Monday of the timestamp's week as 'YYYY-MM-DD'; Sunday stays in the week it ends.
+    return func.date(timestamp, "weekday 0", "-6 days")
+
+def _since_bound(since: Optional[date]) -> Optional[datetime]:
+    return datetime.combine(since, time()) if since is not None else None
+
+def get_weekly_flow(db: Session, since: Optional[date] = None):
+    """
+    Counts tasks created, done and dropped (deleted without being done) per week, plus
+    running totals of each from window sums, for weeks starting on or after `since`
+    (the whole history when None). Weeks without any of these events are left out.
+    """
+    Task = models.Task
+    bound = _since_bound(since)
+
+    def flow_events(timestamp, created: int, done: int, dropped: int, *conditions):
+        query = select(
+            _week_of(timestamp).label("week"),
+            literal_column(str(created)).label("created"),
+            literal_column(str(done)).label("done"),
+            literal_column(str(dropped)).label("dropped"),
+        ).where(timestamp.isnot(None), *conditions)
+        return query if bound is None else query.where(timestamp >= bound)
+
+    timeline = union_all(
+        flow_events(Task.created_at, 1, 0, 0),
+        flow_events(Task.done_at, 0, 1, 0),
+        flow_events(Task.deleted_at, 0, 0, 1, Task.done_at.is_(None)),
+    ).subquery("timeline")
+    weekly = [func.sum(timeline.c[name]) for name in ("created", "done", "dropped")]
+    running = [func.sum(count).over(order_by=timeline.c.week) for count in weekly]
+    query = (
+        select(
+            timeline.c.week,
+            weekly[0].label("created"),
+            weekly[1].label("done"),
+            weekly[2].label("dropped"),
+            running[0].label("total_created"),
+            running[1].label("total_done"),
+            running[2].label("total_dropped"),
+        )
+        .group_by(timeline.c.week)
+        .order_by(timeline.c.week)
     )
+    return db.execute(query).all()
 
-def create_task(db: Session, task: schemas.TaskCreate):
+def get_weekly_lead_times(db: Session, since: Optional[date] = None):
     """
-    Creates a new task in the database.
+    Returns nearest-rank percentiles of lead time (created_at to done_at, in hours) for
+    the tasks done each week, for all tasks (tag None) and per tag, ranked with window
+    functions. Rows are (week, tag, count, p50, p85, p95) for weeks on or after `since`.
+    """
+    Task = models.Task
+    done = select(
+        Task.id.label("task_id"),
+        _week_of(Task.done_at).label("week"),
+        ((func.julianday(Task.done_at) - func.julianday(Task.created_at)) * 24).label("hours"),
+    ).where(Task.done_at.isnot(None), Task.created_at.isnot(None))
+    bound = _since_bound(since)
+    if bound is not None:
+        done = done.where(Task.done_at >= bound)
+    done = done.cte("done")
+
+    samples = union_all(
+        select(done.c.week, null().label("tag"), done.c.hours),
+        select(done.c.week, models.Tag.name, done.c.hours)
+        .join(models.task_tags, models.task_tags.c.task_id == done.c.task_id)
+        .join(models.Tag, models.Tag.id == models.task_tags.c.tag_id),
+    ).subquery("samples")
+    partition = [samples.c.week, samples.c.tag]
+    ranked = select(
+        samples.c.week,
+        samples.c.tag,
+        samples.c.hours,
+        func.row_number().over(partition_by=partition, order_by=samples.c.hours).label("position"),
+        func.count().over(partition_by=partition).label("total"),
+    ).subquery("ranked")
+    percentiles = [
+        func.max(case((ranked.c.position == (ranked.c.total * percentile + 99) // 100, ranked.c.hours)))
+        .label(f"p{percentile}")
+        for percentile in LEAD_TIME_PERCENTILES
+    ]
+    query = (
+        select(ranked.c.week, ranked.c.tag, func.max(ranked.c.total).label("count"), *percentiles)
+        .group_by(ranked.c.week, ranked.c.tag)
+        .order_by(ranked.c.week, ranked.c.tag)
+    )
+    return db.execute(query).all()
+
+def encode_change_token(change_seq: int, task_id: int) -> str:
+    return f"{change_seq}.{task_id}"
+
+def decode_change_token(token: str) -> Tuple[int, int]:
+    try:
+        change_seq, task_id = (int(part) for part in token.split("."))
+    except ValueError as exc:
+        raise ValueError("Invalid change token") from exc
+    return change_seq, task_id
+
+def _after_change_key(seq_column, id_column, key: Tuple[int, int]):
+    change_seq, task_id = key
+    # Keyset predicate on (change_seq, id), phrased so SQLite can range-scan the index.
+    return and_(seq_column >= change_seq, or_(seq_column > change_seq, id_column > task_id))
+
+def get_change_token(db: Session) -> str:
+    """
+    Returns a token for the latest change; take it before reading the board it describes.
+    """
+    latest_task = db.execute(
+        select(models.Task.change_seq, models.Task.id)
+        .order_by(models.Task.change_seq.desc(), models.Task.id.desc())
+        .limit(1)
+    ).first()
+    latest_tombstone = db.execute(
+        select(models.TaskTombstone.change_seq, models.TaskTombstone.task_id)
+        .order_by(models.TaskTombstone.change_seq.desc(), models.TaskTombstone.task_id.desc())
+        .limit(1)
+    ).first()
+    keys = [tuple(row) for row in (latest_task, latest_tombstone) if row is not None]
+    return encode_change_token(*max(keys, default=(0, 0)))
+
+def get_task_changes(
+    db: Session, since: Optional[str] = None, limit: int = 500
+) -> Tuple[List[dict], str, bool]:
+    """
+    Returns tasks changed after the token (archived ones included) and tombstones for purged
+    tasks, in commit order, with the token for the next call and whether more are waiting.
+    """
+    key = decode_change_token(since) if since else (0, 0)
+    Tombstone = models.TaskTombstone
+    branches = [
+        select(
+            models.Task.change_seq.label("change_seq"),
+            models.Task.id.label("task_id"),
+            false().label("purged"),
+        ).where(_after_change_key(models.Task.change_seq, models.Task.id, key))
+    ]
+    if since:
+        # A first sync has nothing to delete, so it skips the tombstones.
+        branches.append(
+            select(Tombstone.change_seq, Tombstone.task_id, true())
+            .where(_after_change_key(Tombstone.change_seq, Tombstone.task_id, key))
+        )
+    changed = union_all(*branches)
+    rows = db.execute(
+        changed.order_by(literal_column("change_seq"), literal_column("task_id")).limit(limit + 1)
+    ).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    live_ids = [row.task_id for row in rows if not row.purged]
+    tasks = {
+        task.id: task
+        for task in db.query(models.Task).filter(models.Task.id.in_(live_ids))
+    } if live_ids else {}
+    changes = []
+    for row in rows:
+        task = None if row.purged else tasks.get(row.task_id)
+        # A row purged between the two reads is reported as deleted; its tombstone follows later.
+        changes.append({
+            "type": "deleted" if task is None else "updated",
+            "task_id": row.task_id,
+            "task": task,
+        })
+    token = encode_change_token(rows[-1].change_seq, rows[-1].task_id) if rows else encode_change_token(*key)
+    return changes, token, has_more
+
+def next_archive_time(db: Session) -> Optional[datetime]:
+    """
+    Returns when the next board task crosses the archive cutoff, or None if no Done task is waiting.
+    """
+    oldest_done_at = (
+        db.query(func.min(models.Task.done_at))
+        .filter(models.Task.archived_at.is_(None))
+        .filter(models.Task.status == TaskStatus.done.value)
+        .scalar()
+    )
+    if oldest_done_at is None:
+        return None
+    return oldest_done_at + timedelta(hours=ARCHIVE_AFTER_HOURS)
+
+def archive_expired_tasks(db: Session) -> int:
+    """
+    Marks Done tasks older than the 8-hour rule as archived.
     """
+    expired_tasks = (
+        db.query(models.Task)
+        .filter(models.Task.archived_at.is_(None))
+        .filter(models.Task.status == TaskStatus.done.value)
+        .filter(models.Task.done_at <= _archive_cutoff())
+        .all()
+    )
+    for task in expired_tasks:
+        task.archived_at = task.done_at + timedelta(hours=ARCHIVE_AFTER_HOURS)
+        _record_change(db, "archived", task)
+    if expired_tasks:
+        _commit(db)
+    return len(expired_tasks)
+
+def _create_task(db: Session, task: schemas.TaskCreate) -> models.Task:
     task_data = task.model_dump(exclude={"created_at", "order_index"})
     status_value = task.status.value
     task_data["status"] = status_value
@@ -85,137 +670,420 @@ def create_task(db: Session, task: schemas.TaskCreate):
     task_data["created_at"] = now
     task_data["order_index"] = _get_next_order_index(db, status_value)
     task_data["done_at"] = now if status_value == TaskStatus.done.value else None
-    _ensure_tags(db, task_data.get("tags"))
     db_task = models.Task(**task_data)
+    db_task.linked_tags = _ensure_tags(db, task_data.get("tags"))
     db.add(db_task)
-    db.commit()
-    db.refresh(db_task)
+    _record_change(db, "created", db_task)
     return db_task
 
-def update_task_status(db: Session, task_id: int, status: schemas.TaskStatus):
-    """
-    Updates the status of an existing task in the database.
-    """
-    db_task = db.query(models.Task).filter(models.Task.id == task_id).first()
-    if db_task:
-        new_status = status.value
-        if db_task.status != new_status:
-            db_task.status = new_status
-            db_task.order_index = _get_next_order_index(db, new_status)
-            if new_status == TaskStatus.done.value:
-                db_task.done_at = datetime.utcnow()
-            else:
-                db_task.done_at = None
-        db.commit()
-        db.refresh(db_task)
-    return db_task
-
-def update_task(db: Session, task_id: int, task_update: schemas.TaskUpdate):
-    """
-    Updates fields on an existing task in the database.
-    """
+def _update_task(db: Session, task_id: int, task_update: schemas.TaskUpdate) -> Optional[models.Task]:
     db_task = db.query(models.Task).filter(models.Task.id == task_id).first()
     if not db_task:
         return None
 
     update_data = task_update.model_dump(exclude_unset=True)
+    change_type = "updated"
     if "status" in update_data:
         status_value = update_data["status"]
         if status_value is not None:
             status_value = status_value.value if hasattr(status_value, "value") else status_value
             if db_task.status != status_value:
-                db_task.status = status_value
-                db_task.order_index = _get_next_order_index(db, status_value)
-                if status_value == TaskStatus.done.value:
-                    db_task.done_at = datetime.utcnow()
-                else:
-                    db_task.done_at = None
+                _set_task_status(db, db_task, status_value)
+                change_type = "moved"
             elif status_value == TaskStatus.done.value and db_task.done_at is None:
+                if db_task.deleted_at is not None:
+                    _rewrite_history(db)
                 db_task.done_at = datetime.utcnow()
         update_data.pop("status")
 
     if "tags" in update_data:
-        _ensure_tags(db, update_data.get("tags"))
+        db_task.linked_tags = _ensure_tags(db, update_data.get("tags"))
+        if db_task.done_at is not None:
+            # Moves the task's lead time between the per-tag figures of its done week.
+            _rewrite_history(db)
 
     for field, value in update_data.items():
         setattr(db_task, field, value)
-
-    db.commit()
-    db.refresh(db_task)
+    _record_change(db, change_type, db_task)
     return db_task
 
-def reorder_tasks(db: Session, status: schemas.TaskStatus, ordered_ids: List[int]):
-    """
-    Updates order_index for tasks within the same status column.
-    """
+def _reorder_tasks(db: Session, status: schemas.TaskStatus, ordered_ids: List[int]) -> List[models.Task]:
     tasks = db.query(models.Task).filter(models.Task.id.in_(ordered_ids)).all()
     task_map = {task.id: task for task in tasks}
     status_value = status.value
     for index, task_id in enumerate(ordered_ids):
         task = task_map.get(task_id)
-        if task and task.status == status_value:
+        if task and task.status == status_value and task.order_index != index + 1:
             task.order_index = index + 1
-    db.commit()
+            _record_change(db, "moved", task)
     return [task_map[task_id] for task_id in ordered_ids if task_id in task_map]
 
-def delete_task(db: Session, task_id: int):
+def _move_bounds(
+    db: Session, status_value: str, task_id: int, before_id: Optional[int], after_id: Optional[int]
+) -> Tuple[Optional[float], Optional[float]]:
     """
-    Soft deletes a task, or permanently removes it if already deleted.
+    Returns the order_index of the cards directly above and below a move target, raising
+    ValueError when the given neighbours are not two other cards of the column in order.
     """
+    given = [neighbour for neighbour in (after_id, before_id) if neighbour is not None]
+    if task_id in given or len(set(given)) < len(given):
+        raise ValueError("after_id and before_id must be two other tasks")
+    neighbours = dict(
+        db.query(models.Task.id, models.Task.order_index).filter(
+            models.Task.id.in_(given),
+            models.Task.status == status_value,
+        )
+    )
+    if len(neighbours) < len(given):
+        raise ValueError("after_id and before_id must be tasks in the target column")
+    lower = neighbours.get(after_id)
+    upper = neighbours.get(before_id)
+    if lower is not None and upper is not None and lower > upper:
+        raise ValueError("after_id must be above before_id")
+    # With one neighbour given, look up the card on its other side so the gap is real.
+    if lower is not None and upper is None:
+        upper = _neighbour_order_index(db, status_value, lower, task_id, above=False)
+    elif upper is not None and lower is None:
+        lower = _neighbour_order_index(db, status_value, upper, task_id, above=True)
+    return lower, upper
+
+def _move_task(
+    db: Session,
+    task_id: int,
+    status: Optional[schemas.TaskStatus] = None,
+    before_id: Optional[int] = None,
+    after_id: Optional[int] = None,
+) -> Optional[models.Task]:
+    db_task = db.query(models.Task).filter(models.Task.id == task_id).first()
+    if not db_task:
+        return None
+    status_value = status.value if status else db_task.status
+    lower, upper = _move_bounds(db, status_value, task_id, before_id, after_id)
+
+    if db_task.status != status_value:
+        _set_task_status(db, db_task, status_value)
+    if lower is None and upper is None:
+        order_index = db_task.order_index if db_task.order_index is not None else _get_next_order_index(db, status_value)
+    else:
+        order_index = _order_index_between(lower, upper)
+        if order_index is None:
+            # The gap is exhausted or the neighbours tie: renumber the column and retry once.
+            _rebalance_column(db, status_value)
+            lower, upper = _move_bounds(db, status_value, task_id, before_id, after_id)
+            order_index = _order_index_between(lower, upper)
+            if order_index is None:
+                raise ValueError("after_id must be directly above before_id")
+        if upper is not None and lower is not None and upper - lower < ORDER_REBALANCE_GAP:
+            _columns_to_rebalance.add(status_value)
+    db_task.order_index = order_index
+    _record_change(db, "moved", db_task)
+    return db_task
+
+def _rebalance_column(db: Session, status_value: str) -> List[int]:
+    """Renumbers a column's order_index to 1..n in its current order with one UPDATE."""
+    ranked = (
+        select(
+            models.Task.id.label("task_id"),
+            func.row_number()
+            .over(
+                order_by=(
+                    models.Task.order_index.asc().nulls_last(),
+                    models.Task.created_at.asc(),
+                    models.Task.id.asc(),
+                )
+            )
+            .label("position"),
+        )
+        .where(models.Task.status == status_value)
+        .subquery()
+    )
+    db.flush()
+    moved_ids = db.execute(
+        update(models.Task)
+        .where(models.Task.id == ranked.c.task_id)
+        .where(models.Task.order_index.is_distinct_from(ranked.c.position))
+        .values(order_index=ranked.c.position)
+        .returning(models.Task.id),
+        execution_options={"synchronize_session": False},
+    ).scalars().all()
+    if moved_ids:
+        for task in db.query(models.Task).filter(models.Task.id.in_(moved_ids)).populate_existing():
+            _record_change(db, "moved", task)
+    return moved_ids
+
+def rebalance_pending_columns(db: Session) -> int:
+    """
+    Renumbers the columns whose order gaps ran low, one transaction per column.
+    """
+    renumbered = 0
+    while _columns_to_rebalance:
+        status_value = _columns_to_rebalance.pop()
+        renumbered += len(_rebalance_column(db, status_value))
+        _commit(db)
+    return renumbered
+
+def _delete_task(db: Session, task_id: int) -> Optional[models.Task]:
     db_task = db.query(models.Task).filter(models.Task.id == task_id).first()
     if db_task:
         if db_task.deleted_at is None:
             db_task.deleted_at = datetime.utcnow()
-            db.commit()
-            db.refresh(db_task)
+            db_task.archived_at = db_task.deleted_at
+            _record_change(db, "deleted", db_task)
         else:
+            _record_change(db, "deleted", db_task.id)
+            _rewrite_history(db)
             db.delete(db_task)
-            db.commit()
     return db_task
 
-def restore_task(db: Session, task_id: int):
+def _restore_task(db: Session, task_id: int) -> Optional[models.Task]:
+    db_task = db.query(models.Task).filter(models.Task.id == task_id).first()
+    if not db_task:
+        return None
+    if db_task.deleted_at is not None:
+        _rewrite_history(db)
+    db_task.deleted_at = None
+    _set_task_status(db, db_task, TaskStatus.to_do.value)
+    _record_change(db, "restored", db_task)
+    return db_task
+
+def _commit_and_refresh(db: Session, db_task: Optional[models.Task]) -> Optional[models.Task]:
+    hard_deleted = db_task is not None and db_task in db.deleted
+    _commit(db)
+    if db_task is not None and not hard_deleted:
+        db.refresh(db_task)
+    return db_task
+
+def create_task(db: Session, task: schemas.TaskCreate):
     """
-    Restores an archived task to the ToDo column.
+    Creates a new task in the database.
+    """
+    return _commit_and_refresh(db, _create_task(db, task))
+
+def update_task_status(db: Session, task_id: int, status: schemas.TaskStatus):
+    """
+    Updates the status of an existing task in the database.
     """
     db_task = db.query(models.Task).filter(models.Task.id == task_id).first()
+    if db_task:
+        new_status = status.value
+        if db_task.status != new_status:
+            _set_task_status(db, db_task, new_status)
+            _record_change(db, "moved", db_task)
+        _commit_and_refresh(db, db_task)
+    return db_task
+
+def update_task(db: Session, task_id: int, task_update: schemas.TaskUpdate):
+    """
+    Updates fields on an existing task in the database.
+    """
+    db_task = _update_task(db, task_id, task_update)
     if not db_task:
         return None
-    status_value = TaskStatus.to_do.value
-    db_task.deleted_at = None
-    db_task.status = status_value
-    db_task.done_at = None
-    db_task.order_index = _get_next_order_index(db, status_value)
-    db.commit()
-    db.refresh(db_task)
+    return _commit_and_refresh(db, db_task)
+
+def reorder_tasks(db: Session, status: schemas.TaskStatus, ordered_ids: List[int]):
+    """
+    Updates order_index for tasks within the same status column.
+    """
+    tasks = _reorder_tasks(db, status, ordered_ids)
+    _commit(db)
+    return tasks
+
+def move_task(
+    db: Session,
+    task_id: int,
+    status: Optional[schemas.TaskStatus] = None,
+    before_id: Optional[int] = None,
+    after_id: Optional[int] = None,
+):
+    """
+    Moves a task between two neighbours (optionally into another column), writing only its row.
+    Raises ValueError when the neighbours are not two other cards of the column in order.
+    """
+    db_task = _move_task(db, task_id, status=status, before_id=before_id, after_id=after_id)
+    if not db_task:
+        return None
+    return _commit_and_refresh(db, db_task)
+
+def delete_task(db: Session, task_id: int):
+    """
+    Soft deletes a task, or permanently removes it if already deleted.
+    """
+    db_task = _delete_task(db, task_id)
+    if db_task:
+        _commit_and_refresh(db, db_task)
     return db_task
 
+def restore_task(db: Session, task_id: int):
+    """
+    Restores an archived task to the ToDo column.
+    """
+    db_task = _restore_task(db, task_id)
+    if not db_task:
+        return None
+    return _commit_and_refresh(db, db_task)
+
+def apply_task_batch(db: Session, operations: List[schemas.TaskBatchOperation]) -> List[schemas.TaskBatchResult]:
+    """
+    Applies several task operations in a single transaction and reports a result per operation.
+    """
+    results = []
+    for index, operation in enumerate(operations):
+        action = operation.op
+        result = schemas.TaskBatchResult(index=index, op=action, ok=False)
+        if action is schemas.TaskBatchAction.reorder:
+            tasks = _reorder_tasks(db, operation.reorder.status, operation.reorder.ordered_ids)
+            db.flush()
+            result.ok = True
+            result.tasks = [schemas.Task.model_validate(task) for task in tasks]
+            results.append(result)
+            continue
+
+        if action is schemas.TaskBatchAction.create:
+            db_task = _create_task(db, operation.task)
+        elif action is schemas.TaskBatchAction.update:
+            db_task = _update_task(db, operation.task_id, operation.changes)
+        elif action is schemas.TaskBatchAction.delete:
+            db_task = _delete_task(db, operation.task_id)
+        else:
+            db_task = _restore_task(db, operation.task_id)
+
+        if db_task is None:
+            result.error = "Task not found"
+        else:
+            # Flush so later operations see this one (ids, order indexes, deletions).
+            db.flush()
+            result.ok = True
+            result.task = schemas.Task.model_validate(db_task)
+        results.append(result)
+    _commit(db)
+    return results
+
+def iter_task_row_batches(db: Session, batch_size: int = 1000) -> Iterator[Sequence]:
+    """
+    Streams every task, live and archived, as batches of TASK_ROW_COLUMNS rows in board order.
+    """
+    statement = (
+        select(*TASK_ROW_COLUMNS)
+        .order_by(models.Task.status, models.Task.order_index, models.Task.id)
+        .execution_options(yield_per=batch_size)
+    )
+    yield from db.execute(statement).partitions()
+
+def _insert_task_batch(
+    db: Session,
+    records: List[schemas.TaskImport],
+    first_id: int,
+    next_order: Dict[str, int],
+    tag_ids: Dict[str, int],
+    change_seq: int,
+) -> int:
+    now = datetime.utcnow()
+    rows = []
+    for task_id, record in enumerate(records, start=first_id):
+        row = record.model_dump(exclude={"order_index"})
+        row["id"] = task_id
+        status_value = record.status.value
+        row["status"] = status_value
+        row["created_at"] = record.created_at or now
+        if status_value == TaskStatus.done.value:
+            row["done_at"] = record.done_at or now
+        else:
+            row["done_at"] = None
+        if record.deleted_at is not None and record.archived_at is None:
+            row["archived_at"] = record.deleted_at
+        row["order_index"] = next_order[status_value]
+        next_order[status_value] += 1
+        row["change_seq"] = change_seq
+        rows.append(row)
+    db.execute(insert(models.Task), rows)
+
+    links = []
+    for row in rows:
+        task_id = row["id"]
+        for tag in _parse_tags(row["tags"]):
+            tag_lower = tag.lower()
+            if tag_lower not in tag_ids:
+                result = db.execute(insert(models.Tag).values(name=tag))
+                tag_ids[tag_lower] = result.inserted_primary_key[0]
+            links.append({"task_id": task_id, "tag_id": tag_ids[tag_lower]})
+    if links:
+        db.execute(insert(models.task_tags).prefix_with("OR IGNORE"), links)
+    return len(rows)
+
+def import_tasks(
+    db: Session, records: Iterable[schemas.TaskImport], batch_size: int = IMPORT_BATCH_SIZE
+) -> int:
+    """
+    Inserts imported tasks with one executemany per batch, registering their tags and
+    appending them to their columns in input order. The import commits as one transaction.
+    """
+    next_order = {status.value: _get_next_order_index(db, status.value) for status in TaskStatus}
+    tag_ids = {name.lower(): tag_id for tag_id, name in db.execute(select(models.Tag.id, models.Tag.name))}
+    change_seq = _next_change_seq(db)
+    # _next_change_seq took SQLite's write lock, so ids past the current maximum stay free
+    # and can be assigned up front; that keeps each batch a plain executemany.
+    first_id = (db.query(func.max(models.Task.id)).scalar() or 0) + 1
+    imported = 0
+    batch = []
+    for record in records:
+        batch.append(record)
+        if len(batch) == batch_size:
+            imported += _insert_task_batch(db, batch, first_id + imported, next_order, tag_ids, change_seq)
+            batch = []
+    if batch:
+        imported += _insert_task_batch(db, batch, first_id + imported, next_order, tag_ids, change_seq)
+    if imported:
+        # Imported tasks keep their own timestamps, which may fall in past weeks.
+        _rewrite_history(db)
+    _commit(db)
+    if imported:
+        # Too many tasks for one event each; open boards refetch instead.
+        events.broker.publish([events.RESYNC_EVENT])
+    return imported
+
 def get_tags(db: Session) -> List[str]:
     """
     Retrieves saved tags for suggestions.
     """
-    tags = db.query(models.Tag).all()
-    tag_names = {tag.name for tag in tags}
-    tag_lookup = {name.lower() for name in tag_names}
-    task_tags = db.query(models.Task.tags).filter(models.Task.tags.isnot(None)).all()
-    added = False
-    for (tags_value,) in task_tags:
-        for tag in _parse_tags(tags_value):
-            tag_lower = tag.lower()
-            if tag_lower not in tag_lookup:
-                db.add(models.Tag(name=tag))
-                tag_names.add(tag)
-                tag_lookup.add(tag_lower)
-                added = True
-    if added:
-        db.commit()
-    return sorted(tag_names, key=lambda name: name.lower())
-
-def delete_archived_tasks(db: Session) -> int:
-    """
-    Permanently deletes archived or soft-deleted tasks.
-    """
-    archived_tasks = get_archived_tasks(db, skip=0, limit=10_000)
-    for task in archived_tasks:
-        db.delete(task)
-    db.commit()
-    return len(archived_tasks)
+    rows = db.query(models.Tag.name).order_by(func.lower(models.Tag.name)).all()
+    return [name for (name,) in rows]
+
+def delete_archived_tasks(
+    db: Session,
+    older_than: Optional[datetime] = None,
+    tag: Optional[str] = None,
+    batch_size: int = 5000,
+) -> int:
+    """
+    Permanently deletes archived or soft-deleted tasks with set-based DELETEs, one chunk per transaction.
+    """
+    archived_ids = select(models.Task.id).where(models.Task.archived_at.isnot(None))
+    if older_than is not None:
+        if older_than.tzinfo is not None:
+            # Timestamps are stored as naive UTC.
+            older_than = older_than.astimezone(timezone.utc).replace(tzinfo=None)
+        archived_ids = archived_ids.where(_archive_sort_key() < older_than)
+    if tag:
+        archived_ids = archived_ids.where(_tag_filter(tag))
+
+    deleted_count = 0
+    while True:
+        deleted_ids = db.execute(
+            delete(models.Task)
+            .where(models.Task.id.in_(archived_ids.limit(batch_size)))
+            .returning(models.Task.id),
+            execution_options={"synchronize_session": False},
+        ).scalars().all()
+        if not deleted_ids:
+            # Nothing (left) to purge: end the transaction without bumping the board revision.
+            db.commit()
+            return deleted_count
+        db.execute(delete(models.task_tags).where(models.task_tags.c.task_id.in_(deleted_ids)))
+        for task_id in deleted_ids:
+            _record_change(db, "deleted", task_id)
+        _rewrite_history(db)
+        _commit(db)
+        deleted_count += len(deleted_ids)
+        if len(deleted_ids) < batch_size:
+            return deleted_count
@@ -0,0 +1,135 @@
+"""
+Async counterparts of the crud functions for the aiosqlite engine.
+
+Each function runs its crud counterpart through AsyncSession.run_sync, so queries,
+change stamping and event publishing stay in one place while the event loop is free
+whenever SQLite is busy.
+"""
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import crud, schemas
+
+
+async def get_tasks(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: Optional[int] = None,
+    filters: Optional[schemas.TaskFilters] = None,
+    sort: schemas.TaskSort = schemas.TaskSort.manual,
+):
+    """Async crud.get_tasks."""
+    return await db.run_sync(crud.get_tasks, skip=skip, limit=limit, filters=filters, sort=sort)
+
+
+async def get_task_rows(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: Optional[int] = None,
+    filters: Optional[schemas.TaskFilters] = None,
+    sort: schemas.TaskSort = schemas.TaskSort.manual,
+):
+    """Async crud.get_task_rows."""
+    return await db.run_sync(crud.get_task_rows, skip=skip, limit=limit, filters=filters, sort=sort)
+
+
+async def search_tasks(db: AsyncSession, search: str, limit: int = 50, include_archived: bool = False):
+    """Async crud.search_tasks."""
+    return await db.run_sync(crud.search_tasks, search, limit=limit, include_archived=include_archived)
+
+
+async def get_archived_tasks(db: AsyncSession, limit: int = 200, cursor: Optional[str] = None):
+    """Async crud.get_archived_tasks."""
+    return await db.run_sync(crud.get_archived_tasks, limit=limit, cursor=cursor)
+
+
+async def get_archived_task_rows(db: AsyncSession, limit: int = 200, cursor: Optional[str] = None):
+    """Async crud.get_archived_task_rows."""
+    return await db.run_sync(crud.get_archived_task_rows, limit=limit, cursor=cursor)
+
+
+async def count_archived_tasks(db: AsyncSession) -> int:
+    """Async crud.count_archived_tasks."""
+    return await db.run_sync(crud.count_archived_tasks)
+
+
+async def get_task_stats(db: AsyncSession, filters: Optional[schemas.TaskFilters] = None) -> dict:
+    """Async crud.get_task_stats."""
+    return await db.run_sync(crud.get_task_stats, filters=filters)
+
+
+async def get_change_token(db: AsyncSession) -> str:
+    """Async crud.get_change_token."""
+    return await db.run_sync(crud.get_change_token)
+
+
+async def get_task_changes(
+    db: AsyncSession, since: Optional[str] = None, limit: int = 500
+) -> Tuple[List[dict], str, bool]:
+    """Async crud.get_task_changes."""
+    return await db.run_sync(crud.get_task_changes, since=since, limit=limit)
+
+
+async def next_archive_time(db: AsyncSession) -> Optional[datetime]:
+    """Async crud.next_archive_time."""
+    return await db.run_sync(crud.next_archive_time)
+
+
+async def get_tags(db: AsyncSession) -> List[str]:
+    """Async crud.get_tags."""
+    return await db.run_sync(crud.get_tags)
+
+
+async def create_task(db: AsyncSession, task: schemas.TaskCreate):
+    """Async crud.create_task."""
+    return await db.run_sync(crud.create_task, task)
+
+
+async def update_task(db: AsyncSession, task_id: int, task_update: schemas.TaskUpdate):
+    """Async crud.update_task."""
+    return await db.run_sync(crud.update_task, task_id, task_update)
+
+
+async def reorder_tasks(db: AsyncSession, status: schemas.TaskStatus, ordered_ids: List[int]):
+    """Async crud.reorder_tasks."""
+    return await db.run_sync(crud.reorder_tasks, status, ordered_ids)
+
+
+async def move_task(
+    db: AsyncSession,
+    task_id: int,
+    status: Optional[schemas.TaskStatus] = None,
+    before_id: Optional[int] = None,
+    after_id: Optional[int] = None,
+):
+    """Async crud.move_task."""
+    return await db.run_sync(crud.move_task, task_id, status=status, before_id=before_id, after_id=after_id)
+
+
+async def delete_task(db: AsyncSession, task_id: int):
+    """Async crud.delete_task."""
+    return await db.run_sync(crud.delete_task, task_id)
+
+
+async def restore_task(db: AsyncSession, task_id: int):
+    """Async crud.restore_task."""
+    return await db.run_sync(crud.restore_task, task_id)
+
+
+async def apply_task_batch(
+    db: AsyncSession, operations: List[schemas.TaskBatchOperation]
+) -> List[schemas.TaskBatchResult]:
+    """Async crud.apply_task_batch."""
+    return await db.run_sync(crud.apply_task_batch, operations)
+
+
+async def delete_archived_tasks(
+    db: AsyncSession,
+    older_than: Optional[datetime] = None,
+    tag: Optional[str] = None,
+    batch_size: int = 5000,
+) -> int:
+    """Async crud.delete_archived_tasks."""
+    return await db.run_sync(crud.delete_archived_tasks, older_than=older_than, tag=tag, batch_size=batch_size)
@@ -4,9 +4,13 @@ It configures the SQLAlchemy engine, session factory, and declarative base.
 """
 from pathlib import Path
 import os
+import re
 import sys
-from sqlalchemy import create_engine, Engine
+from typing import Dict
+from sqlalchemy import create_engine, event, Engine
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import declarative_base, sessionmaker, Session
+from sqlalchemy.pool import QueuePool, StaticPool
 
 BASE_DIR = Path(__file__).resolve().parent
 
@@ -35,13 +39,141 @@ def get_database_url() -> str:
     return f"sqlite:///{data_dir / 'po_helper.db'}"
 
 
+# Applied to every new SQLite connection; WAL lets reads proceed while a write commits.
+DEFAULT_SQLITE_PRAGMAS: Dict[str, str] = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "busy_timeout": "5000",
+    "cache_size": "-20000",
+    "mmap_size": "268435456",
+    "temp_store": "MEMORY",
+}
+
+_PRAGMA_VALUE = re.compile(r"^-?[A-Za-z0-9_]+$")
+
+
+def get_sqlite_pragmas() -> Dict[str, str]:
+    """Return the connection pragmas, each overridable via POHELPER_SQLITE_<NAME>.
+
+    An empty override skips that pragma and keeps SQLite's own default.
+    """
+    pragmas = {}
+    for name, default in DEFAULT_SQLITE_PRAGMAS.items():
+        value = os.getenv(f"POHELPER_SQLITE_{name.upper()}", default).strip()
+        if not value:
+            continue
+        if not _PRAGMA_VALUE.match(value):
+            raise ValueError(f"Invalid value for SQLite pragma {name}: {value!r}")
+        pragmas[name] = value
+    return pragmas
+
+
+def get_pool_options(database_url: str) -> dict:
+    """Return create_engine pool options for the database URL.
+
+    In-memory databases live and die with their connection, so they share a single
+    one. File databases keep a queue of open connections so their pragmas and page
+    cache survive between requests; POHELPER_DB_POOL_SIZE and
+    POHELPER_DB_MAX_OVERFLOW size it.
+    """
+    database = make_url(database_url).database
+    if not database or database == ":memory:":
+        return {"poolclass": StaticPool}
+    return {
+        "poolclass": QueuePool,
+        "pool_size": int(os.getenv("POHELPER_DB_POOL_SIZE", "8")),
+        "max_overflow": int(os.getenv("POHELPER_DB_MAX_OVERFLOW", "16")),
+    }
+
+
+def configure_sqlite_connection(dbapi_connection, pragmas: Dict[str, str]) -> None:
+    """Apply pragmas to a new DBAPI connection."""
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name} = {value}")
+    finally:
+        cursor.close()
+
+
+def create_sqlite_engine(database_url: str) -> Engine:
+    """Create the engine with the pool and per-connection pragmas for SQLite."""
+    new_engine = create_engine(
+        database_url,
+        connect_args={"check_same_thread": False},
+        **get_pool_options(database_url),
+    )
+    pragmas = get_sqlite_pragmas()
+
+    @event.listens_for(new_engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        configure_sqlite_connection(dbapi_connection, pragmas)
+
+    return new_engine
+
+
+def async_db_enabled() -> bool:
+    """Return whether the API should serve requests through the async engine."""
+    return os.getenv("POHELPER_ASYNC_DB", "").strip().lower() in {"1", "true", "yes", "on"}
+
+
+def get_async_database_url(database_url: str) -> str:
+    """Return the aiosqlite form of a SQLite database URL."""
+    return str(make_url(database_url).set(drivername="sqlite+aiosqlite"))
+
+
+def create_async_sqlite_engine(database_url: str):
+    """Create an aiosqlite engine with the same pool and pragmas as the sync engine.
+
+    Requires the optional aiosqlite and greenlet packages.
+    """
+    try:
+        from sqlalchemy.ext.asyncio import create_async_engine
+        import aiosqlite  # noqa: F401
+    except ImportError as exc:
+        raise RuntimeError(
+            "POHELPER_ASYNC_DB needs the aiosqlite and greenlet packages installed"
+        ) from exc
+
+    async_url = get_async_database_url(database_url)
+    options = get_pool_options(database_url)
+    if options["poolclass"] is QueuePool:
+        # The async engine needs the asyncio-aware queue pool.
+        from sqlalchemy.pool import AsyncAdaptedQueuePool
+        options["poolclass"] = AsyncAdaptedQueuePool
+    new_engine = create_async_engine(async_url, **options)
+    pragmas = get_sqlite_pragmas()
+
+    @event.listens_for(new_engine.sync_engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        configure_sqlite_connection(dbapi_connection, pragmas)
+
+    return new_engine
+
+
 SQLALCHEMY_DATABASE_URL = get_database_url()
 
-engine: Engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
-)
+engine: Engine = create_sqlite_engine(SQLALCHEMY_DATABASE_URL)
 SessionLocal: sessionmaker[Session] = sessionmaker(
     autocommit=False, autoflush=False, bind=engine
 )
 
+# Created on first use so the sync-only setup never imports aiosqlite.
+async_engine = None
+AsyncSessionLocal = None
+
+
+def get_async_sessionmaker():
+    """Return the async session factory, creating the async engine on first use."""
+    global async_engine, AsyncSessionLocal
+    if AsyncSessionLocal is None:
+        from sqlalchemy.ext.asyncio import async_sessionmaker
+
+        async_engine = create_async_sqlite_engine(SQLALCHEMY_DATABASE_URL)
+        # Objects stay loaded after commit so responses serialize without extra queries.
+        AsyncSessionLocal = async_sessionmaker(
+            async_engine, autoflush=False, expire_on_commit=False
+        )
+    return AsyncSessionLocal
+
 Base = declarative_base()
@@ -1,26 +1,93 @@
 """
 Desktop launcher for PO Helper using a local FastAPI server and pywebview.
+
+The window opens straight away on a static loading shell. The app module (and with it
+the schema check) is imported on a background thread, which points the window at the
+board once the server signals that it is accepting connections, or at an error page
+when startup fails.
 """
 from __future__ import annotations
 
 from dataclasses import dataclass
 import asyncio
+import html
+import logging
 import threading
 import socket
 import sys
-import time
 
 import uvicorn
-import webview
 
-from main import app
+SERVER_START_TIMEOUT_SECONDS = 30
+
+logger = logging.getLogger(__name__)
+
+# Shown until the server is up; self-contained so it paints without any request.
+LOADING_HTML = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="UTF-8">
+<title>PO Helper</title>
+<style>
+  html, body { height: 100%; margin: 0; }
+  body { display: flex; align-items: center; justify-content: center;
+         font-family: system-ui, sans-serif; color: #6c757d; background: #f8f9fa; }
+  .spinner { width: 1.5rem; height: 1.5rem; margin-right: .75rem; border-radius: 50%;
+             border: .2rem solid #dee2e6; border-top-color: #0d6efd;
+             animation: spin .8s linear infinite; }
+  @keyframes spin { to { transform: rotate(360deg); } }
+</style>
+</head>
+<body><div class="spinner"></div>Loading PO Helper&hellip;</body>
+</html>
+"""
+
+# Replaces the loading shell when the app cannot start; {message} is the escaped error.
+ERROR_HTML = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="UTF-8">
+<title>PO Helper</title>
+<style>
+  html, body {{ height: 100%; margin: 0; }}
+  body {{ display: flex; align-items: center; justify-content: center;
+         font-family: system-ui, sans-serif; color: #212529; background: #f8f9fa; }}
+  main {{ max-width: 32rem; padding: 1.5rem; }}
+  h1 {{ font-size: 1.25rem; color: #dc3545; }}
+  pre {{ white-space: pre-wrap; color: #6c757d; }}
+</style>
+</head>
+<body><main>
+<h1>PO Helper could not start</h1>
+<pre>{message}</pre>
+<p>Close this window and launch PO Helper again. The full error is in the launcher log.</p>
+</main></body>
+</html>
+"""
+
+
+class NotifyingServer(uvicorn.Server):
+    """Uvicorn server that sets `ready` once it is listening."""
+
+    def __init__(self, config: uvicorn.Config):
+        super().__init__(config)
+        self.ready = threading.Event()
+
+    async def startup(self, sockets=None) -> None:
+        await super().startup(sockets=sockets)
+        self.ready.set()
 
 
 @dataclass(frozen=True)
 class ServerHandle:
     """Container for the Uvicorn server and its background thread."""
-    server: uvicorn.Server
+    server: NotifyingServer
     thread: threading.Thread
+    port: int
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}/"
 
 
 def find_free_port() -> int:
@@ -30,24 +97,38 @@ def find_free_port() -> int:
         return sock.getsockname()[1]
 
 
-def start_server(port: int) -> ServerHandle:
-    """Start the FastAPI server in a background thread."""
+def _serve(server: NotifyingServer) -> None:
+    try:
+        server.run()
+    except SystemExit:
+        # Uvicorn exits when it cannot start (e.g. the port is taken); start_server reports it.
+        pass
+    finally:
+        # Also wakes start_server when startup failed and the server never listened.
+        server.ready.set()
+
+
+def start_server(port: int, timeout: float = SERVER_START_TIMEOUT_SECONDS) -> ServerHandle:
+    """
+    Start the FastAPI server in a background thread and wait until it accepts
+    connections. Importing the app here keeps it off the window's startup path.
+    """
+    from main import app
+
     config = uvicorn.Config(
         app,
         host="127.0.0.1",
         port=port,
         log_level="warning",
     )
-    server = uvicorn.Server(config)
-    thread = threading.Thread(target=server.run, daemon=True)
+    server = NotifyingServer(config)
+    thread = threading.Thread(target=_serve, args=(server,), daemon=True)
     thread.start()
 
-    for _ in range(50):
-        if server.started:
-            break
-        time.sleep(0.1)
-
-    return ServerHandle(server=server, thread=thread)
+    if not server.ready.wait(timeout) or not server.started:
+        server.should_exit = True
+        raise RuntimeError(f"PO Helper server did not start on port {port}")
+    return ServerHandle(server=server, thread=thread, port=port)
 
 
 def stop_server(handle: ServerHandle) -> None:
@@ -55,6 +136,22 @@ def stop_server(handle: ServerHandle) -> None:
     handle.server.should_exit = True
 
 
+def boot(window, handles: list) -> None:
+    """
+    Start the server and point the window at the board. Runs on pywebview's thread, so a
+    failure (importing the app, a busy port, a startup timeout) is logged and shown in the
+    window instead of leaving it on the loading shell.
+    """
+    try:
+        handle = start_server(find_free_port())
+    except Exception as exc:
+        logger.exception("PO Helper server failed to start")
+        window.load_html(ERROR_HTML.format(message=html.escape(str(exc) or type(exc).__name__)))
+        return
+    handles.append(handle)
+    window.load_url(handle.url)
+
+
 def configure_event_loop_policy() -> None:
     """Configure a selector-based loop on Windows to avoid thread shutdown errors."""
     if sys.platform.startswith("win"):
@@ -66,18 +163,24 @@ def configure_event_loop_policy() -> None:
 
 def main() -> None:
     """Launch the desktop app window."""
+    import webview
+
     configure_event_loop_policy()
-    port = find_free_port()
-    handle = start_server(port)
-    url = f"http://127.0.0.1:{port}/"
+    handles = []
+
+    def shutdown() -> None:
+        for handle in handles:
+            stop_server(handle)
 
-    window = webview.create_window("PO Helper", url, width=1100, height=800)
-    window.events.closed += lambda: stop_server(handle)
+    window = webview.create_window("PO Helper", html=LOADING_HTML, width=1100, height=800)
+    window.events.closed += shutdown
     try:
-        webview.start()
+        # pywebview runs boot on its own thread once the window is shown.
+        webview.start(boot, (window, handles))
     finally:
-        stop_server(handle)
-        handle.thread.join(timeout=2)
+        shutdown()
+        for handle in handles:
+            handle.thread.join(timeout=2)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,67 @@
+"""
+In-process change feed for the board.
+
+crud publishes task-level change events after each committed write and every
+open event stream (see main.stream_task_events) receives them on its own queue.
+Writes run in worker threads, so events are handed to each subscriber's event
+loop with call_soon_threadsafe.
+"""
+import asyncio
+import threading
+from typing import List, Set, Tuple
+
+SUBSCRIBER_QUEUE_SIZE = 1000
+
+# Sent instead of the dropped events when a subscriber falls too far behind.
+RESYNC_EVENT = {"type": "resync"}
+
+
+class ChangeBroker:
+    """Fans out change events to asyncio subscribers."""
+
+    def __init__(self, queue_size: int = SUBSCRIBER_QUEUE_SIZE):
+        self._queue_size = queue_size
+        self._subscribers: Set[Tuple[asyncio.AbstractEventLoop, asyncio.Queue]] = set()
+        self._lock = threading.Lock()
+
+    def subscribe(self) -> asyncio.Queue:
+        """Registers a queue on the running event loop and returns it."""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self._queue_size)
+        with self._lock:
+            self._subscribers.add((asyncio.get_running_loop(), queue))
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        with self._lock:
+            self._subscribers = {entry for entry in self._subscribers if entry[1] is not queue}
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def publish(self, events: List[dict]) -> None:
+        """Delivers events to every subscriber; safe to call from any thread."""
+        if not events:
+            return
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(self._deliver, queue, events)
+            except RuntimeError:
+                # The subscriber's loop has closed; forget it.
+                self.unsubscribe(queue)
+
+    @staticmethod
+    def _deliver(queue: asyncio.Queue, events: List[dict]) -> None:
+        for event in events:
+            if queue.full():
+                # The client missed events; tell it to refetch instead of queueing forever.
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(RESYNC_EVENT)
+                return
+            queue.put_nowait(event)
+
+
+broker = ChangeBroker()
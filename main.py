@@ -1,50 +1,81 @@
-from fastapi import FastAPI, Request, Depends, HTTPException
-from fastapi.responses import HTMLResponse
+import asyncio
+import json
+import logging
+import uuid
+from contextlib import asynccontextmanager, suppress
+from datetime import date, datetime, time, timedelta, timezone
+
+import anyio
+from fastapi import APIRouter, FastAPI, Request, Response, Depends, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import HTMLResponse, StreamingResponse
+from fastapi.routing import APIRoute
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from pathlib import Path
-from sqlalchemy import text
 from sqlalchemy.orm import Session
-from typing import List # Added for Python 3.8 compatibility
+from typing import List, Optional # Added for Python 3.8 compatibility
 
-import crud, models, schemas
-from database import SessionLocal, engine
+import analytics, cache, crud, crud_async, database, events, metrics, migrations, schemas, serializers, transfer
+from database import SessionLocal, async_db_enabled, engine
 
 BASE_DIR = Path(__file__).resolve().parent
+ARCHIVE_SWEEP_INTERVAL_SECONDS = 60
+EVENT_STREAM_KEEPALIVE_SECONDS = 15
+EVENT_STREAM_RETRY_MS = 3000
+# Distinguishes board revisions across restarts, since the revision counter lives in memory.
+BOARD_ETAG_PREFIX = uuid.uuid4().hex[:12]
+
+logger = logging.getLogger(__name__)
+
+def prepare_database() -> bool:
+    """
+    Brings the schema up to date (see migrations); returns whether any migration ran.
+    """
+    return bool(migrations.migrate(engine))
+
+prepare_database()
+
+def sweep_archived_tasks() -> int:
+    """
+    Moves Done tasks past the archive cutoff into the archive and renumbers columns
+    whose manual order ran out of room between cards.
+    """
+    db = SessionLocal()
+    try:
+        archived = crud.archive_expired_tasks(db)
+        crud.rebalance_pending_columns(db)
+        return archived
+    finally:
+        db.close()
+
+async def run_archive_sweeper(interval: float = ARCHIVE_SWEEP_INTERVAL_SECONDS):
+    """
+    Periodically runs the archive sweep until cancelled.
+    """
+    while True:
+        try:
+            await run_in_threadpool(sweep_archived_tasks)
+        except Exception:
+            logger.exception("Archive sweep failed")
+        await asyncio.sleep(interval)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Starts the archive sweeper for the lifetime of the app.
+    """
+    sweeper = asyncio.create_task(run_archive_sweeper())
+    try:
+        yield
+    finally:
+        sweeper.cancel()
+        with suppress(asyncio.CancelledError):
+            await sweeper
+        if database.async_engine is not None:
+            await database.async_engine.dispose()
 
-models.Base.metadata.create_all(bind=engine)
-
-def ensure_task_columns():
-    """
-    Ensures required task columns exist in the SQLite table.
-    """
-    with engine.connect() as conn:
-        result = conn.execute(text("PRAGMA table_info(tasks)")).fetchall()
-        columns = {row[1] for row in result}
-        if "created_at" not in columns:
-            conn.execute(text("ALTER TABLE tasks ADD COLUMN created_at DATETIME"))
-        if "order_index" not in columns:
-            conn.execute(text("ALTER TABLE tasks ADD COLUMN order_index INTEGER"))
-        if "done_at" not in columns:
-            conn.execute(text("ALTER TABLE tasks ADD COLUMN done_at DATETIME"))
-            conn.execute(
-                text(
-                    "UPDATE tasks SET done_at = created_at "
-                    "WHERE status = 'Done' AND done_at IS NULL AND created_at IS NOT NULL"
-                )
-            )
-        if "deleted_at" not in columns:
-            conn.execute(text("ALTER TABLE tasks ADD COLUMN deleted_at DATETIME"))
-        if "urgent" not in columns:
-            conn.execute(text("ALTER TABLE tasks ADD COLUMN urgent BOOLEAN"))
-            conn.execute(text("UPDATE tasks SET urgent = 0 WHERE urgent IS NULL"))
-        conn.execute(text("UPDATE tasks SET status = 'ToDo' WHERE status = 'To Do'"))
-        conn.execute(text("UPDATE tasks SET status = 'Ongoing' WHERE status = 'In Progress'"))
-        conn.commit()
-
-ensure_task_columns()
-
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 # Dependency
 def get_db():
@@ -65,7 +96,7 @@ def read_root(request: Request):
     """
     Renders the main index page.
     """
-    return templates.TemplateResponse("index.html", {"request": request})
+    return templates.TemplateResponse(request, "index.html")
 
 @app.post("/tasks/", response_model=schemas.Task)
 def create_task(task: schemas.TaskCreate, db: Session = Depends(get_db)):
@@ -74,27 +105,322 @@ def create_task(task: schemas.TaskCreate, db: Session = Depends(get_db)):
     """
     return crud.create_task(db=db, task=task)
 
-@app.get("/tasks/", response_model=List[schemas.Task])
-def read_tasks(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+def get_task_filters(
+    status: Optional[List[schemas.TaskStatus]] = Query(None),
+    tag: Optional[str] = None,
+    urgent: Optional[bool] = None,
+    due_from: Optional[date] = None,
+    due_to: Optional[date] = None,
+    q: Optional[str] = None,
+) -> schemas.TaskFilters:
+    """Dependency that collects the board filter query parameters."""
+    return schemas.TaskFilters(
+        status=status,
+        tag=tag,
+        urgent=urgent,
+        due_from=due_from,
+        due_to=due_to,
+        q=q,
+    )
+
+def board_etag() -> str:
+    """
+    Builds a weak ETag for board reads from the current board revision.
+    """
+    return f'W/"{BOARD_ETAG_PREFIX}-{crud.get_board_revision()}"'
+
+def not_modified(request: Request, response: Response) -> Optional[Response]:
+    """
+    Tags a board read with the current ETag; returns a 304 if the client already holds it.
+
+    The ETag is taken before the read runs, so a write racing with the query only makes
+    the client fetch again on its next poll.
+    """
+    etag = board_etag()
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        candidates = {value.strip() for value in if_none_match.split(",")}
+        # Weak comparison: a client may echo the tag without its W/ prefix.
+        if candidates & {"*", etag, etag[2:]}:
+            return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
+
+# Serialized board reads, reused until the next write or archive boundary.
+read_cache = cache.ReadCache(crud.get_board_revision)
+# Finished analytics weeks, kept until a write rewrites past timestamps.
+task_analytics = analytics.WeeklyAnalytics(crud.get_history_revision)
+
+def encode_task_rows(rows) -> bytes:
+    """Encodes task rows for a list response, timed as the `encode` Server-Timing phase."""
+    with metrics.phase("encode"):
+        return serializers.dump_task_rows(rows)
+
+def board_read_key(skip, limit, sort: schemas.TaskSort, filters: schemas.TaskFilters) -> tuple:
+    return ("tasks", skip, limit, sort.value, filters.model_dump_json())
+
+def cached_response(entry: cache.CachedRead, response: Response) -> Response:
+    """
+    Builds the JSON response for a cached read, keeping headers already set on response.
+    """
+    headers = dict(response.headers)
+    headers.update(entry.headers)
+    return serializers.FastJSONResponse(content=entry.content, headers=headers)
+
+@app.get("/tasks/", response_model=List[schemas.Task], response_class=serializers.FastJSONResponse)
+def read_tasks(
+    request: Request,
+    response: Response,
+    skip: int = 0,
+    limit: Optional[int] = None,
+    sort: schemas.TaskSort = schemas.TaskSort.manual,
+    filters: schemas.TaskFilters = Depends(get_task_filters),
+    db: Session = Depends(get_db),
+):
+    """
+    Retrieves board tasks, filtered and sorted on the server.
+    """
+    cached = not_modified(request, response)
+    if cached is not None:
+        return cached
+
+    def load() -> cache.CachedRead:
+        token = crud.get_change_token(db)
+        rows = crud.get_task_rows(db, skip=skip, limit=limit, filters=filters, sort=sort)
+        return cache.CachedRead(
+            content=encode_task_rows(rows),
+            headers={"X-Change-Token": token},
+            expires_at=crud.next_archive_time(db),
+        )
+
+    entry = read_cache.get_or_load(board_read_key(skip, limit, sort, filters), load)
+    return cached_response(entry, response)
+
+@app.get("/tasks/changes", response_model=schemas.TaskChanges)
+def read_task_changes(
+    since: Optional[str] = None,
+    limit: int = Query(500, ge=1, le=5000),
+    db: Session = Depends(get_db),
+):
+    """
+    Returns tasks changed since a token plus tombstones for purged tasks.
+
+    Pass the X-Change-Token header of GET /tasks/, or the token of the previous page, as
+    `since`; without it every task is returned. Keep paging while has_more is true.
+    """
+    try:
+        changes, token, has_more = crud.get_task_changes(db, since=since, limit=limit)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    return {"changes": changes, "token": token, "has_more": has_more}
+
+def stream_task_export(export_format: schemas.TransferFormat):
+    """
+    Yields the encoded export batch by batch from its own session, which stays open
+    while the response streams.
+    """
+    db = SessionLocal()
+    try:
+        yield from transfer.iter_export(
+            crud.iter_task_row_batches(db, transfer.EXPORT_BATCH_SIZE), export_format
+        )
+    finally:
+        db.close()
+
+@app.get("/tasks/export")
+def export_tasks(format: schemas.TransferFormat = schemas.TransferFormat.ndjson):
+    """
+    Streams every task, live and archived, as NDJSON (one task object per line) or CSV.
+    """
+    return StreamingResponse(
+        stream_task_export(format),
+        media_type=transfer.MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="tasks.{format.value}"'},
+    )
+
+@app.get("/tasks/search", response_model=List[schemas.Task])
+def search_tasks(
+    q: str,
+    limit: int = Query(50, ge=1, le=500),
+    include_archived: bool = False,
+    db: Session = Depends(get_db),
+):
+    """
+    Full-text searches task titles, descriptions and tags, best matches first.
+    """
+    return crud.search_tasks(db, q, limit=limit, include_archived=include_archived)
+
+@app.get("/tasks/archived", response_model=List[schemas.Task], response_class=serializers.FastJSONResponse)
+def read_archived_tasks(
+    request: Request,
+    response: Response,
+    limit: int = Query(200, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db),
+):
+    """
+    Retrieves one page of archived tasks; the next page's cursor is sent in X-Next-Cursor.
+    """
+    cached = not_modified(request, response)
+    if cached is not None:
+        return cached
+
+    def load() -> cache.CachedRead:
+        rows = crud.get_archived_task_rows(db, limit=limit, cursor=cursor)
+        headers = {}
+        if len(rows) == limit:
+            headers["X-Next-Cursor"] = crud.encode_archive_cursor(rows[-1])
+        return cache.CachedRead(
+            content=encode_task_rows(rows),
+            headers=headers,
+            expires_at=crud.next_archive_time(db),
+        )
+
+    try:
+        entry = read_cache.get_or_load(("archived", limit, cursor), load)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    return cached_response(entry, response)
+
+async def stream_task_events(request: Request, keepalive: float = EVENT_STREAM_KEEPALIVE_SECONDS):
+    """
+    Yields committed task changes as Server-Sent Events until the client goes away.
+    """
+    queue = events.broker.subscribe()
+    try:
+        yield f"retry: {EVENT_STREAM_RETRY_MS}\n\n"
+        while not await request.is_disconnected():
+            try:
+                event = await asyncio.wait_for(queue.get(), timeout=keepalive)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            event_id = f"id: {event['revision']}\n" if "revision" in event else ""
+            yield f"{event_id}data: {json.dumps(event)}\n\n"
+    finally:
+        events.broker.unsubscribe(queue)
+
+@app.get("/tasks/events")
+async def read_task_events(request: Request):
+    """
+    Streams created/updated/moved/deleted/restored/archived task events as they are committed.
+    """
+    return StreamingResponse(
+        stream_task_events(request),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@app.get("/tasks/archived/count")
+def read_archived_count(request: Request, response: Response, db: Session = Depends(get_db)):
+    """
+    Returns the number of archived tasks.
+    """
+    cached = not_modified(request, response)
+    if cached is not None:
+        return cached
+    return {"count": crud.count_archived_tasks(db)}
+
+def stats_expiry(next_archive_time: Optional[datetime]) -> datetime:
+    """
+    Returns when cached stats go stale: at the next archive sweep or, since the overdue
+    count depends on the date, at local midnight (as naive UTC, like the cache clock).
+    """
+    midnight = datetime.combine(date.today() + timedelta(days=1), time())
+    midnight = midnight.astimezone(timezone.utc).replace(tzinfo=None)
+    return min(midnight, next_archive_time) if next_archive_time else midnight
+
+@app.get("/tasks/stats", response_model=schemas.TaskStats, response_class=serializers.FastJSONResponse)
+def read_task_stats(
+    response: Response,
+    filters: schemas.TaskFilters = Depends(get_task_filters),
+    db: Session = Depends(get_db),
+):
     """
-    Retrieves a list of tasks from the database.
+    Counts board tasks per status, urgent, overdue and per tag, plus archived tasks,
+    optionally filtered like the board.
     """
-    tasks = crud.get_tasks(db, skip=skip, limit=limit)
-    return tasks
+    def load() -> cache.CachedRead:
+        return cache.CachedRead(
+            content=serializers.dump_json(crud.get_task_stats(db, filters=filters)),
+            expires_at=stats_expiry(crud.next_archive_time(db)),
+        )
+
+    entry = read_cache.get_or_load(("stats", filters.model_dump_json()), load)
+    return cached_response(entry, response)
 
-@app.get("/tasks/archived", response_model=List[schemas.Task])
-def read_archived_tasks(skip: int = 0, limit: int = 200, db: Session = Depends(get_db)):
+def analytics_expiry() -> datetime:
+    """Returns the start of next week (naive UTC), when the current week's bucket closes."""
+    return datetime.combine(crud.week_start(datetime.utcnow()) + timedelta(weeks=1), time())
+
+@app.get("/tasks/analytics", response_model=schemas.TaskAnalytics, response_class=serializers.FastJSONResponse)
+def read_task_analytics(
+    response: Response,
+    weeks: int = Query(analytics.DEFAULT_WEEKS, ge=1, le=260),
+    db: Session = Depends(get_db),
+):
     """
-    Retrieves a list of archived tasks from the database.
+    Reports weekly throughput, cumulative flow and lead time percentiles (overall and per
+    tag) for the last `weeks` weeks, ending with the current one.
     """
-    return crud.get_archived_tasks(db, skip=skip, limit=limit)
+    def load() -> cache.CachedRead:
+        return cache.CachedRead(
+            content=serializers.dump_json(task_analytics.report(db, weeks)),
+            expires_at=analytics_expiry(),
+        )
+
+    entry = read_cache.get_or_load(("analytics", weeks), load)
+    return cached_response(entry, response)
 
-@app.get("/tags/", response_model=List[str])
-def read_tags(db: Session = Depends(get_db)):
+@app.get("/tags/", response_model=List[str], response_class=serializers.FastJSONResponse)
+def read_tags(request: Request, response: Response, db: Session = Depends(get_db)):
     """
     Retrieves saved tags for suggestions.
     """
-    return crud.get_tags(db)
+    cached = not_modified(request, response)
+    if cached is not None:
+        return cached
+    entry = read_cache.get_or_load(
+        ("tags",), lambda: cache.CachedRead(content=serializers.dump_json(crud.get_tags(db)))
+    )
+    return cached_response(entry, response)
+
+@app.post("/tasks/batch", response_model=schemas.TaskBatchResponse)
+def apply_task_batch(batch: schemas.TaskBatch, db: Session = Depends(get_db)):
+    """
+    Applies create/update/delete/restore/reorder operations in one transaction.
+    """
+    return {"results": crud.apply_task_batch(db, batch.operations)}
+
+@app.post("/tasks/import")
+async def import_tasks(request: Request, format: schemas.TransferFormat = schemas.TransferFormat.ndjson):
+    """
+    Imports tasks from an NDJSON or CSV body in the export format, reading the upload as
+    it arrives. Nothing is imported if any record is invalid.
+    """
+    chunks = request.stream().__aiter__()
+
+    async def next_chunk() -> bytes:
+        try:
+            return await chunks.__anext__()
+        except StopAsyncIteration:
+            return b""
+
+    def run_import() -> int:
+        # Runs in a worker thread, pulling the body from the event loop chunk by chunk.
+        reader = transfer.ChunkReader(lambda: anyio.from_thread.run(next_chunk))
+        db = SessionLocal()
+        try:
+            return crud.import_tasks(db, transfer.iter_records(reader, format))
+        finally:
+            db.close()
+
+    try:
+        imported_count = await run_in_threadpool(run_import)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    return {"imported_count": imported_count}
 
 @app.put("/tasks/reorder", response_model=List[schemas.Task])
 def reorder_tasks(task_reorder: schemas.TaskReorder, db: Session = Depends(get_db)):
@@ -103,6 +429,25 @@ def reorder_tasks(task_reorder: schemas.TaskReorder, db: Session = Depends(get_d
     """
     return crud.reorder_tasks(db, status=task_reorder.status, ordered_ids=task_reorder.ordered_ids)
 
+@app.put("/tasks/{task_id}/move", response_model=schemas.Task)
+def move_task(task_id: int, task_move: schemas.TaskMove, db: Session = Depends(get_db)):
+    """
+    Moves a task between two neighbours, optionally into another column; only its row is written.
+    """
+    try:
+        db_task = crud.move_task(
+            db,
+            task_id,
+            status=task_move.status,
+            before_id=task_move.before_id,
+            after_id=task_move.after_id,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    if db_task is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+    return db_task
+
 @app.put("/tasks/{task_id}", response_model=schemas.Task)
 def update_task(task_id: int, task_update: schemas.TaskUpdate, db: Session = Depends(get_db)):
     """
@@ -114,11 +459,15 @@ def update_task(task_id: int, task_update: schemas.TaskUpdate, db: Session = Dep
     return db_task
 
 @app.delete("/tasks/archived")
-def delete_archived_tasks(db: Session = Depends(get_db)):
+def delete_archived_tasks(
+    older_than: Optional[datetime] = None,
+    tag: Optional[str] = None,
+    db: Session = Depends(get_db),
+):
     """
-    Permanently deletes all archived tasks.
+    Permanently deletes archived tasks, optionally only those archived before older_than or carrying a tag.
     """
-    deleted_count = crud.delete_archived_tasks(db)
+    deleted_count = crud.delete_archived_tasks(db, older_than=older_than, tag=tag)
     return {"deleted_count": deleted_count}
 
 @app.delete("/tasks/{task_id}", response_model=schemas.Task)
@@ -140,3 +489,248 @@ def restore_task(task_id: int, db: Session = Depends(get_db)):
     if db_task is None:
         raise HTTPException(status_code=404, detail="Task not found")
     return db_task
+
+# Async database path (POHELPER_ASYNC_DB): the same JSON API served by async routes on
+# the aiosqlite engine, so requests do not hold a threadpool worker while SQLite works.
+async_router = APIRouter()
+
+async def get_async_db():
+    """Dependency to get an async database session."""
+    async with database.get_async_sessionmaker()() as db:
+        yield db
+
+@async_router.post("/tasks/", response_model=schemas.Task)
+async def create_task_async(task: schemas.TaskCreate, db=Depends(get_async_db)):
+    return await crud_async.create_task(db, task)
+
+@async_router.get("/tasks/", response_model=List[schemas.Task], response_class=serializers.FastJSONResponse)
+async def read_tasks_async(
+    request: Request,
+    response: Response,
+    skip: int = 0,
+    limit: Optional[int] = None,
+    sort: schemas.TaskSort = schemas.TaskSort.manual,
+    filters: schemas.TaskFilters = Depends(get_task_filters),
+    db=Depends(get_async_db),
+):
+    cached = not_modified(request, response)
+    if cached is not None:
+        return cached
+
+    async def load() -> cache.CachedRead:
+        token = await crud_async.get_change_token(db)
+        rows = await crud_async.get_task_rows(db, skip=skip, limit=limit, filters=filters, sort=sort)
+        return cache.CachedRead(
+            content=encode_task_rows(rows),
+            headers={"X-Change-Token": token},
+            expires_at=await crud_async.next_archive_time(db),
+        )
+
+    entry = await read_cache.get_or_load_async(board_read_key(skip, limit, sort, filters), load)
+    return cached_response(entry, response)
+
+@async_router.get("/tasks/changes", response_model=schemas.TaskChanges)
+async def read_task_changes_async(
+    since: Optional[str] = None,
+    limit: int = Query(500, ge=1, le=5000),
+    db=Depends(get_async_db),
+):
+    try:
+        changes, token, has_more = await crud_async.get_task_changes(db, since=since, limit=limit)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    return {"changes": changes, "token": token, "has_more": has_more}
+
+@async_router.get("/tasks/search", response_model=List[schemas.Task])
+async def search_tasks_async(
+    q: str,
+    limit: int = Query(50, ge=1, le=500),
+    include_archived: bool = False,
+    db=Depends(get_async_db),
+):
+    return await crud_async.search_tasks(db, q, limit=limit, include_archived=include_archived)
+
+@async_router.get("/tasks/archived", response_model=List[schemas.Task], response_class=serializers.FastJSONResponse)
+async def read_archived_tasks_async(
+    request: Request,
+    response: Response,
+    limit: int = Query(200, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    db=Depends(get_async_db),
+):
+    cached = not_modified(request, response)
+    if cached is not None:
+        return cached
+
+    async def load() -> cache.CachedRead:
+        rows = await crud_async.get_archived_task_rows(db, limit=limit, cursor=cursor)
+        headers = {}
+        if len(rows) == limit:
+            headers["X-Next-Cursor"] = crud.encode_archive_cursor(rows[-1])
+        return cache.CachedRead(
+            content=encode_task_rows(rows),
+            headers=headers,
+            expires_at=await crud_async.next_archive_time(db),
+        )
+
+    try:
+        entry = await read_cache.get_or_load_async(("archived", limit, cursor), load)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    return cached_response(entry, response)
+
+@async_router.get("/tasks/archived/count")
+async def read_archived_count_async(request: Request, response: Response, db=Depends(get_async_db)):
+    cached = not_modified(request, response)
+    if cached is not None:
+        return cached
+    return {"count": await crud_async.count_archived_tasks(db)}
+
+@async_router.get("/tasks/stats", response_model=schemas.TaskStats, response_class=serializers.FastJSONResponse)
+async def read_task_stats_async(
+    response: Response,
+    filters: schemas.TaskFilters = Depends(get_task_filters),
+    db=Depends(get_async_db),
+):
+    async def load() -> cache.CachedRead:
+        return cache.CachedRead(
+            content=serializers.dump_json(await crud_async.get_task_stats(db, filters=filters)),
+            expires_at=stats_expiry(await crud_async.next_archive_time(db)),
+        )
+
+    entry = await read_cache.get_or_load_async(("stats", filters.model_dump_json()), load)
+    return cached_response(entry, response)
+
+@async_router.get("/tasks/analytics", response_model=schemas.TaskAnalytics, response_class=serializers.FastJSONResponse)
+async def read_task_analytics_async(
+    response: Response,
+    weeks: int = Query(analytics.DEFAULT_WEEKS, ge=1, le=260),
+    db=Depends(get_async_db),
+):
+    async def load() -> cache.CachedRead:
+        return cache.CachedRead(
+            content=serializers.dump_json(await db.run_sync(task_analytics.report, weeks)),
+            expires_at=analytics_expiry(),
+        )
+
+    entry = await read_cache.get_or_load_async(("analytics", weeks), load)
+    return cached_response(entry, response)
+
+@async_router.get("/tags/", response_model=List[str], response_class=serializers.FastJSONResponse)
+async def read_tags_async(request: Request, response: Response, db=Depends(get_async_db)):
+    cached = not_modified(request, response)
+    if cached is not None:
+        return cached
+
+    async def load() -> cache.CachedRead:
+        return cache.CachedRead(content=serializers.dump_json(await crud_async.get_tags(db)))
+
+    return cached_response(await read_cache.get_or_load_async(("tags",), load), response)
+
+@async_router.post("/tasks/batch", response_model=schemas.TaskBatchResponse)
+async def apply_task_batch_async(batch: schemas.TaskBatch, db=Depends(get_async_db)):
+    return {"results": await crud_async.apply_task_batch(db, batch.operations)}
+
+@async_router.put("/tasks/reorder", response_model=List[schemas.Task])
+async def reorder_tasks_async(task_reorder: schemas.TaskReorder, db=Depends(get_async_db)):
+    return await crud_async.reorder_tasks(db, task_reorder.status, task_reorder.ordered_ids)
+
+@async_router.put("/tasks/{task_id}/move", response_model=schemas.Task)
+async def move_task_async(task_id: int, task_move: schemas.TaskMove, db=Depends(get_async_db)):
+    try:
+        db_task = await crud_async.move_task(
+            db,
+            task_id,
+            status=task_move.status,
+            before_id=task_move.before_id,
+            after_id=task_move.after_id,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    if db_task is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+    return db_task
+
+@async_router.put("/tasks/{task_id}", response_model=schemas.Task)
+async def update_task_async(task_id: int, task_update: schemas.TaskUpdate, db=Depends(get_async_db)):
+    db_task = await crud_async.update_task(db, task_id, task_update)
+    if db_task is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+    return db_task
+
+@async_router.delete("/tasks/archived")
+async def delete_archived_tasks_async(
+    older_than: Optional[datetime] = None,
+    tag: Optional[str] = None,
+    db=Depends(get_async_db),
+):
+    deleted_count = await crud_async.delete_archived_tasks(db, older_than=older_than, tag=tag)
+    return {"deleted_count": deleted_count}
+
+@async_router.delete("/tasks/{task_id}", response_model=schemas.Task)
+async def delete_task_async(task_id: int, db=Depends(get_async_db)):
+    db_task = await crud_async.delete_task(db, task_id)
+    if db_task is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+    return db_task
+
+@async_router.put("/tasks/{task_id}/restore", response_model=schemas.Task)
+async def restore_task_async(task_id: int, db=Depends(get_async_db)):
+    db_task = await crud_async.restore_task(db, task_id)
+    if db_task is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+    return db_task
+
+def use_async_routes(application: FastAPI) -> None:
+    """
+    Replaces every sync API route that has an async counterpart with the async one.
+    """
+    sync_routes = {
+        (route.path, method): route
+        for route in application.router.routes
+        if isinstance(route, APIRoute)
+        for method in route.methods
+    }
+    replaced = set()
+    for route in async_router.routes:
+        for method in route.methods:
+            replaced.add((route.path, method))
+            twin = sync_routes.get((route.path, method))
+            if twin is not None and not route.description:
+                # Keep the OpenAPI descriptions written on the sync routes.
+                route.description = twin.description
+    application.router.routes = [
+        route
+        for route in application.router.routes
+        if not (
+            isinstance(route, APIRoute)
+            and any((route.path, method) in replaced for method in route.methods)
+        )
+    ]
+    application.include_router(async_router)
+
+def read_metrics() -> Response:
+    """
+    Serves request, SQL and read cache metrics in the Prometheus text format.
+    """
+    cache_stats = read_cache.stats()
+    body = metrics.registry.render({
+        "pohelper_read_cache_hits": ("Board reads served from the read cache.", cache_stats["hits"]),
+        "pohelper_read_cache_misses": ("Board reads that had to query SQLite.", cache_stats["misses"]),
+        "pohelper_read_cache_entries": ("Entries held by the read cache.", cache_stats["entries"]),
+    })
+    return Response(content=body, media_type="text/plain; version=0.0.4; charset=utf-8")
+
+def use_metrics(application: FastAPI) -> None:
+    """
+    Installs request timing, SQL hooks and GET /metrics (see metrics.py).
+    """
+    metrics.install_query_hooks()
+    application.add_middleware(metrics.TimingMiddleware)
+    application.add_api_route("/metrics", read_metrics, methods=["GET"], include_in_schema=False)
+
+if async_db_enabled():
+    use_async_routes(app)
+
+if metrics.metrics_enabled():
+    use_metrics(app)
@@ -0,0 +1,211 @@
+"""
+Request timing and SQL instrumentation.
+
+With POHELPER_METRICS=1, main installs TimingMiddleware, hooks SQLAlchemy's cursor
+events and serves GET /metrics. Each response then carries a Server-Timing header that
+splits its time into SQL (`db`), response encoding (`encode`) and the rest (`app`), and
+per-route latency histograms plus query counters are kept for Prometheus. When the
+variable is unset none of this is installed; the only remaining cost is a context
+variable lookup in phase().
+"""
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_START_KEY = "metrics_query_start"
+# Label for requests that matched no route, so unknown paths cannot grow the label set.
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+def metrics_enabled() -> bool:
+    """Return whether request metrics should be collected."""
+    return os.getenv("POHELPER_METRICS", "").strip().lower() in {"1", "true", "yes", "on"}
+
+
+class RequestTimings:
+    """Time spent by one request, filled in by the cursor hooks and phase()."""
+
+    __slots__ = ("started", "db_queries", "db_seconds", "phases")
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.db_queries = 0
+        self.db_seconds = 0.0
+        self.phases: Dict[str, float] = {}
+
+    def server_timing(self, total: float) -> str:
+        entries = [f'db;dur={self.db_seconds * 1000:.2f};desc="{self.db_queries} queries"']
+        accounted = self.db_seconds
+        for name, seconds in self.phases.items():
+            entries.append(f"{name};dur={seconds * 1000:.2f}")
+            accounted += seconds
+        entries.append(f"app;dur={max(total - accounted, 0) * 1000:.2f}")
+        entries.append(f"total;dur={total * 1000:.2f}")
+        return ", ".join(entries)
+
+
+_current: ContextVar[Optional[RequestTimings]] = ContextVar("request_timings", default=None)
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    """Adds the time spent in the block to the current request's `name` phase."""
+    timings = _current.get()
+    if timings is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.phases[name] = timings.phases.get(name, 0.0) + time.perf_counter() - started
+
+
+class MetricsRegistry:
+    """Per-route request latency histograms and SQL counters."""
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        # (method, route, status class) -> [bucket counts..., sum, count]
+        self._requests: Dict[Tuple[str, str, str], list] = {}
+        # (method, route) -> [queries, seconds]
+        self._queries: Dict[Tuple[str, str], list] = {}
+
+    def observe(self, method: str, route: str, status: int, duration: float, timings: RequestTimings) -> None:
+        key = (method, route, f"{status // 100}xx")
+        with self._lock:
+            series = self._requests.get(key)
+            if series is None:
+                series = self._requests[key] = [0] * len(self.buckets) + [0.0, 0]
+            for index, bound in enumerate(self.buckets):
+                if duration <= bound:
+                    series[index] += 1
+            series[-2] += duration
+            series[-1] += 1
+            queries = self._queries.setdefault((method, route), [0, 0.0])
+            queries[0] += timings.db_queries
+            queries[1] += timings.db_seconds
+
+    def reset(self) -> None:
+        with self._lock:
+            self._requests.clear()
+            self._queries.clear()
+
+    def render(self, gauges: Optional[Dict[str, Tuple[str, float]]] = None) -> str:
+        """
+        Renders the metrics in the Prometheus text exposition format; `gauges` adds
+        unlabelled series as name -> (help, value).
+        """
+        lines = [
+            "# HELP pohelper_request_duration_seconds Time to serve a request, by route.",
+            "# TYPE pohelper_request_duration_seconds histogram",
+        ]
+        with self._lock:
+            requests = {key: list(series) for key, series in self._requests.items()}
+            queries = {key: list(series) for key, series in self._queries.items()}
+        for (method, route, status), series in sorted(requests.items()):
+            labels = f'method="{method}",route="{_escape(route)}",status="{status}"'
+            for bound, count in zip(self.buckets, series):
+                lines.append(f'pohelper_request_duration_seconds_bucket{{{labels},le="{bound}"}} {count}')
+            lines.append(f'pohelper_request_duration_seconds_bucket{{{labels},le="+Inf"}} {series[-1]}')
+            lines.append(f"pohelper_request_duration_seconds_sum{{{labels}}} {series[-2]:.6f}")
+            lines.append(f"pohelper_request_duration_seconds_count{{{labels}}} {series[-1]}")
+        lines += [
+            "# HELP pohelper_db_queries_total SQL statements executed while serving requests, by route.",
+            "# TYPE pohelper_db_queries_total counter",
+        ]
+        for (method, route), (count, _) in sorted(queries.items()):
+            lines.append(f'pohelper_db_queries_total{{method="{method}",route="{_escape(route)}"}} {count}')
+        lines += [
+            "# HELP pohelper_db_query_seconds_total Time spent executing SQL while serving requests, by route.",
+            "# TYPE pohelper_db_query_seconds_total counter",
+        ]
+        for (method, route), (_, seconds) in sorted(queries.items()):
+            lines.append(f'pohelper_db_query_seconds_total{{method="{method}",route="{_escape(route)}"}} {seconds:.6f}')
+        for name, (help_text, value) in (gauges or {}).items():
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} gauge", f"{name} {value}"]
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"')
+
+
+registry = MetricsRegistry()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        conn.info.setdefault(QUERY_START_KEY, []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    timings = _current.get()
+    starts = conn.info.get(QUERY_START_KEY)
+    if timings is None or not starts:
+        return
+    timings.db_queries += 1
+    timings.db_seconds += time.perf_counter() - starts.pop()
+
+
+_hooks_lock = threading.Lock()
+_hooks_installed = False
+
+
+def install_query_hooks() -> None:
+    """
+    Times SQL on every engine, including the async engine's sync core. Safe to call
+    more than once.
+    """
+    global _hooks_installed
+    with _hooks_lock:
+        if not _hooks_installed:
+            event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+            event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+            _hooks_installed = True
+
+
+class TimingMiddleware:
+    """
+    ASGI middleware that times each HTTP request, adds a Server-Timing header and
+    records the request in the registry once the response is complete.
+    """
+
+    def __init__(self, app, registry: MetricsRegistry = registry):
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        timings = RequestTimings()
+        token = _current.set(timings)
+        status = [500]
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+                total = time.perf_counter() - timings.started
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", timings.server_timing(total).encode("latin-1")))
+                message = dict(message, headers=headers)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            route = scope.get("route")
+            route_path = getattr(route, "path", None) or UNMATCHED_ROUTE
+            self.registry.observe(
+                scope["method"], route_path, status[0], time.perf_counter() - timings.started, timings
+            )
@@ -0,0 +1,202 @@
+"""
+Numbered schema migrations, tracked in PRAGMA user_version.
+
+migrate() applies every step numbered above the database's user_version in order and
+records each step's number once it has finished, so a current database costs a single
+PRAGMA read and every backfill runs exactly once. Backfills walk the tasks table in id
+ranges of BACKFILL_BATCH_SIZE rows, one transaction per range, so no step holds the
+write lock for long. Steps are idempotent, so one interrupted halfway simply runs again.
+
+Databases from before the numbered migrations have user_version 0 and run every step
+once. To ship a schema change, append a Migration with the next number; a new column
+also goes on the model, where create_tables adds it for new databases.
+"""
+from dataclasses import dataclass
+from typing import Callable, List
+
+from sqlalchemy import insert, select, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.schema import CreateIndex
+
+import crud, models
+
+BACKFILL_BATCH_SIZE = 5000
+
+# Columns added to tasks after its first release, with the backfill for existing rows.
+TASK_COLUMNS = (
+    ("created_at", "DATETIME", None),
+    ("order_index", "REAL", None),
+    ("done_at", "DATETIME", ("done_at = created_at", "status = 'Done' AND created_at IS NOT NULL")),
+    ("deleted_at", "DATETIME", None),
+    ("urgent", "BOOLEAN", ("urgent = 0", "urgent IS NULL")),
+    ("archived_at", "DATETIME", ("archived_at = deleted_at", "deleted_at IS NOT NULL")),
+    ("change_seq", "INTEGER NOT NULL DEFAULT 0", None),
+)
+LEGACY_STATUSES = {"To Do": "ToDo", "In Progress": "Ongoing"}
+
+TASK_SEARCH_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5("
+    "title, description, tags, content='tasks', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER IF NOT EXISTS tasks_fts_ai AFTER INSERT ON tasks BEGIN "
+    "INSERT INTO tasks_fts(rowid, title, description, tags) "
+    "VALUES (new.id, new.title, new.description, new.tags); END",
+    "CREATE TRIGGER IF NOT EXISTS tasks_fts_ad AFTER DELETE ON tasks BEGIN "
+    "INSERT INTO tasks_fts(tasks_fts, rowid, title, description, tags) "
+    "VALUES ('delete', old.id, old.title, old.description, old.tags); END",
+    "CREATE TRIGGER IF NOT EXISTS tasks_fts_au AFTER UPDATE OF title, description, tags ON tasks BEGIN "
+    "INSERT INTO tasks_fts(tasks_fts, rowid, title, description, tags) "
+    "VALUES ('delete', old.id, old.title, old.description, old.tags); "
+    "INSERT INTO tasks_fts(rowid, title, description, tags) "
+    "VALUES (new.id, new.title, new.description, new.tags); END",
+)
+
+
+def get_schema_version(engine: Engine) -> int:
+    """
+    Returns the schema version recorded in PRAGMA user_version (0 for a new database).
+    """
+    with engine.connect() as conn:
+        return conn.execute(text("PRAGMA user_version")).scalar() or 0
+
+
+def backfill_tasks(engine: Engine, assignments: str, condition: str, batch_size: int = BACKFILL_BATCH_SIZE) -> int:
+    """
+    Runs `UPDATE tasks SET <assignments> WHERE <condition>` one id range at a time,
+    committing after each range. Returns the number of updated rows.
+    """
+    with engine.connect() as conn:
+        low, high = conn.execute(text("SELECT min(id), max(id) FROM tasks")).one()
+    if low is None:
+        return 0
+    statement = text(
+        f"UPDATE tasks SET {assignments} WHERE id >= :start AND id < :end AND ({condition})"
+    )
+    updated = 0
+    for start in range(low, high + 1, batch_size):
+        with engine.begin() as conn:
+            updated += conn.execute(statement, {"start": start, "end": start + batch_size}).rowcount
+    return updated
+
+
+def create_tables(engine: Engine, batch_size: int) -> None:
+    """Creates missing tables, with their current columns and indexes."""
+    models.Base.metadata.create_all(bind=engine)
+
+
+def add_task_columns(engine: Engine, batch_size: int) -> None:
+    """Adds task columns missing from databases created by older releases and fills them in."""
+    with engine.connect() as conn:
+        columns = {row[1] for row in conn.execute(text("PRAGMA table_info(tasks)"))}
+    for name, column_type, backfill in TASK_COLUMNS:
+        if name in columns:
+            continue
+        with engine.begin() as conn:
+            conn.execute(text(f"ALTER TABLE tasks ADD COLUMN {name} {column_type}"))
+        if backfill is not None:
+            backfill_tasks(engine, *backfill, batch_size=batch_size)
+
+
+def rename_legacy_statuses(engine: Engine, batch_size: int) -> None:
+    """Rewrites the statuses of early releases ('To Do', 'In Progress') to the current names."""
+    cases = " ".join(f"WHEN '{old}' THEN '{new}'" for old, new in LEGACY_STATUSES.items())
+    names = ", ".join(f"'{old}'" for old in LEGACY_STATUSES)
+    backfill_tasks(engine, f"status = CASE status {cases} END", f"status IN ({names})", batch_size)
+
+
+def link_task_tags(engine: Engine, batch_size: int) -> None:
+    """
+    Links the existing comma-separated task tags through the task_tags table.
+    """
+    with engine.connect() as conn:
+        tag_ids = {
+            name.lower(): tag_id
+            for tag_id, name in conn.execute(select(models.Tag.id, models.Tag.name))
+        }
+    last_id = 0
+    while True:
+        with engine.begin() as conn:
+            rows = conn.execute(
+                select(models.Task.id, models.Task.tags)
+                .where(models.Task.id > last_id, models.Task.tags.isnot(None))
+                .order_by(models.Task.id)
+                .limit(batch_size)
+            ).fetchall()
+            links = set()
+            for task_id, tags_value in rows:
+                for tag in crud._parse_tags(tags_value):
+                    tag_lower = tag.lower()
+                    if tag_lower not in tag_ids:
+                        result = conn.execute(insert(models.Tag).values(name=tag))
+                        tag_ids[tag_lower] = result.inserted_primary_key[0]
+                    links.add((task_id, tag_ids[tag_lower]))
+            if links:
+                conn.execute(
+                    insert(models.task_tags).prefix_with("OR IGNORE"),
+                    [{"task_id": task_id, "tag_id": tag_id} for task_id, tag_id in links],
+                )
+        if len(rows) < batch_size:
+            return
+        last_id = rows[-1][0]
+
+
+def create_task_indexes(engine: Engine, batch_size: int) -> None:
+    """Creates any model index the database lacks, once the columns they cover exist."""
+    with engine.begin() as conn:
+        for table in models.Base.metadata.sorted_tables:
+            for index in table.indexes:
+                conn.execute(CreateIndex(index, if_not_exists=True))
+
+
+def create_task_search_index(engine: Engine, batch_size: int) -> None:
+    """
+    Creates the FTS5 index over task text and the triggers that keep it in sync,
+    indexing the existing tasks when the index is new.
+    """
+    with engine.begin() as conn:
+        exists = conn.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'tasks_fts'")
+        ).first()
+        for statement in TASK_SEARCH_DDL:
+            conn.execute(text(statement))
+        if not exists:
+            conn.execute(text("INSERT INTO tasks_fts(tasks_fts) VALUES ('rebuild')"))
+
+
+@dataclass(frozen=True)
+class Migration:
+    """One schema step; `apply(engine, batch_size)` must be safe to run again."""
+
+    version: int
+    apply: Callable[[Engine, int], None]
+
+    @property
+    def name(self) -> str:
+        return self.apply.__name__
+
+
+MIGRATIONS = (
+    Migration(1, create_tables),
+    Migration(2, add_task_columns),
+    Migration(3, rename_legacy_statuses),
+    Migration(4, link_task_tags),
+    Migration(5, create_task_indexes),
+    Migration(6, create_task_search_index),
+)
+SCHEMA_VERSION = MIGRATIONS[-1].version
+
+
+def migrate(engine: Engine, batch_size: int = BACKFILL_BATCH_SIZE) -> List[str]:
+    """
+    Applies the migrations the database has not recorded yet and returns their names.
+    """
+    version = get_schema_version(engine)
+    applied = []
+    for migration in MIGRATIONS:
+        if migration.version <= version:
+            continue
+        migration.apply(engine, batch_size)
+        with engine.begin() as conn:
+            conn.execute(text(f"PRAGMA user_version = {migration.version}"))
+        applied.append(migration.name)
+    return applied
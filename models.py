@@ -1,8 +1,18 @@
 from typing import Optional
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Date, DateTime, Boolean
+from sqlalchemy import Column, Integer, Float, String, Date, DateTime, Boolean, ForeignKey, Index, Table, func, text
+from sqlalchemy.orm import relationship
 from database import Base
 
+# Association between tasks and their normalized tags; Task.tags keeps the comma-separated form.
+task_tags = Table(
+    "task_tags",
+    Base.metadata,
+    Column("task_id", Integer, ForeignKey("tasks.id", ondelete="CASCADE"), primary_key=True),
+    Column("tag_id", Integer, ForeignKey("tags.id", ondelete="CASCADE"), primary_key=True),
+    Index("ix_task_tags_tag_id", "tag_id", "task_id"),
+)
+
 class Task(Base):
     """
     SQLAlchemy model for a Task.
@@ -15,10 +25,13 @@ class Task(Base):
         due_date (Optional[Date]): The date by which the task is due. Can be null.
         status (str): The current status of the task, defaults to "To Do".
         created_at (datetime): When the task was created.
-        order_index (Optional[int]): Manual ordering position within the column.
+        order_index (Optional[float]): Manual ordering key within the column; moves take the midpoint of their neighbours.
         done_at (Optional[datetime]): When the task was marked done.
         deleted_at (Optional[datetime]): When the task was deleted (soft delete).
         urgent (bool): Whether the task is marked urgent.
+        archived_at (Optional[datetime]): When the task left the board (set on delete or by the archive sweeper).
+        change_seq (int): Change sequence of the last commit that touched the task (see crud._commit).
+        linked_tags (List[Tag]): Normalized tags linked through the task_tags table.
     """
     __tablename__ = "tasks"
 
@@ -29,10 +42,66 @@ class Task(Base):
     due_date: Optional[Date] = Column(Date)
     status: str = Column(String, default="To Do")
     created_at: datetime = Column(DateTime, default=datetime.utcnow)
-    order_index: Optional[int] = Column(Integer)
+    order_index: Optional[float] = Column(Float)
     done_at: Optional[datetime] = Column(DateTime)
     deleted_at: Optional[datetime] = Column(DateTime)
     urgent: bool = Column(Boolean, default=False)
+    archived_at: Optional[datetime] = Column(DateTime)
+    change_seq: int = Column(Integer, default=0, nullable=False, server_default="0")
+    linked_tags = relationship("Tag", secondary=task_tags)
+
+    __table_args__ = (
+        Index("ix_tasks_status_order", "status", "order_index"),
+        Index(
+            "ix_tasks_live",
+            "status",
+            "done_at",
+            sqlite_where=text("archived_at IS NULL"),
+        ),
+        # Board due_from/due_to filters and date tokens of the q search, archived tasks included.
+        Index("ix_tasks_due_date", "due_date"),
+        Index("ix_tasks_change_seq", "change_seq", "id"),
+        # Covers crud.get_task_stats, which groups by status.
+        Index("ix_tasks_stats", "status", "archived_at", "urgent", "due_date"),
+        # Range scans of one or more weeks for crud.get_weekly_flow and get_weekly_lead_times.
+        Index("ix_tasks_created_at", "created_at"),
+        Index("ix_tasks_done_at", "done_at", "created_at", sqlite_where=text("done_at IS NOT NULL")),
+        Index("ix_tasks_dropped", "deleted_at", sqlite_where=text("done_at IS NULL")),
+    )
+
+# Expression index backing the archive ordering on coalesce(deleted_at, done_at).
+Index(
+    "ix_tasks_archived_order",
+    func.coalesce(Task.deleted_at, Task.done_at),
+    sqlite_where=text("archived_at IS NOT NULL"),
+)
+
+class TaskTombstone(Base):
+    """
+    SQLAlchemy model recording a permanently deleted task for delta sync.
+
+    Attributes:
+        task_id (int): Id of the deleted task.
+        change_seq (int): Change sequence of the commit that deleted it.
+        deleted_at (datetime): When the task was removed.
+    """
+    __tablename__ = "task_tombstones"
+
+    task_id: int = Column(Integer, primary_key=True)
+    change_seq: int = Column(Integer, nullable=False)
+    deleted_at: datetime = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_task_tombstones_change_seq", "change_seq", "task_id"),
+    )
+
+# Single-row counter handing out change sequence numbers, one per committed write.
+change_counter = Table(
+    "change_counter",
+    Base.metadata,
+    Column("id", Integer, primary_key=True),
+    Column("value", Integer, nullable=False),
+)
 
 class Tag(Base):
     """
@@ -42,3 +111,7 @@ class Tag(Base):
 
     id: int = Column(Integer, primary_key=True, index=True)
     name: str = Column(String, unique=True, index=True)
+
+    __table_args__ = (
+        Index("ix_tags_name_lower", func.lower(name)),
+    )
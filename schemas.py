@@ -1,6 +1,6 @@
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field, model_validator
 from datetime import date, datetime
-from typing import Optional, List
+from typing import Dict, Optional, List
 from enum import Enum
 
 from enum import Enum
@@ -13,6 +13,18 @@ class TaskStatus(str, Enum):
     in_progress = "Ongoing"
     done = "Done"
 
+class TaskSort(str, Enum):
+    """
+    Represents the supported sort keys for task lists.
+    """
+    manual = "manual"
+    due_asc = "due-asc"
+    due_desc = "due-desc"
+    entry_asc = "entry-asc"
+    entry_desc = "entry-desc"
+    tag_asc = "tag-asc"
+    tag_desc = "tag-desc"
+
 class TaskBase(BaseModel):
     """
     Base Pydantic model for a task, defining common fields.
@@ -23,7 +35,7 @@ class TaskBase(BaseModel):
     due_date: Optional[date] = None
     status: TaskStatus
     created_at: Optional[datetime] = None
-    order_index: Optional[int] = None
+    order_index: Optional[float] = None
     done_at: Optional[datetime] = None
     urgent: bool = False
 
@@ -51,11 +63,188 @@ class TaskReorder(BaseModel):
     status: TaskStatus
     ordered_ids: List[int]
 
+class TaskMove(BaseModel):
+    """
+    Pydantic model for moving one task next to its new neighbours.
+
+    `after_id` is the card that ends up directly above the task and `before_id` the one
+    directly below; leave both out to append (or keep the position within the column).
+    """
+    status: Optional[TaskStatus] = None
+    before_id: Optional[int] = None
+    after_id: Optional[int] = None
+
+class TaskFilters(BaseModel):
+    """
+    Pydantic model for the optional filters applied to board queries.
+    """
+    status: Optional[List[TaskStatus]] = None
+    tag: Optional[str] = None
+    urgent: Optional[bool] = None
+    due_from: Optional[date] = None
+    due_to: Optional[date] = None
+    q: Optional[str] = None
+
 class Task(TaskBase):
     """
-    Pydantic model for a full Task object, including its ID and deletion timestamp.
+    Pydantic model for a full Task object, including its ID, deletion and archive timestamps.
     """
     id: int
     deleted_at: Optional[datetime] = None
+    archived_at: Optional[datetime] = None
 
     model_config = ConfigDict(from_attributes=True)
+
+class TaskImport(TaskBase):
+    """
+    Pydantic model for one task read by the import endpoint.
+
+    Exported `id` and `order_index` values are ignored: imported tasks get new ids and are
+    appended to their columns in file order. `archived_at` needs `deleted_at` or a Done
+    status, since the archive is ordered by when a task was deleted or done.
+    """
+    deleted_at: Optional[datetime] = None
+    archived_at: Optional[datetime] = None
+
+    @model_validator(mode="after")
+    def check_archived(self):
+        if self.archived_at is not None and self.deleted_at is None and self.status is not TaskStatus.done:
+            raise ValueError("archived_at requires deleted_at or status 'Done'")
+        return self
+
+class TransferFormat(str, Enum):
+    """
+    Represents the file formats of task export and import.
+    """
+    ndjson = "ndjson"
+    csv = "csv"
+
+class TaskChange(BaseModel):
+    """
+    Pydantic model for one entry of the delta sync feed.
+
+    `task` is the current row for `updated` entries and None for `deleted` ones.
+    """
+    type: str
+    task_id: int
+    task: Optional[Task] = None
+
+class TaskStats(BaseModel):
+    """
+    Pydantic model for the board counts returned by GET /tasks/stats.
+
+    `total`, `by_status`, `urgent`, `overdue` and `tags` count board tasks; `archived`
+    counts archived and deleted tasks. All of them respect the board filters.
+    """
+    total: int
+    by_status: Dict[str, int]
+    urgent: int
+    overdue: int
+    archived: int
+    tags: Dict[str, int]
+
+class LeadTime(BaseModel):
+    """
+    Nearest-rank lead time percentiles, in hours from creation to Done, of `count` tasks.
+    """
+    count: int
+    p50: Optional[float] = None
+    p85: Optional[float] = None
+    p95: Optional[float] = None
+
+class CumulativeFlow(BaseModel):
+    """
+    Pydantic model for the running totals at the end of a week; `open` is still on the board.
+    """
+    created: int
+    done: int
+    dropped: int
+    open: int
+
+class WeekAnalytics(BaseModel):
+    """
+    Pydantic model for one week (starting `week`, a Monday) of GET /tasks/analytics.
+
+    `done` is the week's throughput; `dropped` counts tasks deleted without being done.
+    """
+    week: date
+    created: int
+    done: int
+    dropped: int
+    cumulative: CumulativeFlow
+    lead_time: LeadTime
+    lead_time_by_tag: Dict[str, LeadTime]
+
+class TaskAnalytics(BaseModel):
+    """
+    Pydantic model for the weekly flow report, oldest week first.
+    """
+    weeks: List[WeekAnalytics]
+
+class TaskChanges(BaseModel):
+    """
+    Pydantic model for a page of the delta sync feed.
+    """
+    changes: List[TaskChange]
+    token: str
+    has_more: bool = False
+
+class TaskBatchAction(str, Enum):
+    """
+    Represents the operations accepted by the batch endpoint.
+    """
+    create = "create"
+    update = "update"
+    delete = "delete"
+    restore = "restore"
+    reorder = "reorder"
+
+class TaskBatchOperation(BaseModel):
+    """
+    Pydantic model for one operation in a batch.
+
+    `create` uses `task`, `update` uses `task_id` and `changes`, `delete` and `restore` use
+    `task_id`, and `reorder` uses `reorder`.
+    """
+    op: TaskBatchAction
+    task_id: Optional[int] = None
+    task: Optional[TaskCreate] = None
+    changes: Optional[TaskUpdate] = None
+    reorder: Optional[TaskReorder] = None
+
+    @model_validator(mode="after")
+    def check_payload(self):
+        required = {
+            TaskBatchAction.create: ("task",),
+            TaskBatchAction.update: ("task_id", "changes"),
+            TaskBatchAction.delete: ("task_id",),
+            TaskBatchAction.restore: ("task_id",),
+            TaskBatchAction.reorder: ("reorder",),
+        }[self.op]
+        missing = [field for field in required if getattr(self, field) is None]
+        if missing:
+            raise ValueError(f"'{self.op.value}' requires: {', '.join(missing)}")
+        return self
+
+class TaskBatch(BaseModel):
+    """
+    Pydantic model for a list of operations applied in one transaction.
+    """
+    operations: List[TaskBatchOperation] = Field(min_length=1, max_length=1000)
+
+class TaskBatchResult(BaseModel):
+    """
+    Pydantic model for the outcome of one batch operation.
+    """
+    index: int
+    op: TaskBatchAction
+    ok: bool
+    task: Optional[Task] = None
+    tasks: Optional[List[Task]] = None
+    error: Optional[str] = None
+
+class TaskBatchResponse(BaseModel):
+    """
+    Pydantic model for the per-operation results of a batch.
+    """
+    results: List[TaskBatchResult]
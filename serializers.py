@@ -0,0 +1,61 @@
+"""
+Fast JSON encoding for task lists.
+
+Board and archive reads select the schemas.Task columns as plain rows (see
+crud.TASK_ROW_COLUMNS) and encode them here with orjson in one pass, instead of
+validating an ORM object per task into the response model. The output is byte for byte
+what pydantic produces for List[schemas.Task].
+"""
+from typing import Any, List, Sequence
+
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+import schemas
+
+TASK_FIELDS = tuple(schemas.Task.model_fields)
+_ORDER_INDEX = TASK_FIELDS.index("order_index")
+# orjson writes 1e16 where pydantic writes 1e+16; beyond this the schema path is used.
+_MAX_PLAIN_FLOAT = 1e16
+
+_task_list_adapter = TypeAdapter(List[schemas.Task])
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response encoded with orjson; bytes content is sent as already-encoded JSON.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return orjson.dumps(content)
+
+
+def dump_task_rows(rows: Sequence[Sequence]) -> bytes:
+    """
+    Encodes rows of TASK_FIELDS values as the JSON of List[schemas.Task].
+    """
+    tasks = []
+    for row in rows:
+        task = dict(zip(TASK_FIELDS, row))
+        order_index = row[_ORDER_INDEX]
+        if order_index is not None:
+            # The column may hold INTEGER values written before it became REAL.
+            order_index = float(order_index)
+            if abs(order_index) >= _MAX_PLAIN_FLOAT:
+                return _dump_with_schema(rows)
+            task["order_index"] = order_index
+        tasks.append(task)
+    return orjson.dumps(tasks)
+
+
+def _dump_with_schema(rows: Sequence[Sequence]) -> bytes:
+    tasks = [dict(zip(TASK_FIELDS, row)) for row in rows]
+    return _task_list_adapter.dump_json(_task_list_adapter.validate_python(tasks))
+
+
+def dump_json(content: Any) -> bytes:
+    """Encodes plain JSON-compatible content, such as the tag list."""
+    return orjson.dumps(content)
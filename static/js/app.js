@@ -51,6 +51,14 @@ const compareNullableStrings = (aValue, bValue, direction) => {
         : bValue.localeCompare(aValue);
 };
 
+const debounce = (callback, delay) => {
+    let timer = null;
+    return (...args) => {
+        clearTimeout(timer);
+        timer = setTimeout(() => callback(...args), delay);
+    };
+};
+
 const compareManualOrder = (a, b) => {
     const aOrder = a.order_index ?? Number.MAX_SAFE_INTEGER;
     const bOrder = b.order_index ?? Number.MAX_SAFE_INTEGER;
@@ -66,6 +74,95 @@ const compareManualOrder = (a, b) => {
     return (a.id || 0) - (b.id || 0);
 };
 
+/**
+ * Tells whether a task belongs in the archive rather than on the board: deleted, or
+ * archived by the Done sweeper (which sets archived_at but not deleted_at).
+ * @param {Object} task - Task object as returned by the API.
+ * @returns {boolean}
+ */
+const isOffBoard = (task) => Boolean(task.deleted_at || task.archived_at);
+
+/**
+ * Puts a card at the top of a container, replacing any card with the same task id.
+ * @param {HTMLElement} container - Archive list or column element.
+ * @param {HTMLElement} card - Card carrying a data-task-id attribute.
+ */
+const prependCard = (container, card) => {
+    const taskId = card.getAttribute('data-task-id');
+    const existingCard = container.querySelector(`.task-card[data-task-id="${taskId}"]`);
+    if (existingCard) {
+        existingCard.remove();
+    }
+    container.prepend(card);
+};
+
+/**
+ * Maps task id to card element for the task cards inside a container.
+ * @param {HTMLElement} container - Column or board element.
+ * @returns {Map<string, HTMLElement>} Cards keyed by their data-task-id.
+ */
+const collectCards = (container) => {
+    const cards = new Map();
+    container.querySelectorAll('.task-card[data-task-id]').forEach(card => {
+        cards.set(card.getAttribute('data-task-id'), card);
+    });
+    return cards;
+};
+
+/**
+ * Brings a column's cards in line with an ordered task list, keyed by data-task-id.
+ * Cards whose render key is unchanged are reused and only moved when out of place;
+ * changed cards are rebuilt where they stand. Matched cards are taken out of `pool`
+ * so the caller can hide or remove whatever is left over.
+ * @param {HTMLElement} column - Column container.
+ * @param {Array<Object>} tasks - Tasks in display order.
+ * @param {Object} options - `createCard(task)`, `cardKey(task)` and an optional `pool`
+ *     of existing cards shared across columns.
+ * @returns {{created: number, moved: number}} Number of cards built and moved.
+ */
+const reconcileColumn = (column, tasks, { createCard, cardKey, pool = collectCards(column) }) => {
+    let created = 0;
+    let moved = 0;
+    const wanted = new Set(tasks.map(task => String(task.id)));
+    // Cards that are not part of this render (e.g. hidden by a filter) keep their place.
+    const skipUnwanted = (node) => {
+        let current = node;
+        while (current && !wanted.has(current.getAttribute('data-task-id'))) {
+            current = current.nextElementSibling;
+        }
+        return current;
+    };
+    let cursor = skipUnwanted(column.firstElementChild);
+    tasks.forEach(task => {
+        const id = String(task.id);
+        const key = cardKey(task);
+        let card = pool.get(id);
+        pool.delete(id);
+        if (!card || card.dataset.renderKey !== key) {
+            const fresh = createCard(task);
+            fresh.dataset.renderKey = key;
+            created += 1;
+            if (card) {
+                card.replaceWith(fresh);
+                if (cursor === card) {
+                    cursor = fresh;
+                }
+            }
+            card = fresh;
+        }
+        card.classList.remove('d-none');
+        if (card === cursor) {
+            cursor = skipUnwanted(cursor.nextElementSibling);
+        } else {
+            if (card.isConnected) {
+                moved += 1;
+            }
+            column.insertBefore(card, cursor);
+        }
+    });
+    return { created, moved };
+};
+
 if (typeof window !== 'undefined') {
     // Expose pure helpers for unit tests.
     window.__poHelperTestHooks = {
@@ -74,7 +171,12 @@ if (typeof window !== 'undefined') {
         compareNullableNumbers,
         compareNullableStrings,
         compareManualOrder,
-        parseDateValue
+        parseDateValue,
+        debounce,
+        collectCards,
+        reconcileColumn,
+        isOffBoard,
+        prependCard
     };
 }
 
@@ -109,6 +211,7 @@ document.addEventListener('DOMContentLoaded', () => {
     const filterStatus = document.getElementById('filter_status');
     const archivedSection = document.getElementById('archived-section');
     const archivedCards = document.getElementById('archived-cards');
+    const archivedSentinel = document.getElementById('archived-sentinel');
     const toggleArchiveButton = document.getElementById('toggle-archive');
     const archivedCountBadge = document.getElementById('archived-count');
     const deleteArchivedButton = document.getElementById('delete-archived');
@@ -128,6 +231,13 @@ document.addEventListener('DOMContentLoaded', () => {
     let pendingDeleteTaskId = null;
     let currentTasks = [];
     let archivedTasks = [];
+    let archivedCount = 0;
+    const ARCHIVE_PAGE_SIZE = 50;
+    const archiveState = {
+        nextCursor: null,
+        loading: false,
+        generation: 0
+    };
     const sortState = {};
     let availableTags = [];
     const statusOrder = ["ToDo", "Ongoing", "Done"];
@@ -135,6 +245,14 @@ document.addEventListener('DOMContentLoaded', () => {
     const filterState = {
         input: ''
     };
+    const FILTER_DEBOUNCE_MS = 250;
+    let boardTotalCount = 0;
+    let taskRequestId = 0;
+    let boardSnapshot = null;
+    const CHANGE_FLUSH_DELAY_MS = 50;
+    const FALLBACK_POLL_MS = 300000;
+    const pendingChanges = [];
+    let changeToken = null;
 
     const applyZoom = () => {
         document.documentElement.style.setProperty('--po-zoom', zoomState.level.toFixed(2));
@@ -248,47 +366,28 @@ document.addEventListener('DOMContentLoaded', () => {
         }
     };
 
-    const normalizeTokens = (tokens) => tokens.map(token => token.toLowerCase());
+    const hasActiveFilters = () => Boolean(filterState.input && filterState.input.trim());
 
-    const getFilterTokens = () => {
-        const rawValue = filterState.input || '';
-        const tokens = rawValue
-            .split(',')
-            .map(token => token.trim())
-            .filter(Boolean);
-        return normalizeTokens(tokens.length ? tokens : rawValue.trim() ? [rawValue.trim()] : []);
-    };
-
-    const taskMatchesFilters = (task) => {
-        const tokens = getFilterTokens();
-        if (tokens.length === 0) {
-            return true;
+    /**
+     * Builds the query string for the board request from the current filters.
+     * @returns {string} Query string, including the leading '?', or an empty string.
+     */
+    const buildTaskQuery = () => {
+        const params = new URLSearchParams();
+        if (hasActiveFilters()) {
+            params.set('q', filterState.input.trim());
         }
-        const title = (task.title || '').toLowerCase();
-        const description = (task.description || '').toLowerCase();
-        const taskTags = normalizeTokens(parseTagsValue(task.tags || ''));
-        const dueDateMatches = getDueDateMatchStrings(task.due_date);
-        return tokens.every((token) => {
-            if (title.includes(token) || description.includes(token)) {
-                return true;
-            }
-            if (taskTags.some(tag => tag.includes(token))) {
-                return true;
-            }
-            return dueDateMatches.some(match => match.includes(token));
-        });
+        const query = params.toString();
+        return query ? `?${query}` : '';
     };
 
-    const getFilteredTasks = () => currentTasks.filter(taskMatchesFilters);
-
     const updateFilterStatus = () => {
         if (!filterStatus) {
             return;
         }
-        const filteredCount = getFilteredTasks().length;
-        const totalCount = currentTasks.length;
-        const hasFilters = Boolean(filterState.input && filterState.input.trim());
-        filterStatus.textContent = hasFilters
+        const filteredCount = currentTasks.length;
+        const totalCount = Math.max(boardTotalCount, filteredCount);
+        filterStatus.textContent = hasActiveFilters()
             ? `Showing ${filteredCount} of ${totalCount}`
             : '';
     };
@@ -297,24 +396,10 @@ document.addEventListener('DOMContentLoaded', () => {
         if (filterInput) {
             filterState.input = filterInput.value || '';
         }
-        renderTasks(getFilteredTasks());
-        updateFilterStatus();
+        fetchTasks();
     };
 
-    const getDueDateMatchStrings = (value) => {
-        if (!value) {
-            return [];
-        }
-        const rawValue = String(value).toLowerCase();
-        const parsedDate = new Date(value);
-        const localValue = Number.isNaN(parsedDate.getTime())
-            ? ''
-            : parsedDate.toLocaleDateString().toLowerCase();
-        if (localValue && localValue !== rawValue) {
-            return [rawValue, localValue];
-        }
-        return [rawValue];
-    };
+    const debouncedUpdateFilters = debounce(updateFiltersFromInputs, FILTER_DEBOUNCE_MS);
 
     const formatDateTime = (value) => {
         if (!value) {
@@ -366,9 +451,12 @@ document.addEventListener('DOMContentLoaded', () => {
         pendingDeleteTaskId = taskId ? Number(taskId) : null;
         if (deleteTaskContext) {
             const title = task?.title ? `Task: ${task.title}` : '';
-            const detail = task?.deleted_at
-                ? 'This will permanently remove it from the archive.'
-                : 'It will move to the archived list.';
+            let detail = 'It will move to the archived list.';
+            if (task?.deleted_at) {
+                detail = 'This will permanently remove it from the archive.';
+            } else if (task && isOffBoard(task)) {
+                detail = 'It will stay in the archive, marked as deleted.';
+            }
             deleteTaskContext.textContent = title ? `${title} - ${detail}` : detail;
         }
         deleteTaskModal.show();
@@ -378,6 +466,8 @@ document.addEventListener('DOMContentLoaded', () => {
         if (!taskId) {
             return;
         }
+        const previous = getTaskById(taskId);
+        const wasArchived = Boolean(previous && isOffBoard(previous)) || isArchivedLocally(taskId);
         try {
             const response = await fetch(`/tasks/${taskId}`, {
                 method: 'DELETE',
@@ -385,9 +475,20 @@ document.addEventListener('DOMContentLoaded', () => {
             if (!response.ok) {
                 throw new Error('Network response was not ok');
             }
-            fetchTasks();
+            const task = await response.json();
+            if (!wasArchived) {
+                applyTaskChange(task);
+                addArchivedTask(task);
+            } else if (previous?.deleted_at) {
+                removeArchivedTask(task.id);
+            } else {
+                // A Done task archived by the sweeper is only marked deleted: it stays
+                // in the archive, so its card is replaced rather than removed.
+                addArchivedTask(task);
+            }
         } catch (error) {
             logError('Failed to delete task:', error);
+            resyncBoard();
         }
     };
 
@@ -402,9 +503,13 @@ document.addEventListener('DOMContentLoaded', () => {
             if (!response.ok) {
                 throw new Error('Network response was not ok');
             }
-            fetchTasks();
+            const task = await response.json();
+            removeArchivedTask(task.id);
+            applyTaskChange(task);
         } catch (error) {
             logError('Failed to restore task:', error);
+            resyncBoard();
+            fetchArchivedTasks();
         }
     };
 
@@ -468,166 +573,506 @@ document.addEventListener('DOMContentLoaded', () => {
      * Fetches tasks from the API and renders them on the board.
      */
     const fetchTasks = async () => {
+        const requestId = ++taskRequestId;
+        const filtered = hasActiveFilters();
+        const query = buildTaskQuery();
         try {
-            const response = await fetch('/tasks/');
+            // The browser revalidates with If-None-Match, so an unchanged board costs a 304.
+            const response = await fetch(`/tasks/${query}`);
             if (!response.ok) {
                 throw new Error('Network response was not ok');
             }
+            const etag = response.headers ? response.headers.get('ETag') : null;
+            const snapshot = etag ? `${query} ${etag}` : null;
+            if (snapshot && snapshot === boardSnapshot) {
+                // Same board revision as the last render: the archive is unchanged too.
+                return;
+            }
             const tasks = await response.json();
+            if (requestId !== taskRequestId) {
+                // A newer request (e.g. a later keystroke) superseded this one.
+                return;
+            }
+            boardSnapshot = snapshot;
+            changeToken = (response.headers && response.headers.get('X-Change-Token')) || changeToken;
             currentTasks = tasks;
-            renderTasks(getFilteredTasks());
+            if (!filtered) {
+                boardTotalCount = tasks.length;
+            }
+            renderTasks(currentTasks);
             updateFilterStatus();
-            fetchArchivedTasks();
+            fetchBoardStats();
+            if (archivedSection && !archivedSection.classList.contains('d-none')) {
+                fetchArchivedTasks();
+            }
         } catch (error) {
             logError('There has been a problem with your fetch operation:', error);
         }
     };
 
+    /**
+     * Refetches the board even if its revision is unchanged, e.g. after a failed
+     * mutation left local cards out of step with the server.
+     */
+    const resyncBoard = () => {
+        boardSnapshot = null;
+        fetchTasks();
+    };
+
+    const fetchArchivedPage = async (cursor) => {
+        const params = new URLSearchParams({ limit: String(ARCHIVE_PAGE_SIZE) });
+        if (cursor) {
+            params.set('cursor', cursor);
+        }
+        const response = await fetch(`/tasks/archived?${params}`);
+        if (!response.ok) {
+            throw new Error('Network response was not ok');
+        }
+        const tasks = await response.json();
+        const nextCursor = response.headers ? response.headers.get('X-Next-Cursor') : null;
+        return { tasks, nextCursor: nextCursor || null };
+    };
+
+    const isArchiveVisible = () => Boolean(archivedSection && !archivedSection.classList.contains('d-none'));
+
+    /**
+     * Reloads the first page of archived tasks, discarding any pages loaded before.
+     */
     const fetchArchivedTasks = async () => {
+        const generation = ++archiveState.generation;
+        archiveState.loading = true;
         try {
-            const response = await fetch('/tasks/archived');
-            if (!response.ok) {
-                throw new Error('Network response was not ok');
+            const { tasks, nextCursor } = await fetchArchivedPage(null);
+            if (generation !== archiveState.generation) {
+                return;
             }
-            const tasks = await response.json();
             archivedTasks = tasks;
-            if (archivedCountBadge) {
-                archivedCountBadge.textContent = archivedTasks.length;
-            }
-            if (archivedSection && !archivedSection.classList.contains('d-none')) {
+            archiveState.nextCursor = nextCursor;
+            if (isArchiveVisible()) {
                 renderArchivedTasks(archivedTasks);
             }
         } catch (error) {
             logError('Failed to load archived tasks:', error);
+        } finally {
+            if (generation === archiveState.generation) {
+                archiveState.loading = false;
+                watchArchiveSentinel();
+            }
         }
     };
 
     /**
-     * Renders a list of tasks onto the respective columns on the board.
-     * @param {Array<Object>} tasks - An array of task objects to render.
+     * Appends the next archive page using the cursor returned with the previous page.
      */
-    const renderTasks = (tasks) => {
-        Object.values(taskColumns).forEach(column => {
-            if (column) {
-                column.innerHTML = '';
+    const loadMoreArchivedTasks = async () => {
+        if (!archiveState.nextCursor || archiveState.loading || !isArchiveVisible()) {
+            return;
+        }
+        const generation = archiveState.generation;
+        archiveState.loading = true;
+        try {
+            const { tasks, nextCursor } = await fetchArchivedPage(archiveState.nextCursor);
+            if (generation !== archiveState.generation) {
+                return;
             }
-        });
+            archivedTasks = archivedTasks.concat(tasks);
+            archiveState.nextCursor = nextCursor;
+            appendArchivedTasks(tasks);
+        } catch (error) {
+            logError('Failed to load more archived tasks:', error);
+        } finally {
+            if (generation === archiveState.generation) {
+                archiveState.loading = false;
+                watchArchiveSentinel();
+            }
+        }
+    };
+
+    const watchArchiveSentinel = () => {
+        if (!archiveObserver || !archivedSentinel) {
+            return;
+        }
+        // Re-observing fires the callback again if the sentinel is still in view.
+        archiveObserver.unobserve(archivedSentinel);
+        archiveObserver.observe(archivedSentinel);
+    };
+
+    /**
+     * Loads the board counts from GET /tasks/stats: the archive badge, the board total
+     * behind "Showing N of M" and, while no filter narrows the board, the column badges.
+     */
+    const fetchBoardStats = async () => {
+        try {
+            const response = await fetch('/tasks/stats');
+            if (!response.ok) {
+                throw new Error('Network response was not ok');
+            }
+            const stats = await response.json();
+            setArchivedCount(stats?.archived ?? 0);
+            boardTotalCount = stats?.total ?? boardTotalCount;
+            if (!hasActiveFilters()) {
+                setColumnCounts(stats?.by_status ?? {});
+            }
+            updateFilterStatus();
+        } catch (error) {
+            logError('Failed to load board stats:', error);
+        }
+    };
+
+    /**
+     * Builds the DOM card for a board task.
+     * @param {Object} task - Task object as returned by the API.
+     * @returns {HTMLElement} Card element keyed by data-task-id.
+     */
+    const createTaskCard = (task) => {
+        const isOverdue = isTaskOverdue(task);
+        const taskCard = document.createElement('div');
+        taskCard.className = `card task-card mb-2${task.urgent ? ' task-urgent' : ''}${isOverdue ? ' task-overdue' : ''}`;
+        taskCard.setAttribute('draggable', 'true');
+        taskCard.setAttribute('data-task-id', task.id);
+        taskCard.setAttribute('data-task-status', task.status);
+
+        const cardBody = document.createElement('div');
+        cardBody.className = 'card-body';
+
+        const headerRow = document.createElement('div');
+        headerRow.className = 'task-card-header';
+
+        const titleEl = document.createElement('h5');
+        titleEl.className = 'card-title';
+        titleEl.textContent = task.title;
+
+        const tagsWrap = document.createElement('div');
+        tagsWrap.className = 'task-tags';
+
+        const rawTags = task.tags ? task.tags.split(',') : [];
+        const tagsList = rawTags.map(tag => tag.trim()).filter(Boolean);
+
+        if (tagsList.length === 0) {
+            const emptyBadge = document.createElement('span');
+            emptyBadge.className = 'task-tag task-tag-empty';
+            emptyBadge.textContent = 'None';
+            tagsWrap.appendChild(emptyBadge);
+        } else {
+            tagsList.forEach((tag) => {
+                const tagBadge = document.createElement('span');
+                const tagClass = normalizeTagClass(tag);
+                tagBadge.className = `task-tag${tagClass ? ` ${tagClass}` : ''}`;
+                tagBadge.textContent = tag;
+                tagsWrap.appendChild(tagBadge);
+            });
+        }
+
+        headerRow.appendChild(titleEl);
+        headerRow.appendChild(tagsWrap);
+
+        const descriptionEl = document.createElement('p');
+        descriptionEl.className = 'card-text';
+        descriptionEl.textContent = task.description || '';
+
+        const footerRow = document.createElement('div');
+        footerRow.className = 'task-card-footer';
+
+        const dueDateEl = document.createElement('div');
+        dueDateEl.className = 'task-card-due';
+        const dueDateTag = document.createElement('span');
+        dueDateTag.className = 'task-tag task-due-tag';
+        dueDateTag.textContent = task.due_date ? `Due: ${task.due_date}` : 'No due date';
+        dueDateEl.appendChild(dueDateTag);
+
+        if (task.status === 'Done') {
+            const archiveCountdown = formatArchiveCountdown(task.done_at);
+            if (archiveCountdown) {
+                const archiveNote = document.createElement('div');
+                archiveNote.className = 'task-archive-note';
+                archiveNote.textContent = `Archived in ${archiveCountdown}`;
+                dueDateEl.appendChild(archiveNote);
+            }
+        }
+
+        const deleteButton = document.createElement('button');
+        deleteButton.className = 'btn btn-sm btn-danger delete-task';
+        deleteButton.setAttribute('data-task-id', task.id);
+        deleteButton.textContent = 'X';
+
+        const editButton = document.createElement('button');
+        editButton.className = 'btn btn-sm btn-outline-secondary edit-task';
+        editButton.setAttribute('data-task-id', task.id);
+        editButton.textContent = 'Edit';
+
+        const actionsWrap = document.createElement('div');
+        actionsWrap.className = 'task-card-actions';
+        actionsWrap.appendChild(editButton);
+        actionsWrap.appendChild(deleteButton);
+
+        footerRow.appendChild(dueDateEl);
+        footerRow.appendChild(actionsWrap);
+        cardBody.appendChild(headerRow);
+        cardBody.appendChild(descriptionEl);
+        cardBody.appendChild(footerRow);
+        taskCard.appendChild(cardBody);
+        return taskCard;
+    };
 
+    const groupTasksByStatus = (tasks) => {
         const tasksByStatus = {
             "ToDo": [],
             "Ongoing": [],
             "Done": []
         };
-
         tasks.forEach(task => {
             if (tasksByStatus[task.status]) {
                 tasksByStatus[task.status].push(task);
             }
         });
+        return tasksByStatus;
+    };
 
+    const setColumnCounts = (countsByStatus) => {
         Object.entries(columnCountBadges).forEach(([status, badge]) => {
             if (badge) {
-                badge.textContent = tasksByStatus[status]?.length ?? 0;
+                badge.textContent = countsByStatus[status] ?? 0;
+            }
+        });
+    };
+
+    const updateColumnCounts = (tasksByStatus) => {
+        setColumnCounts(Object.fromEntries(
+            Object.entries(tasksByStatus).map(([status, tasks]) => [status, tasks.length])
+        ));
+    };
+
+    const taskCardKey = (task) => JSON.stringify([
+        task.title,
+        task.description,
+        task.tags,
+        task.due_date,
+        task.status,
+        task.urgent,
+        isTaskOverdue(task),
+        task.status === 'Done' ? formatArchiveCountdown(task.done_at) : null,
+    ]);
+
+    const collectBoardCards = () => {
+        const pool = new Map();
+        Object.values(taskColumns).forEach(column => {
+            if (column) {
+                collectCards(column).forEach((card, id) => pool.set(id, card));
             }
         });
+        return pool;
+    };
 
+    /**
+     * Renders a list of tasks onto the respective columns on the board.
+     * Existing cards are reused by task id; cards that drop out of a filtered view are
+     * hidden rather than destroyed so clearing the filter does not rebuild them.
+     * @param {Array<Object>} tasks - An array of task objects to render.
+     */
+    const renderTasks = (tasks) => {
+        const tasksByStatus = groupTasksByStatus(tasks);
+        updateColumnCounts(tasksByStatus);
+
+        const pool = collectBoardCards();
         Object.entries(taskColumns).forEach(([status, column]) => {
             if (!column) {
                 return;
             }
             const sortedTasks = sortTasksForStatus(tasksByStatus[status] || [], status);
-            sortedTasks.forEach(task => {
-                const isOverdue = isTaskOverdue(task);
-                const taskCard = document.createElement('div');
-                taskCard.className = `card task-card mb-2${task.urgent ? ' task-urgent' : ''}${isOverdue ? ' task-overdue' : ''}`;
-                taskCard.setAttribute('draggable', 'true');
-                taskCard.setAttribute('data-task-id', task.id);
-                taskCard.setAttribute('data-task-status', task.status);
-
-                const cardBody = document.createElement('div');
-                cardBody.className = 'card-body';
-
-                const headerRow = document.createElement('div');
-                headerRow.className = 'task-card-header';
-
-                const titleEl = document.createElement('h5');
-                titleEl.className = 'card-title';
-                titleEl.textContent = task.title;
-
-                const tagsWrap = document.createElement('div');
-                tagsWrap.className = 'task-tags';
-
-                const rawTags = task.tags ? task.tags.split(',') : [];
-                const tagsList = rawTags.map(tag => tag.trim()).filter(Boolean);
-
-                if (tagsList.length === 0) {
-                    const emptyBadge = document.createElement('span');
-                    emptyBadge.className = 'task-tag task-tag-empty';
-                    emptyBadge.textContent = 'None';
-                    tagsWrap.appendChild(emptyBadge);
-                } else {
-                    tagsList.forEach((tag) => {
-                        const tagBadge = document.createElement('span');
-                        const tagClass = normalizeTagClass(tag);
-                        tagBadge.className = `task-tag${tagClass ? ` ${tagClass}` : ''}`;
-                        tagBadge.textContent = tag;
-                        tagsWrap.appendChild(tagBadge);
-                    });
-                }
+            reconcileColumn(column, sortedTasks, { createCard: createTaskCard, cardKey: taskCardKey, pool });
+        });
 
-                headerRow.appendChild(titleEl);
-                headerRow.appendChild(tagsWrap);
-
-                const descriptionEl = document.createElement('p');
-                descriptionEl.className = 'card-text';
-                descriptionEl.textContent = task.description || '';
-
-                const footerRow = document.createElement('div');
-                footerRow.className = 'task-card-footer';
-
-                const dueDateEl = document.createElement('div');
-                dueDateEl.className = 'task-card-due';
-                const dueDateTag = document.createElement('span');
-                dueDateTag.className = 'task-tag task-due-tag';
-                dueDateTag.textContent = task.due_date ? `Due: ${task.due_date}` : 'No due date';
-                dueDateEl.appendChild(dueDateTag);
-
-                if (task.status === 'Done') {
-                    const archiveCountdown = formatArchiveCountdown(task.done_at);
-                    if (archiveCountdown) {
-                        const archiveNote = document.createElement('div');
-                        archiveNote.className = 'task-archive-note';
-                        archiveNote.textContent = `Archived in ${archiveCountdown}`;
-                        dueDateEl.appendChild(archiveNote);
-                    }
-                }
+        const keepHidden = hasActiveFilters();
+        pool.forEach(card => {
+            if (keepHidden) {
+                card.classList.add('d-none');
+            } else {
+                card.remove();
+            }
+        });
+    };
 
-                const deleteButton = document.createElement('button');
-                deleteButton.className = 'btn btn-sm btn-danger delete-task';
-                deleteButton.setAttribute('data-task-id', task.id);
-                deleteButton.textContent = 'X';
-
-                const editButton = document.createElement('button');
-                editButton.className = 'btn btn-sm btn-outline-secondary edit-task';
-                editButton.setAttribute('data-task-id', task.id);
-                editButton.textContent = 'Edit';
-
-                const actionsWrap = document.createElement('div');
-                actionsWrap.className = 'task-card-actions';
-                actionsWrap.appendChild(editButton);
-                actionsWrap.appendChild(deleteButton);
-
-                footerRow.appendChild(dueDateEl);
-                footerRow.appendChild(actionsWrap);
-                cardBody.appendChild(headerRow);
-                cardBody.appendChild(descriptionEl);
-                cardBody.appendChild(footerRow);
-                taskCard.appendChild(cardBody);
-                column.appendChild(taskCard);
-            });
+    const findBoardCard = (taskId) => board.querySelector(`.task-card[data-task-id="${taskId}"]`);
+
+    const findArchivedCard = (taskId) => (archivedCards
+        ? archivedCards.querySelector(`.task-card[data-task-id="${taskId}"]`)
+        : null);
+
+    /**
+     * Moves, rebuilds or removes one board card so it matches the local state.
+     * @param {Object} task - Task object as returned by the API.
+     */
+    const placeTaskCard = (task) => {
+        const column = taskColumns[task.status];
+        const onBoard = currentTasks.some(item => item.id === task.id);
+        if (!column || !onBoard) {
+            const existingCard = findBoardCard(task.id);
+            if (existingCard) {
+                existingCard.remove();
+            }
+            return;
+        }
+        const ordered = sortTasksForStatus(currentTasks.filter(item => item.status === task.status), task.status);
+        reconcileColumn(column, ordered, {
+            createCard: createTaskCard,
+            cardKey: taskCardKey,
+            pool: collectBoardCards(),
         });
     };
 
+    /**
+     * Applies a task returned by a mutation to the local board and patches only its card.
+     * Falls back to a refetch while filters are active, since only the server can tell
+     * whether the changed task still matches them.
+     * @param {Object} task - Task object as returned by the API.
+     */
+    const applyTaskChange = (task) => {
+        if (!task) {
+            return;
+        }
+        if (hasActiveFilters()) {
+            fetchTasks();
+            return;
+        }
+        const remaining = currentTasks.filter(item => item.id !== task.id);
+        currentTasks = isOffBoard(task) ? remaining : [...remaining, task];
+        boardTotalCount = currentTasks.length;
+        placeTaskCard(task);
+        updateColumnCounts(groupTasksByStatus(currentTasks));
+        updateFilterStatus();
+    };
+
+    const setArchivedCount = (count) => {
+        archivedCount = Math.max(0, count);
+        if (archivedCountBadge) {
+            archivedCountBadge.textContent = archivedCount;
+        }
+    };
+
+    const isArchivedLocally = (taskId) => archivedTasks.some(item => item.id === Number(taskId));
+
+    const addArchivedTask = (task) => {
+        if (!isArchivedLocally(task.id)) {
+            setArchivedCount(archivedCount + 1);
+        }
+        archivedTasks = [task, ...archivedTasks.filter(item => item.id !== task.id)];
+        if (isArchiveVisible() && archivedCards) {
+            if (archivedTasks.length === 1) {
+                renderArchivedTasks(archivedTasks);
+            } else {
+                prependCard(archivedCards, createArchivedCard(task));
+            }
+        }
+    };
+
+    const removeArchivedTask = (taskId) => {
+        const numericId = Number(taskId);
+        if (isArchivedLocally(numericId)) {
+            setArchivedCount(archivedCount - 1);
+        }
+        archivedTasks = archivedTasks.filter(item => item.id !== numericId);
+        const card = findArchivedCard(numericId);
+        if (card) {
+            card.remove();
+        }
+        if (isArchiveVisible() && archivedTasks.length === 0) {
+            renderArchivedTasks(archivedTasks);
+        }
+    };
+
+    const createArchivedCard = (task) => {
+        const taskCard = document.createElement('div');
+        taskCard.className = `card task-card archived-task mb-2${task.urgent ? ' task-urgent' : ''}`;
+        taskCard.setAttribute('data-task-id', task.id);
+
+        const cardBody = document.createElement('div');
+        cardBody.className = 'card-body';
+
+        const headerRow = document.createElement('div');
+        headerRow.className = 'task-card-header';
+
+        const titleEl = document.createElement('h5');
+        titleEl.className = 'card-title';
+        titleEl.textContent = task.title;
+
+        const tagsWrap = document.createElement('div');
+        tagsWrap.className = 'task-tags';
+
+        const rawTags = task.tags ? task.tags.split(',') : [];
+        const tagsList = rawTags.map(tag => tag.trim()).filter(Boolean);
+
+        if (tagsList.length === 0) {
+            const emptyBadge = document.createElement('span');
+            emptyBadge.className = 'task-tag task-tag-empty';
+            emptyBadge.textContent = 'None';
+            tagsWrap.appendChild(emptyBadge);
+        } else {
+            tagsList.forEach((tag) => {
+                const tagBadge = document.createElement('span');
+                const tagClass = normalizeTagClass(tag);
+                tagBadge.className = `task-tag${tagClass ? ` ${tagClass}` : ''}`;
+                tagBadge.textContent = tag;
+                tagsWrap.appendChild(tagBadge);
+            });
+        }
+
+        headerRow.appendChild(titleEl);
+        headerRow.appendChild(tagsWrap);
+
+        const descriptionEl = document.createElement('p');
+        descriptionEl.className = 'card-text';
+        descriptionEl.textContent = task.description || '';
+
+        const footerRow = document.createElement('div');
+        footerRow.className = 'task-card-footer';
+
+        const dueDateEl = document.createElement('div');
+        dueDateEl.className = 'task-card-due';
+        const dueDateTag = document.createElement('span');
+        dueDateTag.className = 'task-tag task-due-tag';
+        dueDateTag.textContent = task.due_date ? `Due: ${task.due_date}` : 'No due date';
+        dueDateEl.appendChild(dueDateTag);
+
+        const archivedAt = document.createElement('div');
+        archivedAt.className = 'task-archive-note';
+        const archivedLabel = task.deleted_at ? 'Deleted' : 'Archived';
+        const archivedTimestamp = task.deleted_at || task.done_at;
+        archivedAt.textContent = `${archivedLabel}: ${formatDateTime(archivedTimestamp)}`;
+
+        const deleteButton = document.createElement('button');
+        deleteButton.className = 'btn btn-sm btn-danger delete-task';
+        deleteButton.setAttribute('data-task-id', task.id);
+        deleteButton.textContent = 'Delete';
+
+        const actionsWrap = document.createElement('div');
+        actionsWrap.className = 'task-card-actions';
+        const restoreButton = document.createElement('button');
+        restoreButton.className = 'btn btn-sm btn-outline-primary restore-task';
+        restoreButton.setAttribute('data-task-id', task.id);
+        restoreButton.textContent = 'Restore';
+        actionsWrap.appendChild(restoreButton);
+        actionsWrap.appendChild(deleteButton);
+
+        dueDateEl.appendChild(archivedAt);
+        footerRow.appendChild(dueDateEl);
+        footerRow.appendChild(actionsWrap);
+
+        cardBody.appendChild(headerRow);
+        cardBody.appendChild(descriptionEl);
+        cardBody.appendChild(footerRow);
+        taskCard.appendChild(cardBody);
+        return taskCard;
+    };
+
+    const appendArchivedTasks = (tasks) => {
+        if (!archivedCards || !tasks || tasks.length === 0) {
+            return;
+        }
+        const fragment = document.createDocumentFragment();
+        tasks.forEach(task => fragment.appendChild(createArchivedCard(task)));
+        archivedCards.appendChild(fragment);
+    };
+
     const renderArchivedTasks = (tasks) => {
         if (!archivedCards) {
             return;
@@ -640,89 +1085,7 @@ document.addEventListener('DOMContentLoaded', () => {
             archivedCards.appendChild(emptyState);
             return;
         }
-
-        tasks.forEach(task => {
-            const taskCard = document.createElement('div');
-            taskCard.className = `card task-card archived-task mb-2${task.urgent ? ' task-urgent' : ''}`;
-
-            const cardBody = document.createElement('div');
-            cardBody.className = 'card-body';
-
-            const headerRow = document.createElement('div');
-            headerRow.className = 'task-card-header';
-
-            const titleEl = document.createElement('h5');
-            titleEl.className = 'card-title';
-            titleEl.textContent = task.title;
-
-            const tagsWrap = document.createElement('div');
-            tagsWrap.className = 'task-tags';
-
-            const rawTags = task.tags ? task.tags.split(',') : [];
-            const tagsList = rawTags.map(tag => tag.trim()).filter(Boolean);
-
-            if (tagsList.length === 0) {
-                const emptyBadge = document.createElement('span');
-                emptyBadge.className = 'task-tag task-tag-empty';
-                emptyBadge.textContent = 'None';
-                tagsWrap.appendChild(emptyBadge);
-            } else {
-                tagsList.forEach((tag) => {
-                    const tagBadge = document.createElement('span');
-                    const tagClass = normalizeTagClass(tag);
-                    tagBadge.className = `task-tag${tagClass ? ` ${tagClass}` : ''}`;
-                    tagBadge.textContent = tag;
-                    tagsWrap.appendChild(tagBadge);
-                });
-            }
-
-            headerRow.appendChild(titleEl);
-            headerRow.appendChild(tagsWrap);
-
-            const descriptionEl = document.createElement('p');
-            descriptionEl.className = 'card-text';
-            descriptionEl.textContent = task.description || '';
-
-            const footerRow = document.createElement('div');
-            footerRow.className = 'task-card-footer';
-
-            const dueDateEl = document.createElement('div');
-            dueDateEl.className = 'task-card-due';
-            const dueDateTag = document.createElement('span');
-            dueDateTag.className = 'task-tag task-due-tag';
-            dueDateTag.textContent = task.due_date ? `Due: ${task.due_date}` : 'No due date';
-            dueDateEl.appendChild(dueDateTag);
-
-            const archivedAt = document.createElement('div');
-            archivedAt.className = 'task-archive-note';
-            const archivedLabel = task.deleted_at ? 'Deleted' : 'Archived';
-            const archivedTimestamp = task.deleted_at || task.done_at;
-            archivedAt.textContent = `${archivedLabel}: ${formatDateTime(archivedTimestamp)}`;
-
-            const deleteButton = document.createElement('button');
-            deleteButton.className = 'btn btn-sm btn-danger delete-task';
-            deleteButton.setAttribute('data-task-id', task.id);
-            deleteButton.textContent = 'Delete';
-
-            const actionsWrap = document.createElement('div');
-            actionsWrap.className = 'task-card-actions';
-            const restoreButton = document.createElement('button');
-            restoreButton.className = 'btn btn-sm btn-outline-primary restore-task';
-            restoreButton.setAttribute('data-task-id', task.id);
-            restoreButton.textContent = 'Restore';
-            actionsWrap.appendChild(restoreButton);
-            actionsWrap.appendChild(deleteButton);
-
-            dueDateEl.appendChild(archivedAt);
-            footerRow.appendChild(dueDateEl);
-            footerRow.appendChild(actionsWrap);
-
-            cardBody.appendChild(headerRow);
-            cardBody.appendChild(descriptionEl);
-            cardBody.appendChild(footerRow);
-            taskCard.appendChild(cardBody);
-            archivedCards.appendChild(taskCard);
-        });
+        appendArchivedTasks(tasks);
     };
 
     const createTask = async (taskData, form, modal) => {
@@ -744,16 +1107,20 @@ document.addEventListener('DOMContentLoaded', () => {
                 }
                 throw new Error(errorDetail);
             }
+            const task = await response.json();
             if (form) {
                 form.reset();
             }
             if (modal) {
                 modal.hide();
             }
-            fetchTasks();
-            fetchTags();
+            applyTaskChange(task);
+            if (task.tags) {
+                fetchTags();
+            }
         } catch (error) {
             logError('Failed to create task:', error);
+            resyncBoard();
         }
     };
 
@@ -776,16 +1143,20 @@ document.addEventListener('DOMContentLoaded', () => {
                 }
                 throw new Error(errorDetail);
             }
+            const task = await response.json();
             if (form) {
                 form.reset();
             }
             if (modal) {
                 modal.hide();
             }
-            fetchTasks();
-            fetchTags();
+            applyTaskChange(task);
+            if (task.tags) {
+                fetchTags();
+            }
         } catch (error) {
             logError('Failed to update task:', error);
+            resyncBoard();
         }
     };
 
@@ -886,12 +1257,12 @@ document.addEventListener('DOMContentLoaded', () => {
         sortState[status] = select.value;
         select.addEventListener('change', () => {
             sortState[status] = select.value;
-            renderTasks(getFilteredTasks());
+            renderTasks(currentTasks);
         });
     });
 
     if (filterInput) {
-        filterInput.addEventListener('input', updateFiltersFromInputs);
+        filterInput.addEventListener('input', debouncedUpdateFilters);
     }
 
     if (clearFiltersButton) {
@@ -910,8 +1281,8 @@ document.addEventListener('DOMContentLoaded', () => {
             toggleArchiveButton.classList.toggle('active', isHidden);
             toggleArchiveButton.setAttribute('aria-pressed', String(isHidden));
             if (isHidden) {
-                fetchArchivedTasks();
                 renderArchivedTasks(archivedTasks);
+                fetchArchivedTasks();
             }
         });
     }
@@ -1071,7 +1442,7 @@ document.addEventListener('DOMContentLoaded', () => {
     };
 
     const getDragAfterElement = (container, y) => {
-        const draggableElements = [...container.querySelectorAll('.task-card:not(.dragging)')];
+        const draggableElements = [...container.querySelectorAll('.task-card:not(.dragging):not(.d-none)')];
         return draggableElements.reduce((closest, child) => {
             const box = child.getBoundingClientRect();
             const offset = y - box.top - box.height / 2;
@@ -1082,30 +1453,43 @@ document.addEventListener('DOMContentLoaded', () => {
         }, { offset: Number.NEGATIVE_INFINITY, element: null }).element;
     };
 
-    const updateOrderForColumn = async (columnElement, status) => {
-        if (!columnElement || !status) {
-            return;
-        }
-        const orderedIds = [...columnElement.querySelectorAll('.task-card')]
-            .map(card => Number(card.getAttribute('data-task-id')))
-            .filter(Boolean);
-        if (orderedIds.length === 0) {
-            return;
-        }
-        try {
-            const response = await fetch('/tasks/reorder', {
-                method: 'PUT',
-                headers: {
-                    'Content-Type': 'application/json',
-                },
-                body: JSON.stringify({ status, ordered_ids: orderedIds }),
-            });
-            if (!response.ok) {
-                throw new Error('Network response was not ok');
+    /**
+     * Finds the visible cards directly above and below a card in its column.
+     * @param {HTMLElement} taskCard - Card already placed at its new position.
+     * @returns {{after_id: (number|null), before_id: (number|null)}} Neighbour ids for a move.
+     */
+    const getCardNeighbours = (taskCard) => {
+        const visibleSibling = (card, step) => {
+            let sibling = card[step];
+            while (sibling && (!sibling.classList.contains('task-card') || sibling.classList.contains('d-none'))) {
+                sibling = sibling[step];
             }
-        } catch (error) {
-            logError('Failed to reorder tasks:', error);
+            return sibling ? Number(sibling.getAttribute('data-task-id')) : null;
+        };
+        return {
+            after_id: visibleSibling(taskCard, 'previousElementSibling'),
+            before_id: visibleSibling(taskCard, 'nextElementSibling'),
+        };
+    };
+
+    /**
+     * Moves one task to a new column and/or position with a single request.
+     * @param {number|string} taskId - Task to move.
+     * @param {Object} payload - Optional status plus after_id/before_id neighbours.
+     * @returns {Promise<Object>} The moved task.
+     */
+    const moveTask = async (taskId, payload) => {
+        const response = await fetch(`/tasks/${taskId}/move`, {
+            method: 'PUT',
+            headers: {
+                'Content-Type': 'application/json',
+            },
+            body: JSON.stringify(payload),
+        });
+        if (!response.ok) {
+            throw new Error('Network response was not ok');
         }
+        return response.json();
     };
 
     const moveTaskToStatus = async (taskCard, newStatus, sourceStatus, taskIdOverride = null) => {
@@ -1114,41 +1498,25 @@ document.addEventListener('DOMContentLoaded', () => {
             return;
         }
 
-        try {
-            const response = await fetch(`/tasks/${taskId}`, {
-                method: 'PUT',
-                headers: {
-                    'Content-Type': 'application/json',
-                },
-                body: JSON.stringify({ status: newStatus }),
-            });
-
-            if (!response.ok) {
-                const errorData = await response.json();
-                throw new Error(errorData.detail || 'Network response was not ok');
+        const destinationColumn = taskColumns[newStatus];
+        if (destinationColumn && sortState[newStatus] === 'manual' && taskCard) {
+            if (!destinationColumn.contains(taskCard)) {
+                destinationColumn.appendChild(taskCard);
             }
+        }
+        if (taskCard) {
+            taskCard.setAttribute('data-task-status', newStatus);
+        }
 
-            const destinationColumn = taskColumns[newStatus];
+        try {
+            const payload = { status: newStatus };
             if (destinationColumn && sortState[newStatus] === 'manual' && taskCard) {
-                if (!destinationColumn.contains(taskCard)) {
-                    destinationColumn.appendChild(taskCard);
-                }
-            }
-            if (taskCard) {
-                taskCard.setAttribute('data-task-status', newStatus);
-            }
-
-            const sourceColumn = sourceStatus ? taskColumns[sourceStatus] : null;
-            if (sourceStatus && sortState[sourceStatus] === 'manual' && sourceColumn) {
-                await updateOrderForColumn(sourceColumn, sourceStatus);
+                Object.assign(payload, getCardNeighbours(taskCard));
             }
-            if (destinationColumn && sortState[newStatus] === 'manual') {
-                await updateOrderForColumn(destinationColumn, newStatus);
-            }
-            fetchTasks();
+            applyTaskChange(await moveTask(taskId, payload));
         } catch (error) {
             logError('Failed to update task status:', error);
-            fetchTasks();
+            resyncBoard();
         }
     };
 
@@ -1242,8 +1610,8 @@ document.addEventListener('DOMContentLoaded', () => {
             }
 
             try {
+                const dragging = document.querySelector('.task-card.dragging');
                 if (sortState[newStatus] === 'manual') {
-                    const dragging = document.querySelector('.task-card.dragging');
                     const afterElement = getDragAfterElement(columnElement, e.clientY);
                     if (dragging) {
                         if (afterElement == null) {
@@ -1255,42 +1623,142 @@ document.addEventListener('DOMContentLoaded', () => {
                 }
 
                 if (sourceStatus && newStatus !== sourceStatus) {
-                    await moveTaskToStatus(
-                        document.querySelector('.task-card.dragging'),
-                        newStatus,
-                        sourceStatus,
-                        draggedTaskId
-                    );
-                } else {
-                    if (sourceStatus && sortState[sourceStatus] === 'manual') {
-                        const sourceColumn = taskColumns[sourceStatus];
-                        if (sourceColumn) {
-                            await updateOrderForColumn(sourceColumn, sourceStatus);
-                        }
-                    }
-                    if (sortState[newStatus] === 'manual') {
-                        await updateOrderForColumn(columnElement, newStatus);
-                    }
-                    fetchTasks();
+                    await moveTaskToStatus(dragging, newStatus, sourceStatus, draggedTaskId);
+                } else if (dragging && sortState[newStatus] === 'manual') {
+                    applyTaskChange(await moveTask(draggedTaskId, getCardNeighbours(dragging)));
                 }
 
             } catch (error) {
                 logError('Failed to update task status:', error);
-                fetchTasks();
+                resyncBoard();
             }
         }
     });
 
-    const refreshCountdowns = () => {
-        renderTasks(getFilteredTasks());
+    /**
+     * Applies change events received from the server since the last flush. Events
+     * arrive in bursts (a drag reorders a whole column), so they are collected and the
+     * board is reconciled once per burst.
+     */
+    const applyPendingChanges = () => {
+        const changes = pendingChanges.splice(0);
+        if (changes.length === 0) {
+            return;
+        }
+        if (hasActiveFilters() || changes.some(change => change.type === 'resync')) {
+            resyncBoard();
+            return;
+        }
+        let archiveCountStale = false;
+        changes.forEach(({ type, task_id: taskId, task }) => {
+            currentTasks = currentTasks.filter(item => item.id !== taskId);
+            if (task && !isOffBoard(task)) {
+                currentTasks.push(task);
+            }
+            if (task && isOffBoard(task)) {
+                addArchivedTask(task);
+            } else if (isArchivedLocally(taskId)) {
+                removeArchivedTask(taskId);
+            } else if (!task || type === 'restored') {
+                // Purged or restored outside the loaded archive pages.
+                archiveCountStale = true;
+            }
+        });
+        boardTotalCount = currentTasks.length;
+        renderTasks(currentTasks);
         updateFilterStatus();
-        if (archivedSection && !archivedSection.classList.contains('d-none')) {
-            renderArchivedTasks(archivedTasks);
+        if (archiveCountStale) {
+            fetchBoardStats();
         }
+        const knownTags = new Set(availableTags.map(tag => tag.toLowerCase()));
+        const hasNewTags = changes.some(({ task }) => task
+            && parseTagsValue(task.tags).some(tag => !knownTags.has(tag.toLowerCase())));
+        if (hasNewTags) {
+            fetchTags();
+        }
+    };
+
+    const scheduleChangeFlush = debounce(applyPendingChanges, CHANGE_FLUSH_DELAY_MS);
+
+    /**
+     * Catches up with changes made since the last board load or sync, e.g. after the
+     * event stream reconnects, instead of reloading the whole board.
+     */
+    const syncChanges = async () => {
+        if (!changeToken || hasActiveFilters()) {
+            fetchTasks();
+            return;
+        }
+        try {
+            let hasMore = true;
+            while (hasMore) {
+                const params = new URLSearchParams({ since: changeToken });
+                const response = await fetch(`/tasks/changes?${params}`);
+                if (!response.ok) {
+                    throw new Error('Network response was not ok');
+                }
+                const page = await response.json();
+                pendingChanges.push(...page.changes);
+                changeToken = page.token;
+                hasMore = page.has_more;
+            }
+            applyPendingChanges();
+        } catch (error) {
+            logError('Failed to sync task changes:', error);
+            resyncBoard();
+        }
+    };
+
+    /**
+     * Subscribes to the server's change feed; falls back to periodic polling when the
+     * browser has no EventSource or the stream is closed for good.
+     */
+    const connectTaskEvents = () => {
+        if (typeof EventSource === 'undefined') {
+            setInterval(fetchTasks, FALLBACK_POLL_MS);
+            return;
+        }
+        const source = new EventSource('/tasks/events');
+        // Also fires after a reconnect, e.g. when the machine wakes from sleep.
+        source.addEventListener('open', () => syncChanges());
+        source.addEventListener('message', (event) => {
+            try {
+                pendingChanges.push(JSON.parse(event.data));
+            } catch (error) {
+                logError('Failed to parse task event:', error);
+                return;
+            }
+            scheduleChangeFlush();
+        });
+        source.addEventListener('error', () => {
+            if (source.readyState === EventSource.CLOSED) {
+                setInterval(fetchTasks, FALLBACK_POLL_MS);
+            }
+        });
+    };
+
+    const refreshCountdowns = () => {
+        renderTasks(currentTasks);
+        updateFilterStatus();
     };
 
+    const archiveObserver = archivedSentinel && typeof IntersectionObserver !== 'undefined'
+        ? new IntersectionObserver((entries) => {
+            if (entries.some(entry => entry.isIntersecting)) {
+                loadMoreArchivedTasks();
+            }
+        }, { rootMargin: '200px' })
+        : null;
+    if (archivedSentinel && !archiveObserver) {
+        window.addEventListener('scroll', () => {
+            if (archivedSentinel.getBoundingClientRect().top < window.innerHeight + 200) {
+                loadMoreArchivedTasks();
+            }
+        }, { passive: true });
+    }
+
     setInterval(refreshCountdowns, 60000);
-    setInterval(fetchTasks, 300000);
+    connectTaskEvents();
 
     loadZoomLevel();
     fetchTags();
@@ -21,11 +21,15 @@ def test_env(tmp_path, monkeypatch):
     import database
     import models
     import crud
+    import migrations
+    import analytics
     import main
 
     importlib.reload(database)
     importlib.reload(models)
     importlib.reload(crud)
+    importlib.reload(migrations)
+    importlib.reload(analytics)
     importlib.reload(main)
 
     models.Base.metadata.create_all(bind=database.engine)
@@ -34,5 +38,7 @@ def test_env(tmp_path, monkeypatch):
         "database": database,
         "models": models,
         "crud": crud,
+        "migrations": migrations,
+        "analytics": analytics,
         "main": main,
     }
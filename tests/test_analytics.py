@@ -0,0 +1,119 @@
+from datetime import date, datetime
+
+from schemas import TaskImport, TaskStatus, TaskUpdate
+
+
+def import_history(crud, db):
+    """Two weeks of history: Monday 2025-01-06 and Monday 2025-01-13."""
+    records = [
+        TaskImport(title="A", tags="ops", status=TaskStatus.done,
+                   created_at=datetime(2025, 1, 6, 9), done_at=datetime(2025, 1, 7, 9)),
+        TaskImport(title="B", tags="ops, docs", status=TaskStatus.done,
+                   created_at=datetime(2025, 1, 6, 10), done_at=datetime(2025, 1, 9, 10)),
+        TaskImport(title="C", tags="docs", status=TaskStatus.done,
+                   created_at=datetime(2025, 1, 8, 12), done_at=datetime(2025, 1, 13, 12)),
+        # Created on a Sunday, which still belongs to the week of the 6th.
+        TaskImport(title="D", status=TaskStatus.to_do,
+                   created_at=datetime(2025, 1, 12, 8), deleted_at=datetime(2025, 1, 14, 8)),
+        TaskImport(title="E", status=TaskStatus.to_do, created_at=datetime(2025, 1, 14, 8)),
+    ]
+    crud.import_tasks(db, records)
+
+
+def test_weekly_flow_and_lead_time_percentiles(test_env):
+    crud = test_env["crud"]
+    db = test_env["database"].SessionLocal()
+    try:
+        import_history(crud, db)
+
+        flow = [tuple(row) for row in crud.get_weekly_flow(db)]
+        assert flow == [
+            ("2025-01-06", 4, 2, 0, 4, 2, 0),
+            ("2025-01-13", 1, 1, 1, 5, 3, 1),
+        ]
+        # Running totals start at `since`.
+        assert [tuple(row) for row in crud.get_weekly_flow(db, since=date(2025, 1, 13))] == [
+            ("2025-01-13", 1, 1, 1, 1, 1, 1),
+        ]
+
+        lead_times = [
+            (row.week, row.tag, row.count, round(row.p50), round(row.p85), round(row.p95))
+            for row in crud.get_weekly_lead_times(db)
+        ]
+        assert lead_times == [
+            ("2025-01-06", None, 2, 24, 72, 72),
+            ("2025-01-06", "docs", 1, 72, 72, 72),
+            ("2025-01-06", "ops", 2, 24, 72, 72),
+            ("2025-01-13", None, 1, 120, 120, 120),
+            ("2025-01-13", "docs", 1, 120, 120, 120),
+        ]
+        assert crud.week_start(datetime(2025, 1, 12, 23)) == date(2025, 1, 6)
+    finally:
+        db.close()
+
+
+def test_report_only_queries_unfinished_weeks(test_env):
+    crud = test_env["crud"]
+    analytics = test_env["analytics"]
+    models = test_env["models"]
+    db = test_env["database"].SessionLocal()
+    now = [datetime(2025, 1, 15, 12)]
+    report = analytics.WeeklyAnalytics(crud.get_history_revision, clock=lambda: now[0])
+    try:
+        import_history(crud, db)
+
+        first = report.report(db, weeks=3)
+        assert [week["week"] for week in first["weeks"]] == ["2024-12-30", "2025-01-06", "2025-01-13"]
+        assert first["weeks"][0]["cumulative"] == {"created": 0, "done": 0, "dropped": 0, "open": 0}
+        assert first["weeks"][1]["lead_time"] == {"count": 2, "p50": 24.0, "p85": 72.0, "p95": 72.0}
+        assert first["weeks"][1]["lead_time_by_tag"]["docs"]["count"] == 1
+        assert first["weeks"][2]["cumulative"] == {"created": 5, "done": 3, "dropped": 1, "open": 1}
+        assert report.weeks_loaded == 2
+
+        # The week of the 6th is finished: only the current week is queried again.
+        assert report.report(db, weeks=3) == first
+        assert report.weeks_loaded == 3
+
+        # A new week closes the 13th; quiet weeks carry the totals over.
+        now[0] = datetime(2025, 1, 22, 12)
+        following = report.report(db, weeks=3)
+        assert report.weeks_loaded == 5
+        assert following["weeks"][:2] == first["weeks"][1:]
+        assert following["weeks"][2]["done"] == 0
+        assert following["weeks"][2]["cumulative"] == first["weeks"][2]["cumulative"]
+        assert following["weeks"][2]["lead_time"]["p50"] is None
+
+        # Reopening a done task rewrites a finished week, so the history is rebuilt.
+        task_a = db.query(models.Task).filter(models.Task.title == "A").one()
+        crud.update_task_status(db, task_a.id, TaskStatus.to_do)
+        rebuilt = report.report(db, weeks=3)
+        assert report.weeks_loaded == 8
+        assert rebuilt["weeks"][0]["done"] == 1
+        assert rebuilt["weeks"][0]["lead_time"]["count"] == 1
+    finally:
+        db.close()
+
+
+def test_finishing_a_dropped_task_rebuilds_history(test_env):
+    crud = test_env["crud"]
+    analytics = test_env["analytics"]
+    models = test_env["models"]
+    db = test_env["database"].SessionLocal()
+    report = analytics.WeeklyAnalytics(crud.get_history_revision, clock=lambda: datetime(2025, 1, 22, 12))
+    try:
+        import_history(crud, db)
+        before = report.report(db, weeks=2)
+        assert before["weeks"][0]["dropped"] == 1
+
+        # D was deleted in the week of the 13th without being done; finishing it now
+        # takes it out of that finished week's dropped count.
+        task_d = db.query(models.Task).filter(models.Task.title == "D").one()
+        revision = crud.get_history_revision()
+        crud.update_task(db, task_d.id, TaskUpdate(status=TaskStatus.done))
+        assert crud.get_history_revision() > revision
+
+        after = report.report(db, weeks=2)
+        assert after["weeks"][0]["dropped"] == 0
+        assert after["weeks"][1]["cumulative"]["dropped"] == 0
+    finally:
+        db.close()
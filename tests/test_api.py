@@ -1,4 +1,12 @@
+import asyncio
+import importlib
+import json
+
+from fastapi.routing import APIRoute
 from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+import events
 
 
 def create_task(client, title, status="ToDo", tags=None):
@@ -23,6 +31,43 @@ def test_create_and_list_tasks(test_env):
     tasks = response.json()
     assert any(task["id"] == created["id"] for task in tasks)
 
+    create_task(client, "Task Z", tags="beta")
+    response = client.get("/tasks/", params={"tag": "Alpha"})
+    assert [task["id"] for task in response.json()] == [created["id"]]
+
+    response = client.get("/tags/")
+    assert response.json() == ["alpha", "beta"]
+
+
+def test_list_tasks_filters_on_server(test_env):
+    client = TestClient(test_env["main"].app)
+    todo = create_task(client, "Draft roadmap", tags="planning")
+    ongoing = create_task(client, "Groom backlog", status="Ongoing")
+    create_task(client, "Ship release", status="Done")
+
+    response = client.get("/tasks/", params={"status": ["ToDo", "Ongoing"]})
+    assert response.status_code == 200
+    assert [task["id"] for task in response.json()] == [todo["id"], ongoing["id"]]
+
+    response = client.get("/tasks/", params={"q": "roadmap", "sort": "entry-desc"})
+    assert [task["id"] for task in response.json()] == [todo["id"]]
+
+    response = client.get("/tasks/", params={"sort": "sideways"})
+    assert response.status_code == 422
+
+
+def test_search_tasks_endpoint(test_env):
+    client = TestClient(test_env["main"].app)
+    created = create_task(client, "Quarterly planning", tags="strategy")
+    create_task(client, "Lunch")
+
+    response = client.get("/tasks/search", params={"q": "strat"})
+    assert response.status_code == 200
+    assert [task["id"] for task in response.json()] == [created["id"]]
+
+    response = client.get("/tasks/search")
+    assert response.status_code == 422
+
 
 def test_update_and_delete_task(test_env):
     client = TestClient(test_env["main"].app)
@@ -54,6 +99,15 @@ def test_update_and_delete_task(test_env):
     archived = response.json()
     assert any(task["id"] == created["id"] for task in archived)
 
+    assert "X-Next-Cursor" not in response.headers
+
+    response = client.get("/tasks/archived", params={"cursor": "%%%"})
+    assert response.status_code == 400
+
+    response = client.get("/tasks/archived/count")
+    assert response.status_code == 200
+    assert response.json() == {"count": 1}
+
     response = client.delete(f"/tasks/{created['id']}")
     assert response.status_code == 200
     response = client.delete(f"/tasks/{created['id']}")
@@ -95,3 +149,354 @@ def test_validation_errors(test_env):
         },
     )
     assert response.status_code == 422
+
+
+def test_archived_tasks_cursor_pages(test_env):
+    client = TestClient(test_env["main"].app)
+    created = [create_task(client, f"Archived {index}") for index in range(3)]
+    for task in created:
+        assert client.delete(f"/tasks/{task['id']}").status_code == 200
+
+    response = client.get("/tasks/archived", params={"limit": 2})
+    first_page = [task["id"] for task in response.json()]
+    cursor = response.headers["X-Next-Cursor"]
+
+    response = client.get("/tasks/archived", params={"limit": 2, "cursor": cursor})
+    second_page = [task["id"] for task in response.json()]
+    assert "X-Next-Cursor" not in response.headers
+    assert sorted(first_page + second_page) == sorted(task["id"] for task in created)
+
+
+def test_delete_archived_tasks_by_tag(test_env):
+    client = TestClient(test_env["main"].app)
+    keep = create_task(client, "Keep", tags="docs")
+    purge = create_task(client, "Purge", tags="ops")
+    for task in (keep, purge):
+        client.delete(f"/tasks/{task['id']}")
+
+    response = client.delete("/tasks/archived", params={"tag": "ops"})
+    assert response.status_code == 200
+    assert response.json() == {"deleted_count": 1}
+
+    response = client.delete("/tasks/archived", params={"older_than": "2000-01-01T00:00:00Z"})
+    assert response.json() == {"deleted_count": 0}
+
+    response = client.get("/tasks/archived")
+    assert [task["id"] for task in response.json()] == [keep["id"]]
+
+
+def test_batch_endpoint(test_env):
+    client = TestClient(test_env["main"].app)
+    existing = create_task(client, "Existing")
+
+    response = client.post(
+        "/tasks/batch",
+        json={
+            "operations": [
+                {"op": "create", "task": {"title": "Imported", "status": "ToDo"}},
+                {"op": "update", "task_id": existing["id"], "changes": {"status": "Done"}},
+                {"op": "restore", "task_id": 424242},
+            ]
+        },
+    )
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [result["ok"] for result in results] == [True, True, False]
+    assert results[0]["task"]["title"] == "Imported"
+    assert results[1]["task"]["status"] == "Done"
+
+    response = client.post("/tasks/batch", json={"operations": [{"op": "update", "task_id": 1}]})
+    assert response.status_code == 422
+
+    response = client.post("/tasks/batch", json={"operations": []})
+    assert response.status_code == 422
+
+
+def test_board_reads_answer_conditional_requests(test_env):
+    client = TestClient(test_env["main"].app)
+    create_task(client, "Cached", tags="alpha")
+
+    for path in ("/tasks/", "/tasks/archived", "/tags/"):
+        response = client.get(path)
+        etag = response.headers["ETag"]
+        response = client.get(path, headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.content == b""
+
+    create_task(client, "Fresh")
+    response = client.get("/tasks/", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert len(response.json()) == 2
+
+
+def test_task_event_stream(test_env):
+    main = test_env["main"]
+
+    class ConnectedRequest:
+        disconnected = False
+
+        async def is_disconnected(self):
+            return self.disconnected
+
+    async def scenario():
+        request = ConnectedRequest()
+        stream = main.stream_task_events(request, keepalive=0.05)
+        chunks = [await stream.__anext__()]
+        chunks.append(await stream.__anext__())
+        events.broker.publish([{"type": "created", "task_id": 1, "task": None, "revision": 7}])
+        chunks.append(await stream.__anext__())
+        request.disconnected = True
+        await stream.aclose()
+        return chunks
+
+    retry, keepalive, message = asyncio.run(scenario())
+    assert retry == f"retry: {test_env['main'].EVENT_STREAM_RETRY_MS}\n\n"
+    assert keepalive == ": keep-alive\n\n"
+    event_id, data = message.strip().split("\n")
+    assert event_id == "id: 7"
+    assert json.loads(data.removeprefix("data: "))["type"] == "created"
+    assert events.broker.subscriber_count == 0
+
+
+def test_task_changes_endpoint(test_env):
+    client = TestClient(test_env["main"].app)
+    first = create_task(client, "First")
+    response = client.get("/tasks/")
+    token = response.headers["X-Change-Token"]
+
+    second = create_task(client, "Second")
+    client.delete(f"/tasks/{first['id']}")
+    client.delete(f"/tasks/{first['id']}")
+
+    response = client.get("/tasks/changes", params={"since": token})
+    assert response.status_code == 200
+    body = response.json()
+    assert [(change["type"], change["task_id"]) for change in body["changes"]] == [
+        ("updated", second["id"]),
+        ("deleted", first["id"]),
+    ]
+    assert body["changes"][0]["task"]["title"] == "Second"
+    assert body["has_more"] is False
+
+    response = client.get("/tasks/changes", params={"since": body["token"]})
+    assert response.json()["changes"] == []
+
+    response = client.get("/tasks/changes", params={"since": "not-a-token"})
+    assert response.status_code == 400
+
+
+def test_async_database_path(test_env, monkeypatch):
+    monkeypatch.setenv("POHELPER_ASYNC_DB", "1")
+    main = importlib.reload(test_env["main"])
+    sync_endpoints = {
+        route.endpoint.__name__ for route in main.app.routes if isinstance(route, APIRoute)
+    }
+    async_endpoints = {route.endpoint.__name__ for route in main.async_router.routes}
+    assert not sync_endpoints & {name.removesuffix("_async") for name in async_endpoints}
+
+    with TestClient(main.app) as client:
+        created = create_task(client, "Async", tags="alpha")
+        response = client.get("/tasks/", params={"tag": "alpha"})
+        assert [task["id"] for task in response.json()] == [created["id"]]
+        assert "X-Change-Token" in response.headers
+
+        response = client.put(f"/tasks/{created['id']}", json={"status": "Done"})
+        assert response.json()["status"] == "Done"
+        assert client.get("/tags/").json() == ["alpha"]
+
+        assert client.get("/tasks/stats").json()["by_status"]["Done"] == 1
+        assert client.get("/tasks/analytics", params={"weeks": 1}).json()["weeks"][0]["done"] == 1
+        assert client.delete(f"/tasks/{created['id']}").status_code == 200
+        assert client.get("/tasks/archived/count").json() == {"count": 1}
+        assert client.put("/tasks/424242/restore").status_code == 404
+        assert client.delete("/tasks/archived").json() == {"deleted_count": 1}
+        assert main.database.async_engine is not None
+
+
+def test_task_stats_endpoint(test_env):
+    main = test_env["main"]
+    client = TestClient(main.app)
+    create_task(client, "First", tags="alpha, beta")
+    second = create_task(client, "Second", status="Done", tags="alpha")
+    urgent = client.post(
+        "/tasks/", json={"title": "Late", "status": "Ongoing", "urgent": True, "due_date": "2000-01-01"}
+    ).json()
+    client.delete(f"/tasks/{second['id']}")
+
+    response = client.get("/tasks/stats")
+    assert response.status_code == 200
+    assert response.json() == {
+        "total": 2,
+        "by_status": {"ToDo": 1, "Ongoing": 1, "Done": 0},
+        "urgent": 1,
+        "overdue": 1,
+        "archived": 1,
+        "tags": {"alpha": 1, "beta": 1},
+    }
+
+    filtered = client.get("/tasks/stats", params={"tag": "alpha"}).json()
+    assert filtered["total"] == 1
+    assert filtered["archived"] == 1
+    assert client.get("/tasks/stats", params={"urgent": "true"}).json()["by_status"]["Ongoing"] == 1
+
+    client.put(f"/tasks/{urgent['id']}", json={"status": "Done"})
+    assert client.get("/tasks/stats").json()["overdue"] == 0
+
+
+def test_task_analytics_endpoint(test_env):
+    main = test_env["main"]
+    client = TestClient(main.app)
+    create_task(client, "First", tags="alpha")
+    done = create_task(client, "Second", status="Done", tags="alpha, beta")
+
+    response = client.get("/tasks/analytics", params={"weeks": 2})
+    assert response.status_code == 200
+    previous, current = response.json()["weeks"]
+    assert previous["created"] == 0
+    assert current["created"] == 2
+    assert current["done"] == 1
+    assert current["cumulative"] == {"created": 2, "done": 1, "dropped": 0, "open": 1}
+    assert current["lead_time"]["count"] == 1
+    assert sorted(current["lead_time_by_tag"]) == ["alpha", "beta"]
+
+    client.delete(f"/tasks/{create_task(client, 'Dropped')['id']}")
+    current = client.get("/tasks/analytics", params={"weeks": 2}).json()["weeks"][-1]
+    assert current["dropped"] == 1
+    assert current["cumulative"]["open"] == 1
+    client.put(f"/tasks/{done['id']}", json={"status": "Ongoing"})
+    assert client.get("/tasks/analytics", params={"weeks": 2}).json()["weeks"][-1]["done"] == 0
+    assert client.get("/tasks/analytics", params={"weeks": 0}).status_code == 422
+
+
+def test_move_task_endpoint(test_env):
+    client = TestClient(test_env["main"].app)
+    first = create_task(client, "First")
+    second = create_task(client, "Second")
+    third = create_task(client, "Third")
+
+    response = client.put(
+        f"/tasks/{third['id']}/move",
+        json={"after_id": first["id"], "before_id": second["id"]},
+    )
+    assert response.status_code == 200
+    ordered = [task["id"] for task in client.get("/tasks/").json()]
+    assert ordered == [first["id"], third["id"], second["id"]]
+
+    # Inverted, repeated or self neighbours are rejected instead of retried forever.
+    for neighbours in (
+        {"after_id": second["id"], "before_id": first["id"]},
+        {"after_id": second["id"], "before_id": second["id"]},
+        {"after_id": third["id"]},
+    ):
+        response = client.put(f"/tasks/{third['id']}/move", json=neighbours)
+        assert response.status_code == 400
+    assert [task["id"] for task in client.get("/tasks/").json()] == ordered
+
+    response = client.put(f"/tasks/{first['id']}/move", json={"status": "Ongoing"})
+    assert response.json()["status"] == "Ongoing"
+    response = client.put(f"/tasks/{second['id']}/move", json={"status": "Ongoing", "after_id": third["id"]})
+    assert response.status_code == 400
+
+    assert client.put("/tasks/424242/move", json={}).status_code == 404
+
+
+def test_board_reads_are_served_from_cache(test_env):
+    main = test_env["main"]
+    client = TestClient(main.app)
+    created = create_task(client, "Cached", tags="alpha")
+    statements = []
+    event.listen(
+        test_env["database"].engine,
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement),
+    )
+
+    first = client.get("/tasks/")
+    misses = main.read_cache.stats()["misses"]
+    executed = len(statements)
+    second = client.get("/tasks/")
+    assert second.content == first.content
+    assert second.headers["X-Change-Token"] == first.headers["X-Change-Token"]
+    assert len(statements) == executed
+    assert main.read_cache.stats()["misses"] == misses
+    assert main.read_cache.stats()["hits"] >= 1
+
+    client.put(f"/tasks/{created['id']}", json={"title": "Renamed"})
+    assert client.get("/tasks/").json()[0]["title"] == "Renamed"
+    assert main.read_cache.stats()["misses"] == misses + 1
+
+
+def test_export_and_import_round_trip(test_env):
+    client = TestClient(test_env["main"].app)
+    first = create_task(client, "First, with comma", tags="alpha, beta")
+    create_task(client, "Second", status="Ongoing")
+    archived = create_task(client, "Archived", status="Done")
+    client.delete(f"/tasks/{archived['id']}")
+
+    exports = {}
+    for export_format in ("ndjson", "csv"):
+        response = client.get("/tasks/export", params={"format": export_format})
+        assert response.status_code == 200
+        assert f"tasks.{export_format}" in response.headers["Content-Disposition"]
+        exports[export_format] = response.content
+    exported = [json.loads(line) for line in exports["ndjson"].decode().splitlines()]
+    assert {task["title"] for task in exported} == {"First, with comma", "Second", "Archived"}
+
+    for export_format, body in exports.items():
+        # Send the body in small pieces to exercise the streaming reader.
+        chunks = (body[start:start + 7] for start in range(0, len(body), 7))
+        response = client.post("/tasks/import", params={"format": export_format}, content=chunks)
+        assert response.json() == {"imported_count": 3}
+
+    board = client.get("/tasks/").json()
+    copies = [task for task in board if task["title"] == "First, with comma"]
+    assert len(copies) == 3
+    assert len({task["order_index"] for task in copies}) == 3
+    assert all(task["tags"] == "alpha, beta" for task in copies)
+    assert [task["id"] for task in client.get("/tasks/", params={"tag": "beta"}).json()][0] == first["id"]
+    assert len(client.get("/tasks/", params={"tag": "beta"}).json()) == 3
+    assert client.get("/tasks/archived/count").json() == {"count": 3}
+    assert client.get("/tags/").json() == ["alpha", "beta"]
+
+    response = client.post("/tasks/import", content=b'{"title": "Ok", "status": "ToDo"}\n{"title": "Bad"}\n')
+    assert response.status_code == 400
+    assert response.json()["detail"].startswith("Line 2:")
+    # An archived task needs a deleted_at or done_at to sort and purge by.
+    response = client.post(
+        "/tasks/import", content=b'{"title": "Orphan", "status": "ToDo", "archived_at": "2024-01-01T00:00:00"}\n'
+    )
+    assert response.status_code == 400
+    assert "archived_at requires deleted_at" in response.json()["detail"]
+    assert len(client.get("/tasks/").json()) == len(board)
+    assert client.get("/tasks/archived").status_code == 200
+
+
+def test_metrics_are_off_by_default(test_env):
+    client = TestClient(test_env["main"].app)
+    response = client.get("/tasks/")
+    assert "Server-Timing" not in response.headers
+    assert client.get("/metrics").status_code == 404
+
+
+def test_request_metrics(test_env, monkeypatch):
+    monkeypatch.setenv("POHELPER_METRICS", "1")
+    main = importlib.reload(test_env["main"])
+    main.metrics.registry.reset()
+    client = TestClient(main.app)
+    create_task(client, "Timed", tags="alpha")
+
+    timing = client.get("/tasks/").headers["Server-Timing"]
+    entries = {entry.split(";")[0]: entry for entry in timing.split(", ")}
+    assert set(entries) == {"db", "encode", "app", "total"}
+    assert 'desc="0 queries"' not in entries["db"]
+
+    body = client.get("/metrics").text
+    assert 'pohelper_request_duration_seconds_count{method="GET",route="/tasks/",status="2xx"} 1' in body
+    assert 'pohelper_request_duration_seconds_bucket{method="POST",route="/tasks/",status="2xx",le="+Inf"} 1' in body
+    queries = [line for line in body.splitlines() if line.startswith('pohelper_db_queries_total{method="GET",route="/tasks/"}')]
+    assert int(queries[0].rsplit(" ", 1)[1]) > 0
+    assert "pohelper_read_cache_misses 1" in body
+
+    client.get("/no-such-page")
+    assert 'route="<unmatched>",status="4xx"' in client.get("/metrics").text
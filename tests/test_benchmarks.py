@@ -0,0 +1,31 @@
+from benchmarks import seed, suite
+
+
+def test_seeded_board_follows_the_distribution(test_env):
+    crud = test_env["crud"]
+    db = test_env["database"].SessionLocal()
+    try:
+        assert seed.seed_board(crud, db, 400) == 400
+        archived = crud.count_archived_tasks(db)
+        live = crud.get_tasks(db)
+        assert 100 < archived < 300
+        assert len(live) == 400 - archived
+        assert crud.archive_expired_tasks(db) == 0
+        assert len(crud.get_tags(db)) > 5
+    finally:
+        db.close()
+
+
+def test_suite_covers_every_crud_function_and_route(test_env):
+    db = test_env["database"].SessionLocal()
+    try:
+        seed.seed_board(test_env["crud"], db, 300)
+    finally:
+        db.close()
+
+    results = suite.run_suite(test_env, iterations=1)
+    covered = {row["target"] for row in results}
+    expected = {f"crud.{name}" for name in suite.public_crud_functions(test_env["crud"])}
+    expected |= set(suite.api_routes(test_env["main"]))
+    assert expected <= covered
+    assert all(row["p50_ms"] >= 0 and row["iterations"] >= 1 for row in results)
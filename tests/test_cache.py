@@ -0,0 +1,47 @@
+from datetime import datetime, timedelta
+
+from cache import CachedRead, ReadCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = datetime(2025, 1, 1, 12, 0)
+
+    def __call__(self):
+        return self.now
+
+
+def test_entries_follow_the_board_revision():
+    revision = [0]
+    read_cache = ReadCache(lambda: revision[0])
+    loads = []
+
+    def load():
+        loads.append(revision[0])
+        return CachedRead(content=b"[]", headers={"X-Test": "1"})
+
+    assert read_cache.get_or_load("board", load).headers == {"X-Test": "1"}
+    read_cache.get_or_load("board", load)
+    assert loads == [0]
+
+    revision[0] += 1
+    read_cache.get_or_load("board", load)
+    assert loads == [0, 1]
+    assert read_cache.stats() == {"hits": 1, "misses": 2, "entries": 1}
+
+
+def test_entries_expire_at_the_archive_boundary_and_evict_oldest():
+    clock = Clock()
+    read_cache = ReadCache(lambda: 0, max_entries=2, clock=clock)
+    expires_at = clock.now + timedelta(hours=1)
+    read_cache.get_or_load("board", lambda: CachedRead(content=b"old", expires_at=expires_at))
+
+    clock.now = expires_at - timedelta(seconds=1)
+    assert read_cache.get_or_load("board", lambda: CachedRead(content=b"new")).content == b"old"
+    clock.now = expires_at
+    assert read_cache.get_or_load("board", lambda: CachedRead(content=b"new")).content == b"new"
+
+    read_cache.get_or_load("tags", lambda: CachedRead(content=b"[]"))
+    read_cache.get_or_load("archived", lambda: CachedRead(content=b"[]"))
+    assert read_cache.stats()["entries"] == 2
+    assert read_cache.get_or_load("board", lambda: CachedRead(content=b"reloaded")).content == b"reloaded"
@@ -1,6 +1,20 @@
-from datetime import date
+import asyncio
+from datetime import date, datetime, timedelta
 
-from schemas import TaskCreate, TaskUpdate, TaskStatus
+from sqlalchemy import event, select
+
+import events
+
+from schemas import (
+    TaskBatchOperation,
+    TaskCreate,
+    TaskFilters,
+    TaskImport,
+    TaskReorder,
+    TaskSort,
+    TaskStatus,
+    TaskUpdate,
+)
 
 
 def test_parse_tags_empty(test_env):
@@ -106,3 +120,561 @@ def test_reorder_tasks_respects_status(test_env):
         assert other.order_index == 1
     finally:
         db.close()
+
+
+def test_archive_expired_tasks_materializes_state(test_env):
+    database = test_env["database"]
+    models = test_env["models"]
+    crud = test_env["crud"]
+    db = database.SessionLocal()
+    try:
+        done_at = datetime.utcnow() - timedelta(hours=crud.ARCHIVE_AFTER_HOURS + 1)
+        expired = models.Task(title="Old", status="Done", order_index=1, done_at=done_at)
+        recent = models.Task(title="Recent", status="Done", order_index=2, done_at=datetime.utcnow())
+        db.add_all([expired, recent])
+        db.commit()
+
+        assert {task.id for task in crud.get_tasks(db)} == {expired.id, recent.id}
+        assert crud.next_archive_time(db) == done_at + timedelta(hours=crud.ARCHIVE_AFTER_HOURS)
+        assert crud.archive_expired_tasks(db) == 1
+        assert crud.archive_expired_tasks(db) == 0
+        assert crud.next_archive_time(db) == recent.done_at + timedelta(hours=crud.ARCHIVE_AFTER_HOURS)
+        db.refresh(expired)
+        assert expired.archived_at == done_at + timedelta(hours=crud.ARCHIVE_AFTER_HOURS)
+        assert [task.id for task in crud.get_tasks(db)] == [recent.id]
+        assert [task.id for task in crud.get_archived_tasks(db)] == [expired.id]
+        assert crud.count_archived_tasks(db) == 1
+
+        restored = crud.restore_task(db, expired.id)
+        assert restored.archived_at is None
+        assert restored.status == "ToDo"
+        assert crud.count_archived_tasks(db) == 0
+    finally:
+        db.close()
+
+
+def test_task_tags_are_linked_and_filterable(test_env):
+    database = test_env["database"]
+    crud = test_env["crud"]
+    db = database.SessionLocal()
+    try:
+        first = crud.create_task(db, TaskCreate(title="First", tags="Alpha, beta", status=TaskStatus.to_do))
+        second = crud.create_task(db, TaskCreate(title="Second", tags="alpha", status=TaskStatus.to_do))
+        assert sorted(tag.name for tag in first.linked_tags) == ["Alpha", "beta"]
+        assert [tag.name for tag in second.linked_tags] == ["Alpha"]
+        assert crud.get_tags(db) == ["Alpha", "beta"]
+        tagged = crud.get_tasks(db, filters=TaskFilters(tag="ALPHA"))
+        assert {task.id for task in tagged} == {first.id, second.id}
+
+        crud.update_task(db, first.id, TaskUpdate(tags="gamma"))
+        assert [task.id for task in crud.get_tasks(db, filters=TaskFilters(tag="alpha"))] == [second.id]
+        assert [task.id for task in crud.get_tasks(db, filters=TaskFilters(tag="gamma"))] == [first.id]
+        assert crud.get_tags(db) == ["Alpha", "beta", "gamma"]
+    finally:
+        db.close()
+
+
+def test_link_task_tags_links_existing_strings(test_env):
+    database = test_env["database"]
+    models = test_env["models"]
+    crud = test_env["crud"]
+    migrations = test_env["migrations"]
+    db = database.SessionLocal()
+    try:
+        legacy = models.Task(title="Legacy", status="ToDo", tags="Ops, ops, Docs")
+        untagged = models.Task(title="Untagged", status="ToDo")
+        other = models.Task(title="Other", status="ToDo", tags="docs, QA")
+        db.add_all([legacy, untagged, other])
+        db.commit()
+
+        migrations.link_task_tags(database.engine, batch_size=1)
+        migrations.link_task_tags(database.engine, batch_size=1)
+
+        assert crud.get_tags(db) == ["Docs", "Ops", "QA"]
+        assert [task.id for task in crud.get_tasks(db, filters=TaskFilters(tag="docs"))] == [legacy.id, other.id]
+        db.refresh(legacy)
+        assert sorted(tag.name for tag in legacy.linked_tags) == ["Docs", "Ops"]
+    finally:
+        db.close()
+
+
+def test_get_task_stats_counts_in_one_query(test_env):
+    database = test_env["database"]
+    crud = test_env["crud"]
+    db = database.SessionLocal()
+    try:
+        crud.create_task(
+            db,
+            TaskCreate(title="Late", tags="Ops, docs", due_date=date(2025, 1, 1), status=TaskStatus.to_do, urgent=True),
+        )
+        crud.create_task(db, TaskCreate(title="Shipped", tags="ops", due_date=date(2025, 1, 1), status=TaskStatus.done))
+        crud.create_task(db, TaskCreate(title="Next", tags="docs", due_date=date(2025, 3, 1), status=TaskStatus.in_progress))
+        gone = crud.create_task(db, TaskCreate(title="Gone", tags="ops", status=TaskStatus.to_do))
+        crud.delete_task(db, gone.id)
+
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(database.engine, "before_cursor_execute", record)
+        try:
+            stats = crud.get_task_stats(db, today=date(2025, 2, 1))
+        finally:
+            event.remove(database.engine, "before_cursor_execute", record)
+        assert len(statements) == 1
+        assert stats == {
+            "total": 3,
+            "by_status": {"ToDo": 1, "Ongoing": 1, "Done": 1},
+            "urgent": 1,
+            "overdue": 1,
+            "archived": 1,
+            "tags": {"docs": 2, "Ops": 2},
+        }
+
+        ops = crud.get_task_stats(db, filters=TaskFilters(tag="OPS"), today=date(2025, 2, 1))
+        assert ops["by_status"] == {"ToDo": 1, "Ongoing": 0, "Done": 1}
+        assert ops["archived"] == 1
+        assert ops["tags"] == {"Ops": 2, "docs": 1}
+        assert crud.get_task_stats(db, filters=TaskFilters(q="nothing matches"))["total"] == 0
+    finally:
+        db.close()
+
+
+def test_get_tasks_filters_and_sorts(test_env):
+    database = test_env["database"]
+    crud = test_env["crud"]
+    db = database.SessionLocal()
+    try:
+        report = crud.create_task(
+            db,
+            TaskCreate(
+                title="Write report",
+                description="Quarterly numbers",
+                tags="finance",
+                due_date=date(2025, 3, 1),
+                status=TaskStatus.to_do,
+                urgent=True,
+            ),
+        )
+        review = crud.create_task(
+            db,
+            TaskCreate(
+                title="Review PR",
+                tags="dev",
+                due_date=date(2025, 1, 15),
+                status=TaskStatus.in_progress,
+            ),
+        )
+        plan = crud.create_task(db, TaskCreate(title="Plan sprint", status=TaskStatus.to_do))
+
+        def ids(**kwargs):
+            sort = kwargs.pop("sort", TaskSort.manual)
+            return [task.id for task in crud.get_tasks(db, filters=TaskFilters(**kwargs), sort=sort)]
+
+        assert ids(status=[TaskStatus.to_do]) == [report.id, plan.id]
+        assert ids(urgent=True) == [report.id]
+        assert ids(due_from=date(2025, 2, 1)) == [report.id]
+        assert ids(due_to=date(2025, 2, 1)) == [review.id]
+        assert ids(q="QUARTERLY") == [report.id]
+        assert ids(q="dev, review") == [review.id]
+        assert ids(q="2025-01") == [review.id]
+        assert ids(q="2025") == [report.id, review.id]
+        # Words match by prefix through the full-text index.
+        assert ids(q="rev") == [review.id]
+        assert ids(q="port") == []
+        assert ids(q="100%") == []
+        assert ids(sort=TaskSort.due_asc) == [review.id, report.id, plan.id]
+        assert ids(sort=TaskSort.due_desc) == [report.id, review.id, plan.id]
+        assert ids(sort=TaskSort.tag_asc) == [review.id, report.id, plan.id]
+        assert ids(sort=TaskSort.entry_desc) == [plan.id, review.id, report.id]
+    finally:
+        db.close()
+
+
+def test_search_tasks_uses_full_text_index(test_env):
+    database = test_env["database"]
+    crud = test_env["crud"]
+    db = database.SessionLocal()
+    try:
+        deploy = crud.create_task(
+            db,
+            TaskCreate(title="Deploy service", description="Deploy to staging", status=TaskStatus.to_do),
+        )
+        notes = crud.create_task(
+            db,
+            TaskCreate(title="Release notes", description="Mention the deployment", status=TaskStatus.to_do),
+        )
+        crud.create_task(db, TaskCreate(title="Unrelated", tags="misc", status=TaskStatus.to_do))
+
+        assert [task.id for task in crud.search_tasks(db, "depl")] == [deploy.id, notes.id]
+        assert [task.id for task in crud.search_tasks(db, "release DEPLOY")] == [notes.id]
+        assert crud.search_tasks(db, "  \"*  ") == []
+
+        crud.update_task(db, notes.id, TaskUpdate(title="Changelog", description=None, tags="docs"))
+        assert [task.id for task in crud.search_tasks(db, "release")] == []
+        assert [task.id for task in crud.search_tasks(db, "doc")] == [notes.id]
+
+        crud.delete_task(db, deploy.id)
+        assert crud.search_tasks(db, "deploy") == []
+        assert [task.id for task in crud.search_tasks(db, "deploy", include_archived=True)] == [deploy.id]
+        crud.delete_task(db, deploy.id)
+        assert crud.search_tasks(db, "deploy", include_archived=True) == []
+    finally:
+        db.close()
+
+
+def test_search_index_rebuilds_for_existing_rows(test_env):
+    database = test_env["database"]
+    models = test_env["models"]
+    crud = test_env["crud"]
+    migrations = test_env["migrations"]
+    with database.engine.begin() as conn:
+        for name in ("tasks_fts_ai", "tasks_fts_ad", "tasks_fts_au"):
+            conn.exec_driver_sql(f"DROP TRIGGER {name}")
+        conn.exec_driver_sql("DROP TABLE tasks_fts")
+    db = database.SessionLocal()
+    try:
+        legacy = models.Task(title="Legacy backlog item", status="ToDo")
+        db.add(legacy)
+        db.commit()
+
+        migrations.create_task_search_index(database.engine, migrations.BACKFILL_BATCH_SIZE)
+        assert [task.id for task in crud.search_tasks(db, "backlog")] == [legacy.id]
+    finally:
+        db.close()
+
+
+def test_archived_tasks_keyset_pagination(test_env):
+    database = test_env["database"]
+    models = test_env["models"]
+    crud = test_env["crud"]
+    db = database.SessionLocal()
+    try:
+        base = datetime(2025, 1, 1, 12, 0, 0)
+        tasks = []
+        for index in range(7):
+            # Pairs share a timestamp so the id tie-breaker is exercised.
+            archived_key = base + timedelta(minutes=index // 2)
+            tasks.append(
+                models.Task(
+                    title=f"Archived {index}",
+                    status="ToDo",
+                    deleted_at=archived_key,
+                    archived_at=archived_key,
+                )
+            )
+        db.add_all(tasks)
+        db.commit()
+
+        expected = [task.id for task in sorted(tasks, key=lambda t: (t.deleted_at, t.id), reverse=True)]
+        seen = []
+        cursor = None
+        while True:
+            page = crud.get_archived_tasks(db, limit=3, cursor=cursor)
+            seen.extend(task.id for task in page)
+            if len(page) < 3:
+                break
+            cursor = crud.encode_archive_cursor(page[-1])
+        assert seen == expected
+
+        try:
+            crud.get_archived_tasks(db, cursor="not-a-cursor")
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("Expected an invalid cursor to raise ValueError")
+
+        assert crud.delete_archived_tasks(db, batch_size=2) == 7
+        assert crud.count_archived_tasks(db) == 0
+    finally:
+        db.close()
+
+
+def test_delete_archived_tasks_selective_purge(test_env):
+    database = test_env["database"]
+    models = test_env["models"]
+    crud = test_env["crud"]
+    db = database.SessionLocal()
+    try:
+        old = crud.create_task(db, TaskCreate(title="Old", tags="ops", status=TaskStatus.to_do))
+        recent = crud.create_task(db, TaskCreate(title="Recent", tags="ops", status=TaskStatus.to_do))
+        docs = crud.create_task(db, TaskCreate(title="Docs", tags="docs", status=TaskStatus.to_do))
+        live = crud.create_task(db, TaskCreate(title="Live", tags="ops", status=TaskStatus.to_do))
+        for task in (old, recent, docs):
+            crud.delete_task(db, task.id)
+        old.deleted_at = old.archived_at = datetime(2024, 1, 1)
+        db.commit()
+        old_id, recent_id, docs_id, live_id = old.id, recent.id, docs.id, live.id
+
+        assert crud.delete_archived_tasks(db, older_than=datetime(2025, 1, 1)) == 1
+        assert crud.delete_archived_tasks(db, tag="OPS") == 1
+        assert [task.id for task in crud.get_archived_tasks(db)] == [docs_id]
+        # A full last chunk is followed by an empty one, which must not bump the revision.
+        revision = crud.get_board_revision()
+        assert crud.delete_archived_tasks(db, batch_size=1) == 1
+        assert crud.get_board_revision() == revision + 1
+        assert crud.count_archived_tasks(db) == 0
+        assert crud.delete_archived_tasks(db) == 0
+        assert crud.get_board_revision() == revision + 1
+
+        remaining_links = {
+            task_id for (task_id,) in db.execute(select(models.task_tags.c.task_id)).all()
+        }
+        assert remaining_links == {live_id}
+        assert old_id not in remaining_links and recent_id not in remaining_links
+    finally:
+        db.close()
+
+
+def test_apply_task_batch_single_transaction(test_env):
+    database = test_env["database"]
+    crud = test_env["crud"]
+    db = database.SessionLocal()
+    commits = []
+    try:
+        existing = crud.create_task(db, TaskCreate(title="Existing", status=TaskStatus.to_do))
+        event.listen(db, "after_commit", lambda session: commits.append(session))
+
+        results = crud.apply_task_batch(
+            db,
+            [
+                TaskBatchOperation(
+                    op="create", task=TaskCreate(title="One", tags="x", status=TaskStatus.to_do)
+                ),
+                TaskBatchOperation(op="create", task=TaskCreate(title="Two", status=TaskStatus.to_do)),
+                TaskBatchOperation(
+                    op="update", task_id=existing.id, changes=TaskUpdate(status=TaskStatus.in_progress)
+                ),
+                TaskBatchOperation(op="delete", task_id=999_999),
+            ],
+        )
+        assert len(commits) == 1
+        assert [result.ok for result in results] == [True, True, True, False]
+        assert results[3].error == "Task not found"
+        one, two = results[0].task, results[1].task
+        assert (one.order_index, two.order_index) == (2, 3)
+        assert results[2].task.status == TaskStatus.in_progress
+
+        results = crud.apply_task_batch(
+            db,
+            [
+                TaskBatchOperation(
+                    op="reorder",
+                    reorder=TaskReorder(status=TaskStatus.to_do, ordered_ids=[two.id, one.id]),
+                ),
+                TaskBatchOperation(op="delete", task_id=one.id),
+                TaskBatchOperation(op="restore", task_id=one.id),
+            ],
+        )
+        assert [task.id for task in results[0].tasks] == [two.id, one.id]
+        assert results[1].task.deleted_at is not None
+        assert results[2].task.deleted_at is None
+        assert {task.id for task in crud.get_tasks(db)} == {existing.id, one.id, two.id}
+        assert crud.get_tags(db) == ["x"]
+    finally:
+        db.close()
+
+
+def test_writes_publish_change_events(test_env):
+    crud = test_env["crud"]
+    database = test_env["database"]
+
+    def write():
+        db = database.SessionLocal()
+        try:
+            task = crud.create_task(db, TaskCreate(title="Live", status=TaskStatus.to_do))
+            task_id = task.id
+            crud.update_task(db, task_id, TaskUpdate(status=TaskStatus.done))
+            crud.delete_task(db, task_id)
+            crud.delete_task(db, task_id)
+            return task_id
+        finally:
+            db.close()
+
+    async def scenario():
+        queue = events.broker.subscribe()
+        try:
+            # Writes run in worker threads in the app, so publish from one here too.
+            task_id = await asyncio.to_thread(write)
+            received = [await asyncio.wait_for(queue.get(), 1) for _ in range(4)]
+        finally:
+            events.broker.unsubscribe(queue)
+        return task_id, received
+
+    task_id, received = asyncio.run(scenario())
+    assert [event["type"] for event in received] == ["created", "moved", "deleted", "deleted"]
+    assert {event["task_id"] for event in received} == {task_id}
+    assert received[1]["task"]["status"] == "Done"
+    assert received[2]["task"]["deleted_at"] is not None
+    assert received[3]["task"] is None
+    revisions = [event["revision"] for event in received]
+    assert revisions == sorted(revisions) and len(set(revisions)) == 4
+    assert events.broker.subscriber_count == 0
+
+
+def test_task_changes_since_token(test_env):
+    crud = test_env["crud"]
+    database = test_env["database"]
+    db = database.SessionLocal()
+    try:
+        kept = crud.create_task(db, TaskCreate(title="Kept", status=TaskStatus.to_do))
+        purged = crud.create_task(db, TaskCreate(title="Purged", status=TaskStatus.to_do))
+        changes, token, has_more = crud.get_task_changes(db)
+        assert [change["task_id"] for change in changes] == [kept.id, purged.id]
+        assert not has_more
+        assert token == crud.get_change_token(db)
+
+        crud.update_task(db, kept.id, TaskUpdate(title="Renamed"))
+        crud.delete_task(db, purged.id)
+        crud.delete_task(db, purged.id)
+        changes, token, _ = crud.get_task_changes(db, since=token)
+        assert [(change["type"], change["task_id"]) for change in changes] == [
+            ("updated", kept.id),
+            ("deleted", purged.id),
+        ]
+        assert changes[0]["task"].title == "Renamed"
+        assert changes[1]["task"] is None
+
+        assert crud.get_task_changes(db, since=token)[0] == []
+
+        created = [
+            crud.create_task(db, TaskCreate(title=f"Page {index}", status=TaskStatus.to_do))
+            for index in range(3)
+        ]
+        first, page_token, has_more = crud.get_task_changes(db, since=token, limit=2)
+        assert has_more
+        second, _, has_more = crud.get_task_changes(db, since=page_token, limit=2)
+        assert not has_more
+        assert [change["task_id"] for change in first + second] == [task.id for task in created]
+    finally:
+        db.close()
+
+
+def test_bulk_purge_writes_tombstones(test_env):
+    crud = test_env["crud"]
+    database = test_env["database"]
+    db = database.SessionLocal()
+    try:
+        tasks = [
+            crud.create_task(db, TaskCreate(title=f"Old {index}", status=TaskStatus.to_do))
+            for index in range(3)
+        ]
+        task_ids = [task.id for task in tasks]
+        for task_id in task_ids:
+            crud.delete_task(db, task_id)
+        token = crud.get_change_token(db)
+        assert crud.delete_archived_tasks(db, batch_size=2) == 3
+        changes, _, _ = crud.get_task_changes(db, since=token)
+        assert sorted(change["task_id"] for change in changes) == sorted(task_ids)
+        assert {change["type"] for change in changes} == {"deleted"}
+    finally:
+        db.close()
+
+
+def test_move_task_writes_one_row(test_env):
+    crud = test_env["crud"]
+    database = test_env["database"]
+    db = database.SessionLocal()
+    try:
+        one, two, three = (
+            crud.create_task(db, TaskCreate(title=title, status=TaskStatus.to_do))
+            for title in ("One", "Two", "Three")
+        )
+        updates = []
+
+        def count_updates(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith("UPDATE TASKS"):
+                updates.append(statement)
+
+        event.listen(database.engine, "before_cursor_execute", count_updates)
+        try:
+            moved = crud.move_task(db, three.id, after_id=one.id, before_id=two.id)
+        finally:
+            event.remove(database.engine, "before_cursor_execute", count_updates)
+        assert len(updates) == 1
+        assert one.order_index < moved.order_index < two.order_index
+
+        done = crud.move_task(db, one.id, status=TaskStatus.done)
+        assert done.status == TaskStatus.done.value
+        assert done.done_at is not None
+
+        # Only the card above is given; the card below is looked up.
+        moved = crud.move_task(db, two.id, after_id=three.id)
+        assert moved.order_index > three.order_index
+        moved = crud.move_task(db, three.id, before_id=two.id)
+        assert moved.order_index < two.order_index
+    finally:
+        db.close()
+
+
+def test_move_task_rebalances_exhausted_gaps(test_env):
+    crud = test_env["crud"]
+    models = test_env["models"]
+    database = test_env["database"]
+    db = database.SessionLocal()
+    try:
+        low = models.Task(title="Low", status="ToDo", order_index=1.0)
+        high = models.Task(title="High", status="ToDo", order_index=1.0 + 2e-16)
+        tight = models.Task(title="Tight", status="Ongoing", order_index=1.0)
+        tight_next = models.Task(title="Tight next", status="Ongoing", order_index=1.0 + 1e-7)
+        mover = models.Task(title="Mover", status="ToDo", order_index=5.0)
+        db.add_all([low, high, tight, tight_next, mover])
+        db.commit()
+
+        moved = crud.move_task(db, mover.id, after_id=low.id, before_id=high.id)
+        db.refresh(low)
+        db.refresh(high)
+        assert low.order_index < moved.order_index < high.order_index
+        assert low.order_index == 1
+
+        moved = crud.move_task(db, mover.id, status=TaskStatus.in_progress, after_id=tight.id, before_id=tight_next.id)
+        assert crud.rebalance_pending_columns(db) == 2
+        ordered = (
+            db.query(models.Task)
+            .filter(models.Task.status == "Ongoing")
+            .order_by(models.Task.order_index)
+            .all()
+        )
+        assert [(task.title, task.order_index) for task in ordered] == [
+            ("Tight", 1),
+            ("Mover", 2),
+            ("Tight next", 3),
+        ]
+    finally:
+        db.close()
+
+
+def test_import_tasks_inserts_in_batches(test_env):
+    crud = test_env["crud"]
+    database = test_env["database"]
+    db = database.SessionLocal()
+    try:
+        existing = crud.create_task(db, TaskCreate(title="Existing", status=TaskStatus.to_do))
+        token = crud.get_change_token(db)
+        records = (
+            TaskImport(title=f"Imported {index}", tags="alpha, Beta", status=TaskStatus.to_do)
+            for index in range(5)
+        )
+        task_inserts = []
+
+        def count_inserts(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith("INSERT INTO TASKS "):
+                task_inserts.append(statement)
+
+        event.listen(database.engine, "before_cursor_execute", count_inserts)
+        try:
+            assert crud.import_tasks(db, records, batch_size=2) == 5
+        finally:
+            event.remove(database.engine, "before_cursor_execute", count_inserts)
+        assert len(task_inserts) == 3
+
+        board = crud.get_tasks(db)
+        assert [task.title for task in board] == ["Existing"] + [f"Imported {index}" for index in range(5)]
+        assert board[1].order_index > existing.order_index
+        assert crud.get_tags(db) == ["alpha", "Beta"]
+        assert len(crud.get_tasks(db, filters=TaskFilters(tag="beta"))) == 5
+        changes, _, _ = crud.get_task_changes(db, since=token)
+        assert len(changes) == 5
+    finally:
+        db.close()
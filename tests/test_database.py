@@ -0,0 +1,71 @@
+import importlib
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.pool import StaticPool
+
+
+def read_pragma(engine, name):
+    with engine.connect() as conn:
+        return conn.exec_driver_sql(f"PRAGMA {name}").scalar()
+
+
+def test_connections_use_tuned_pragmas(test_env):
+    engine = test_env["database"].engine
+    assert read_pragma(engine, "journal_mode") == "wal"
+    assert read_pragma(engine, "synchronous") == 1
+    assert read_pragma(engine, "busy_timeout") == 5000
+    assert read_pragma(engine, "temp_store") == 2
+    assert engine.pool.size() == 8
+
+
+def test_pragmas_and_pool_follow_environment(test_env, monkeypatch):
+    database = test_env["database"]
+    monkeypatch.setenv("POHELPER_SQLITE_SYNCHRONOUS", "FULL")
+    monkeypatch.setenv("POHELPER_SQLITE_MMAP_SIZE", "")
+    monkeypatch.setenv("POHELPER_DB_POOL_SIZE", "2")
+    importlib.reload(database)
+
+    assert "mmap_size" not in database.get_sqlite_pragmas()
+    assert read_pragma(database.engine, "synchronous") == 2
+    assert database.engine.pool.size() == 2
+
+    monkeypatch.setenv("POHELPER_SQLITE_CACHE_SIZE", "1; DROP TABLE tasks")
+    with pytest.raises(ValueError):
+        database.get_sqlite_pragmas()
+
+
+def test_in_memory_database_shares_one_connection(test_env):
+    database = test_env["database"]
+    assert database.get_pool_options("sqlite://")["poolclass"] is StaticPool
+    assert database.get_pool_options("sqlite:///:memory:")["poolclass"] is StaticPool
+
+
+def test_schema_setup_runs_once_per_version(test_env):
+    database = test_env["database"]
+    main = test_env["main"]
+    migrations = test_env["migrations"]
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(database.engine, "before_cursor_execute", record)
+    try:
+        assert main.prepare_database() is False
+        assert statements == ["PRAGMA user_version"]
+
+        with database.engine.connect() as conn:
+            conn.exec_driver_sql("PRAGMA user_version = 0")
+            conn.exec_driver_sql("DROP TRIGGER tasks_fts_ai")
+            conn.commit()
+        assert main.prepare_database() is True
+    finally:
+        event.remove(database.engine, "before_cursor_execute", record)
+
+    assert read_pragma(database.engine, "user_version") == migrations.SCHEMA_VERSION
+    with database.engine.connect() as conn:
+        trigger = conn.exec_driver_sql(
+            "SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = 'tasks_fts_ai'"
+        ).first()
+    assert trigger is not None
@@ -0,0 +1,54 @@
+import httpx
+import pytest
+
+
+def test_start_server_returns_once_listening(test_env):
+    import desktop
+
+    handle = desktop.start_server(desktop.find_free_port())
+    try:
+        assert handle.server.started
+        response = httpx.get(handle.url)
+        assert response.status_code == 200
+        assert "PO Helper" in response.text
+    finally:
+        desktop.stop_server(handle)
+        handle.thread.join(timeout=5)
+    assert not handle.thread.is_alive()
+
+
+def test_start_server_reports_a_port_in_use(test_env):
+    import desktop
+
+    handle = desktop.start_server(desktop.find_free_port())
+    try:
+        with pytest.raises(RuntimeError):
+            desktop.start_server(handle.port, timeout=5)
+    finally:
+        desktop.stop_server(handle)
+        handle.thread.join(timeout=5)
+
+
+def test_boot_shows_startup_errors_in_the_window(test_env, monkeypatch):
+    import desktop
+
+    class Window:
+        def __init__(self):
+            self.pages = []
+
+        def load_html(self, content):
+            self.pages.append(content)
+
+        def load_url(self, url):
+            self.pages.append(url)
+
+    def fail(port, timeout=desktop.SERVER_START_TIMEOUT_SECONDS):
+        raise RuntimeError("PO Helper server did not start on <port>")
+
+    monkeypatch.setattr(desktop, "start_server", fail)
+    window, handles = Window(), []
+    desktop.boot(window, handles)
+    assert handles == []
+    [page] = window.pages
+    assert "PO Helper could not start" in page
+    assert "did not start on &lt;port&gt;" in page
@@ -1,4 +1,4 @@
-import { describe, it, expect } from "vitest";
+import { describe, it, expect, vi } from "vitest";
 
 import "../static/js/app.js";
 
@@ -20,4 +20,46 @@ describe("frontend helpers", () => {
     const b = { order_index: 1, created_at: "2025-01-02T00:00:00Z", id: 2 };
     expect(hooks.compareManualOrder(a, b)).toBeGreaterThan(0);
   });
+
+  it("debounces repeated calls", () => {
+    vi.useFakeTimers();
+    const callback = vi.fn();
+    const debounced = hooks.debounce(callback, 250);
+    debounced("a");
+    debounced("ab");
+    vi.advanceTimersByTime(249);
+    expect(callback).not.toHaveBeenCalled();
+    vi.advanceTimersByTime(1);
+    expect(callback).toHaveBeenCalledTimes(1);
+    expect(callback).toHaveBeenCalledWith("ab");
+    vi.useRealTimers();
+  });
+});
+
+describe("archive panel", () => {
+  const archivedCard = (taskId, title) => {
+    const card = document.createElement("div");
+    card.className = "card task-card archived-task";
+    card.setAttribute("data-task-id", taskId);
+    card.textContent = title;
+    return card;
+  };
+
+  it("keeps one card when a deleted task is added again by its change event", () => {
+    const archive = document.createElement("div");
+    archive.append(archivedCard(1, "Older"));
+    // Added once by the local delete, then again by the SSE echo of the same change.
+    hooks.prependCard(archive, archivedCard(7, "Deleted"));
+    hooks.prependCard(archive, archivedCard(7, "Deleted again"));
+    const cards = [...archive.querySelectorAll(".task-card")];
+    expect(cards.map(card => card.getAttribute("data-task-id"))).toEqual(["7", "1"]);
+    expect(cards[0].textContent).toBe("Deleted again");
+  });
+
+  it("treats a sweeper-archived Done task as archived", () => {
+    const swept = { id: 3, status: "Done", deleted_at: null, archived_at: "2025-01-20T00:00:00Z" };
+    expect(hooks.isOffBoard(swept)).toBe(true);
+    expect(hooks.isOffBoard({ ...swept, status: "ToDo", archived_at: null })).toBe(false);
+    expect(hooks.isOffBoard({ ...swept, deleted_at: "2025-01-21T00:00:00Z" })).toBe(true);
+  });
 });
@@ -0,0 +1,76 @@
+from sqlalchemy import event
+
+
+LEGACY_TASKS_DDL = (
+    "CREATE TABLE tasks (id INTEGER PRIMARY KEY, title VARCHAR, description VARCHAR, "
+    "tags VARCHAR, due_date DATE, status VARCHAR)"
+)
+
+
+def test_migrate_upgrades_a_legacy_database_once(test_env, tmp_path):
+    database = test_env["database"]
+    migrations = test_env["migrations"]
+    engine = database.create_sqlite_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    with engine.begin() as conn:
+        conn.exec_driver_sql(LEGACY_TASKS_DDL)
+        conn.exec_driver_sql(
+            "INSERT INTO tasks (id, title, tags, status) VALUES "
+            "(1, 'Write spec', 'docs', 'To Do'), (2, 'Ship it', NULL, 'In Progress'), "
+            "(3, 'Plan', 'Docs, ops', 'Done'), (7, 'Review', NULL, 'To Do')"
+        )
+
+    applied = migrations.migrate(engine, batch_size=2)
+
+    assert applied == [migration.name for migration in migrations.MIGRATIONS]
+    assert migrations.get_schema_version(engine) == migrations.SCHEMA_VERSION
+    with engine.connect() as conn:
+        rows = conn.exec_driver_sql("SELECT id, status, urgent FROM tasks ORDER BY id").fetchall()
+        links = conn.exec_driver_sql(
+            "SELECT task_id, name FROM task_tags JOIN tags ON tags.id = tag_id ORDER BY task_id, name"
+        ).fetchall()
+        matches = conn.exec_driver_sql(
+            "SELECT rowid FROM tasks_fts WHERE tasks_fts MATCH 'review'"
+        ).fetchall()
+    assert [tuple(row) for row in rows] == [
+        (1, "ToDo", 0), (2, "Ongoing", 0), (3, "Done", 0), (7, "ToDo", 0)
+    ]
+    assert [tuple(row) for row in links] == [(1, "docs"), (3, "docs"), (3, "ops")]
+    assert [row[0] for row in matches] == [7]
+
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        assert migrations.migrate(engine) == []
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+        engine.dispose()
+    assert statements == ["PRAGMA user_version"]
+
+
+def test_backfill_commits_each_id_range(test_env):
+    database = test_env["database"]
+    migrations = test_env["migrations"]
+    with database.engine.begin() as conn:
+        for task_id in (1, 2, 3, 10, 11):
+            conn.exec_driver_sql(
+                f"INSERT INTO tasks (id, title, status, change_seq) VALUES ({task_id}, 'Task', 'To Do', 0)"
+            )
+    commits = []
+
+    def record(conn):
+        commits.append(conn)
+
+    event.listen(database.engine, "commit", record)
+    try:
+        updated = migrations.backfill_tasks(
+            database.engine, "status = 'ToDo'", "status = 'To Do'", batch_size=4
+        )
+    finally:
+        event.remove(database.engine, "commit", record)
+    assert updated == 5
+    # Ids 1-11 in ranges of 4: [1, 5), [5, 9), [9, 13).
+    assert len(commits) == 3
@@ -0,0 +1,117 @@
+from datetime import date
+
+from sqlalchemy import event
+
+from schemas import TaskCreate, TaskFilters, TaskStatus
+
+
+def capture_statements(engine, func):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(("SELECT", "WITH")):
+            statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        func()
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+    return statements
+
+
+def query_plan(engine, statement, parameters):
+    with engine.connect() as conn:
+        rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+    return [row[3] for row in rows]
+
+
+def assert_no_full_scan(plan, paginated=False):
+    for detail in plan:
+        for table in ("tasks", "tags", "task_tags"):
+            # "SCAN tasks_fts VIRTUAL TABLE INDEX ..." is an FTS5 MATCH lookup, not a table scan.
+            assert not (detail.split()[:2] == ["SCAN", table] and "USING" not in detail), plan
+        if paginated:
+            # Paginated reads must walk an index in order rather than sort every match.
+            assert "USE TEMP B-TREE FOR ORDER BY" not in detail, plan
+
+
+def test_hot_queries_use_indexes(test_env):
+    database = test_env["database"]
+    crud = test_env["crud"]
+    db = database.SessionLocal()
+    try:
+        for index in range(5):
+            crud.create_task(
+                db, TaskCreate(title=f"Task {index}", tags="alpha", status=TaskStatus.to_do)
+            )
+        finished = crud.create_task(db, TaskCreate(title="Finished", status=TaskStatus.done))
+        cursor = crud.encode_archive_cursor(crud.delete_task(db, finished.id))
+        this_week = crud.week_start(date.today())
+
+        hot_queries = [
+            (lambda: crud.get_tasks(db), False),
+            (lambda: crud.get_tasks(db, filters=TaskFilters(tag="alpha")), False),
+            (lambda: crud.get_tasks(db, filters=TaskFilters(status=[TaskStatus.done])), False),
+            (lambda: crud.get_tasks(db, filters=TaskFilters(due_from=date(2025, 1, 1))), False),
+            (lambda: crud.get_tasks(db, filters=TaskFilters(q="task, alpha")), False),
+            (lambda: crud.get_tasks(db, filters=TaskFilters(q="2025-01")), False),
+            (lambda: crud.get_archived_tasks(db), True),
+            (lambda: crud.get_archived_tasks(db, cursor=cursor), True),
+            (lambda: crud.count_archived_tasks(db), False),
+            (lambda: crud.archive_expired_tasks(db), False),
+            (lambda: crud.next_archive_time(db), False),
+            (lambda: crud._get_next_order_index(db, TaskStatus.to_do.value), False),
+            (lambda: crud._neighbour_order_index(db, TaskStatus.to_do.value, 2, 0, above=False), False),
+            (lambda: crud._neighbour_order_index(db, TaskStatus.to_do.value, 2, 0, above=True), False),
+            (lambda: crud.get_tags(db), False),
+            (lambda: crud.get_task_stats(db), False),
+            (lambda: crud.get_weekly_flow(db, since=this_week), False),
+            (lambda: crud.get_weekly_lead_times(db, since=this_week), False),
+        ]
+        for run_query, paginated in hot_queries:
+            statements = capture_statements(database.engine, run_query)
+            assert len(statements) == 1
+            for statement, parameters in statements:
+                plan = query_plan(database.engine, statement, parameters)
+                assert_no_full_scan(plan, paginated=paginated)
+    finally:
+        db.close()
+
+
+def test_task_indexes_exist(test_env):
+    database = test_env["database"]
+    with database.engine.connect() as conn:
+        names = {
+            row[1]
+            for row in conn.exec_driver_sql("PRAGMA index_list(tasks)").fetchall()
+        }
+        version = conn.exec_driver_sql("PRAGMA user_version").scalar()
+    assert {
+        "ix_tasks_status_order",
+        "ix_tasks_live",
+        "ix_tasks_archived_order",
+        "ix_tasks_done_at",
+    } <= names
+    assert version == test_env["migrations"].SCHEMA_VERSION
+
+
+def test_change_feed_queries_use_indexes(test_env):
+    database = test_env["database"]
+    crud = test_env["crud"]
+    db = database.SessionLocal()
+    try:
+        for index in range(3):
+            crud.create_task(db, TaskCreate(title=f"Task {index}", status=TaskStatus.to_do))
+        token = crud.encode_change_token(1, 1)
+
+        statements = capture_statements(
+            database.engine,
+            lambda: (crud.get_change_token(db), crud.get_task_changes(db, since=token)),
+        )
+        assert len(statements) == 4
+        for statement, parameters in statements:
+            plan = query_plan(database.engine, statement, parameters)
+            assert_no_full_scan(plan, paginated=True)
+    finally:
+        db.close()
@@ -0,0 +1,51 @@
+from datetime import date, datetime
+from typing import List
+
+from pydantic import TypeAdapter
+from sqlalchemy import text
+
+import schemas
+import serializers
+from schemas import TaskCreate, TaskStatus
+
+task_list = TypeAdapter(List[schemas.Task])
+
+
+def schema_json(tasks) -> bytes:
+    return task_list.dump_json(task_list.validate_python(tasks, from_attributes=True))
+
+
+def test_task_rows_encode_like_the_task_schema(test_env):
+    database = test_env["database"]
+    crud = test_env["crud"]
+    db = database.SessionLocal()
+    try:
+        crud.create_task(
+            db,
+            TaskCreate(
+                title='Quote " slash / tab \t café ✓  ',
+                description="Line one\nLine two",
+                tags="alpha, beta",
+                due_date=date(2025, 2, 28),
+                status=TaskStatus.to_do,
+                created_at=datetime(2025, 1, 1, 9, 30, 15, 120000),
+                urgent=True,
+            ),
+        )
+        crud.create_task(db, TaskCreate(title="Plain", status=TaskStatus.in_progress))
+        done = crud.create_task(db, TaskCreate(title="Done", status=TaskStatus.done))
+        crud.delete_task(db, done.id)
+        # Rows written before order_index became REAL hold INTEGER values.
+        db.execute(text("UPDATE tasks SET order_index = 7 WHERE title = 'Plain'"))
+        db.commit()
+
+        assert serializers.dump_task_rows(crud.get_task_rows(db)) == schema_json(crud.get_tasks(db))
+        assert serializers.dump_task_rows(crud.get_archived_task_rows(db)) == schema_json(
+            crud.get_archived_tasks(db)
+        )
+
+        db.execute(text("UPDATE tasks SET order_index = 1e20 WHERE title = 'Plain'"))
+        db.commit()
+        assert serializers.dump_task_rows(crud.get_task_rows(db)) == schema_json(crud.get_tasks(db))
+    finally:
+        db.close()
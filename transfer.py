@@ -0,0 +1,119 @@
+"""
+Streaming task export and import formats.
+
+Exports encode batches of crud.TASK_ROW_COLUMNS rows as NDJSON or CSV; imports parse an
+uploaded NDJSON or CSV stream into schemas.TaskImport records one line at a time. Neither
+side holds the whole board in memory.
+"""
+import csv
+import io
+from datetime import date
+from typing import Callable, Iterable, Iterator, Sequence
+
+import orjson
+
+import schemas
+from schemas import TransferFormat
+from serializers import TASK_FIELDS
+
+EXPORT_BATCH_SIZE = 1000
+
+MEDIA_TYPES = {
+    TransferFormat.ndjson: "application/x-ndjson",
+    TransferFormat.csv: "text/csv; charset=utf-8",
+}
+
+
+def _task_record(row: Sequence) -> dict:
+    record = dict(zip(TASK_FIELDS, row))
+    if record["order_index"] is not None:
+        record["order_index"] = float(record["order_index"])
+    return record
+
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, date):
+        return value.isoformat()
+    return value
+
+
+def iter_export(batches: Iterable[Sequence[Sequence]], export_format: TransferFormat) -> Iterator[bytes]:
+    """
+    Encodes batches of task rows, yielding one chunk per batch (plus the CSV header).
+    """
+    if export_format is TransferFormat.csv:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        writer.writerow(TASK_FIELDS)
+        yield buffer.getvalue().encode()
+        for rows in batches:
+            buffer.seek(0)
+            buffer.truncate()
+            writer.writerows([_csv_value(value) for value in _task_record(row).values()] for row in rows)
+            yield buffer.getvalue().encode()
+        return
+    for rows in batches:
+        yield b"".join(orjson.dumps(_task_record(row)) + b"\n" for row in rows)
+
+
+class ChunkReader(io.RawIOBase):
+    """
+    Adapts a callable returning successive byte chunks (b"" at the end) to a binary file.
+    """
+
+    def __init__(self, read_chunk: Callable[[], bytes]):
+        self._read_chunk = read_chunk
+        self._pending = b""
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while not self._pending:
+            chunk = self._read_chunk()
+            if not chunk:
+                return 0
+            self._pending = chunk
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        return size
+
+
+def iter_records(stream: io.RawIOBase, import_format: TransferFormat) -> Iterator[schemas.TaskImport]:
+    """
+    Parses an uploaded export into TaskImport records, raising ValueError with the line
+    number of the first invalid record.
+    """
+    text = io.TextIOWrapper(io.BufferedReader(stream), encoding="utf-8-sig", newline="")
+    if import_format is TransferFormat.csv:
+        reader = csv.DictReader(text)
+        try:
+            for values in reader:
+                # Empty cells mean "not set", so defaults and None apply.
+                record = {key: value for key, value in values.items() if key and value != ""}
+                yield _parse_record(record, reader.line_num)
+        except csv.Error as exc:
+            raise ValueError(f"Line {reader.line_num}: {exc}") from exc
+        return
+    for line_number, line in enumerate(text, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = orjson.loads(line)
+        except orjson.JSONDecodeError as exc:
+            raise ValueError(f"Line {line_number}: invalid JSON") from exc
+        yield _parse_record(record, line_number)
+
+
+def _parse_record(record, line_number: int) -> schemas.TaskImport:
+    if not isinstance(record, dict):
+        raise ValueError(f"Line {line_number}: expected an object")
+    try:
+        return schemas.TaskImport.model_validate(record)
+    except ValueError as exc:
+        raise ValueError(f"Line {line_number}: {exc}") from exc